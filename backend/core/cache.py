@@ -1,18 +1,119 @@
 """
 In-memory 캐싱 시스템
 """
+import heapq
+import itertools
+import sys
 import time
-from typing import Any, Optional, Dict
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Dict, Iterable, Set
 from datetime import datetime, timedelta
 import threading
+import numpy as np
+import pandas as pd
+from core.config import settings
+from core.disk_cache import DiskCache
+
+
+def estimate_size(value: Any, depth: int = 0) -> int:
+    """값의 대략적인 메모리 크기 (바이트)
+    
+    DataFrame/Series는 memory_usage, ndarray는 nbytes,
+    list/dict는 원소 크기를 합산합니다 (깊이 4까지).
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    size = sys.getsizeof(value)
+    if depth >= 4:
+        return size
+    if isinstance(value, dict):
+        size += sum(estimate_size(k, depth + 1) + estimate_size(v, depth + 1) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set)):
+        size += sum(estimate_size(v, depth + 1) for v in value)
+    return size
+
+
+def _parse_quotas(spec: str) -> Dict[str, int]:
+    """"news=16,sentiment=8" (MB) 형식의 prefix별 용량 한도 파싱"""
+    quotas = {}
+    for part in spec.split(","):
+        if "=" not in part:
+            continue
+        prefix, mb = part.split("=", 1)
+        try:
+            quotas[prefix.strip()] = int(float(mb) * 1024 * 1024)
+        except ValueError:
+            print(f"[WARNING] 잘못된 캐시 quota 설정 무시: {part}")
+    return quotas
+
+
+class PrefixMetrics:
+    """key prefix별 캐시 지표 (InMemoryCache의 lock 안에서 갱신)"""
+    
+    # 채우기 지연 히스토그램 버킷 상한 (초)
+    LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+    
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0  # stale-while-revalidate로 이전 값을 제공한 횟수
+        self.disk_hits = 0  # 디스크 2차 캐시에서 올린 횟수
+        self.evictions = 0  # 용량 제한으로 제거된 항목 수
+        self.expirations = 0  # 만료로 제거된 항목 수
+        self.items = 0
+        self.bytes = 0
+        self.fill_count = 0
+        self.fill_seconds = 0.0
+        self.fill_buckets = [0] * (len(self.LATENCY_BUCKETS) + 1)
+    
+    def record_fill(self, seconds: float) -> None:
+        """미스 후 set까지 걸린 시간 기록"""
+        self.fill_count += 1
+        self.fill_seconds += seconds
+        for i, bound in enumerate(self.LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.fill_buckets[i] += 1
+                return
+        self.fill_buckets[-1] += 1
+    
+    def to_dict(self) -> Dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        buckets = {f"le_{bound}": count for bound, count in zip(self.LATENCY_BUCKETS, self.fill_buckets)}
+        buckets["le_inf"] = self.fill_buckets[-1]
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_hits": self.stale_hits,
+            "disk_hits": self.disk_hits,
+            "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "items": self.items,
+            "bytes": self.bytes,
+            "fill_latency": {
+                "count": self.fill_count,
+                "avg_seconds": round(self.fill_seconds / self.fill_count, 4) if self.fill_count else None,
+                "buckets": buckets,
+            },
+        }
 
 
 class CacheItem:
     """캐시 아이템"""
-    def __init__(self, value: Any, ttl: int = 900):  # 기본 15분
+    def __init__(self, value: Any, ttl: int = 900, size: int = 0,
+                 created_at: Optional[float] = None, tags: Iterable[str] = ()):  # 기본 15분
         self.value = value
-        self.created_at = time.time()
+        self.tags = tuple(tags)  # invalidate_tag로 함께 삭제할 그룹 (예: "symbol:VIG")
+        self.created_at = created_at if created_at is not None else time.time()
         self.ttl = ttl
+        self.size = size  # 대략적인 메모리 크기 (바이트)
+        self.expires_at = self.created_at + ttl
+        self.stale = False  # 만료되어 expired 통계에 집계됨 (stale-while-revalidate grace 구간)
+        self.persisted = False  # 디스크에 같은 생성 시각으로 저장됨 (shared 모드 일관성 확인 대상)
     
     def is_expired(self) -> bool:
         """캐시 만료 여부 확인"""
@@ -24,62 +125,489 @@ class CacheItem:
 
 
 class InMemoryCache:
-    """In-memory 캐시 시스템 (스레드 안전)"""
+    """In-memory 캐시 시스템 (스레드 안전)
     
-    def __init__(self):
-        self._cache: Dict[str, CacheItem] = {}
+    stale-while-revalidate: set_stale_policy로 등록한 prefix의 항목은 만료 후에도
+    grace 시간 동안 get(key, refresher=...)에 이전 값을 반환하고,
+    refresher를 백그라운드 스레드에서 실행해 값을 갱신합니다.
+    
+    용량 제한: 항목 수(max_entries)와 대략적인 전체 크기(max_bytes)를 넘으면
+    가장 오래 사용되지 않은 항목부터 제거 (LRU). prefix별 quota를 넘으면
+    해당 prefix 항목만 제거하므로 뉴스 결과가 가격 히스토리를 밀어내지 않습니다.
+    
+    만료 처리: 만료 시각 순 힙으로 만료된 항목만 꺼내 정리하며 (O(log n)),
+    start_sweeper()로 백그라운드 주기 정리를 시작합니다. 통계는 증분 카운터로 O(1).
+    
+    디스크 2차 캐시: disk를 지정하면 disk_prefixes에 속한 키는 set 시 디스크에도 저장하고,
+    메모리에 없으면 디스크에서 읽어 올립니다 (원래 생성 시각 기준으로 TTL 유지).
+    shared=True이면 모든 키를 디스크에 저장해 같은 파일을 쓰는 워커 프로세스끼리 공유하고,
+    조회 시 디스크 항목의 생성 시각을 비교해 다른 워커가 갱신/삭제한 항목은 메모리에서도 교체/삭제합니다.
+    
+    태그: set(..., tags=("symbol:VIG",))로 저장한 항목은 invalidate_tag("symbol:VIG")로
+    한 번에 삭제됩니다 (히스토리 갱신 시 파생 지표 캐시 무효화).
+    """
+    
+    def __init__(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None,
+                 prefix_quotas: Optional[Dict[str, int]] = None,
+                 disk: Optional[DiskCache] = None, disk_prefixes: Optional[set] = None,
+                 shared: bool = False):
+        self._cache: "OrderedDict[str, CacheItem]" = OrderedDict()  # 오래 사용되지 않은 순서
         self._lock = threading.Lock()
+        self.max_entries = max_entries if max_entries is not None else settings.cache_max_entries
+        self.max_bytes = max_bytes if max_bytes is not None else settings.cache_max_mb * 1024 * 1024
+        self.prefix_quotas = (prefix_quotas if prefix_quotas is not None
+                              else _parse_quotas(settings.cache_prefix_quotas))
+        self._total_bytes = 0
+        self._tag_index: Dict[str, Set[str]] = {}  # tag -> keys
+        self._metrics: Dict[str, PrefixMetrics] = {}
+        self._miss_times: "OrderedDict[str, float]" = OrderedDict()  # 미스 시각 (채우기 지연 측정용)
+        self._evictions = 0
+        self._expired_count = 0  # grace 구간에 있는 만료 항목 수
+        self._expiry_heap = []  # (시각, seq, key, item): 만료 또는 grace 종료 시각 순
+        self._seq = itertools.count()
+        self._sweeper: Optional[threading.Thread] = None
+        self._stale_policies: Dict[str, int] = {}  # key prefix -> grace (초)
+        self._disk_loaders: Dict[str, Callable[[Any], Any]] = {}  # key prefix -> 디스크에서 올린 값 변환
+        self._refreshing = set()  # 백그라운드 갱신 중인 키
+        self._local = threading.local()
+        self._disk = disk
+        self._disk_prefixes = disk_prefixes if disk_prefixes is not None else set()
+        self.shared = shared and disk is not None
+    
+    def set_stale_policy(self, prefix: str, grace: int) -> None:
+        """prefix로 시작하는 키에 stale-while-revalidate 적용 (grace: 만료 후 이전 값을 제공할 시간, 초)"""
+        with self._lock:
+            self._stale_policies[prefix] = grace
+    
+    def set_disk_loader(self, prefix: str, loader: Callable[[Any], Any]) -> None:
+        """prefix 키를 디스크에서 메모리로 올릴 때 값을 변환할 함수 등록 (예: 히스토리 배열을 읽기 전용으로)"""
+        with self._lock:
+            self._disk_loaders[prefix] = loader
+    
+    def _get_grace(self, key: str) -> int:
+        """키에 적용되는 grace 시간 (정책 없으면 0)"""
+        for prefix, grace in self._stale_policies.items():
+            if key == prefix or key.startswith(prefix + ":"):
+                return grace
+        return 0
+    
+    def get(self, key: str, refresher: Optional[Callable[[], Any]] = None) -> Optional[Any]:
+        """캐시에서 값 가져오기
+        
+        Args:
+            key: 캐시 키
+            refresher: 만료된 항목을 다시 계산해 cache.set까지 수행하는 함수
+                (보통 호출한 메서드 자신). 지정하면 grace 시간 내의 만료 항목은
+                이전 값을 바로 반환하고 refresher를 백그라운드에서 실행합니다.
+        """
+        if self._is_persistent(key):
+            with self._lock:
+                local = self._cache.get(key)
+            if local is None:
+                self._load_from_disk(key)
+            elif self.shared and local.persisted:
+                self._sync_from_disk(key, local)
+        
+        start_refresh = False
+        with self._lock:
+            metrics = self._get_metrics(key)
+            item = self._cache.get(key)
+            if item is None:
+                self._record_miss(key, metrics)
+                return None
+            if not item.is_expired():
+                self._cache.move_to_end(key)
+                metrics.hits += 1
+                return item.value
+            
+            grace = self._get_grace(key)
+            if item.get_age_seconds() > item.ttl + grace:
+                # grace 시간까지 지난 항목 삭제
+                self._remove(key)
+                metrics.expirations += 1
+                self._record_miss(key, metrics)
+                return None
+            self._mark_stale(item)
+            
+            # 갱신 스레드 안에서는 이전 값을 쓰지 않고 새로 계산
+            if refresher is None or getattr(self._local, "refreshing", False):
+                self._record_miss(key, metrics)
+                return None
+            
+            if key not in self._refreshing:
+                self._refreshing.add(key)
+                start_refresh = True
+            self._cache.move_to_end(key)
+            metrics.stale_hits += 1
+            value = item.value
+        
+        if start_refresh:
+            threading.Thread(target=self._refresh, args=(key, refresher), daemon=True).start()
+        return value
+    
+    # 채우기 지연 측정을 위해 기억할 최대 미스 키 수
+    MAX_PENDING_MISSES = 10000
+    
+    def _get_metrics(self, key: str) -> PrefixMetrics:
+        """prefix 지표 (없으면 생성, lock 안에서 호출)"""
+        prefix = self._get_prefix(key)
+        metrics = self._metrics.get(prefix)
+        if metrics is None:
+            metrics = self._metrics[prefix] = PrefixMetrics()
+        return metrics
+    
+    def _record_miss(self, key: str, metrics: PrefixMetrics) -> None:
+        """미스 기록 (이후 set까지의 시간을 채우기 지연으로 측정, lock 안에서 호출)"""
+        metrics.misses += 1
+        if key not in self._miss_times:
+            self._miss_times[key] = time.monotonic()
+            if len(self._miss_times) > self.MAX_PENDING_MISSES:
+                self._miss_times.popitem(last=False)
+    
+    def _refresh(self, key: str, refresher: Callable[[], Any]) -> None:
+        """백그라운드 갱신 실행 (실패 시 이전 값은 grace 시간까지 유지)"""
+        self._local.refreshing = True
+        try:
+            refresher()
+        except Exception as e:
+            print(f"[WARNING] 캐시 백그라운드 갱신 실패 ({key}): {e}")
+        finally:
+            self._local.refreshing = False
+            with self._lock:
+                self._refreshing.discard(key)
+    
+    def revalidate(self, key: str, refresher: Callable[[], Any]) -> bool:
+        """grace 구간의 만료 항목이면 백그라운드 갱신 예약 (get과 달리 적중/미스 지표와 LRU 순서는 그대로)
+        
+        Returns:
+            갱신을 예약했으면 True
+        """
+        if self.shared:
+            with self._lock:
+                local = self._cache.get(key)
+            if local is not None and local.persisted:
+                self._sync_from_disk(key, local)
+        
+        with self._lock:
+            item = self._cache.get(key)
+            if item is None or not item.is_expired() or key in self._refreshing:
+                return False
+            if getattr(self._local, "refreshing", False):
+                return False
+            if item.get_age_seconds() > item.ttl + self._get_grace(key):
+                return False
+            self._refreshing.add(key)
+        threading.Thread(target=self._refresh, args=(key, refresher), daemon=True).start()
+        return True
+    
+    def peek(self, key: str) -> Optional[Any]:
+        """만료 여부와 관계없이 저장된 값 확인 (없으면 None)"""
+        with self._lock:
+            item = self._cache.get(key)
+            return item.value if item is not None else None
     
-    def get(self, key: str) -> Optional[Any]:
-        """캐시에서 값 가져오기"""
+    def set(self, key: str, value: Any, ttl: int = 900, tags: Iterable[str] = ()) -> None:
+        """캐시에 값 저장 (TTL: 초 단위, 기본 15분, tags: invalidate_tag용 그룹)"""
+        item = CacheItem(value, ttl, estimate_size(value), tags=tags)
+        # 디스크에 먼저 저장해 다른 스레드가 메모리 항목을 디스크와 비교할 때 항상 같은 생성 시각을 보도록 함
+        if self._is_persistent(key):
+            item.persisted = self._disk.set(key, value, item.created_at, ttl, self._get_grace(key), item.tags)
         with self._lock:
-            if key in self._cache:
-                item = self._cache[key]
-                if not item.is_expired():
-                    return item.value
-                else:
-                    # 만료된 항목 삭제
-                    del self._cache[key]
-            return None
+            self._insert(key, item)
     
-    def set(self, key: str, value: Any, ttl: int = 900) -> None:
-        """캐시에 값 저장 (TTL: 초 단위, 기본 15분)"""
+    def refresh_size(self, key: str) -> None:
+        """값을 제자리에서 늘린 항목의 크기 다시 계산 (TTL과 디스크 저장 값은 그대로)"""
         with self._lock:
-            self._cache[key] = CacheItem(value, ttl)
+            item = self._cache.get(key)
+            if item is None:
+                return
+            size = estimate_size(item.value)
+            metrics = self._get_metrics(key)
+            self._total_bytes += size - item.size
+            metrics.bytes += size - item.size
+            item.size = size
+            self._enforce_limits(key, self._get_prefix(key))
+    
+    def _insert(self, key: str, item: CacheItem) -> None:
+        """항목 추가 및 용량 제한 적용 (lock 안에서 호출)"""
+        self._remove(key)
+        self._cache[key] = item
+        for tag in item.tags:
+            self._tag_index.setdefault(tag, set()).add(key)
+        self._push_expiry(item.expires_at, key, item)
+        prefix = self._get_prefix(key)
+        metrics = self._get_metrics(key)
+        self._total_bytes += item.size
+        metrics.items += 1
+        metrics.bytes += item.size
+        missed_at = self._miss_times.pop(key, None)
+        if missed_at is not None:
+            metrics.record_fill(time.monotonic() - missed_at)
+        self._enforce_limits(key, prefix)
+    
+    def _is_persistent(self, key: str) -> bool:
+        """디스크 2차 캐시 대상 키인지 여부"""
+        if self._disk is None:
+            return False
+        return self.shared or self._get_prefix(key) in self._disk_prefixes
+    
+    def add(self, key: str, value: Any, ttl: int = 900) -> bool:
+        """키가 없거나 만료된 경우에만 저장 (set-if-absent)
+        
+        shared 모드에서는 공유 디스크 저장소에서 원자적으로 판단하므로
+        워커 프로세스 간 single-flight 잠금(lease)에 사용할 수 있습니다.
+        
+        Returns:
+            저장했으면 True, 유효한 값이 이미 있으면 False
+        """
+        if self.shared:
+            return self._disk.add(key, value, time.time(), ttl)
+        
+        with self._lock:
+            item = self._cache.get(key)
+            if item is not None and not item.is_expired():
+                return False
+            self._insert(key, CacheItem(value, ttl, estimate_size(value)))
+            return True
+    
+    def _load_from_disk(self, key: str) -> None:
+        """디스크에 저장된 항목을 메모리로 올리기 (원래 생성 시각 유지)"""
+        stored = self._disk.get(key)
+        if stored is None:
+            return
+        value, created_at, ttl, tags = stored
+        loader = self._disk_loaders.get(self._get_prefix(key))
+        if loader is not None:
+            value = loader(value)
+        item = CacheItem(value, ttl, estimate_size(value), created_at=created_at, tags=tags)
+        item.persisted = True
+        with self._lock:
+            if key not in self._cache:
+                self._insert(key, item)
+                self._get_metrics(key).disk_hits += 1
+    
+    def _sync_from_disk(self, key: str, item: CacheItem) -> None:
+        """shared 모드: 다른 워커가 디스크 항목을 갱신/삭제했으면 메모리 항목도 교체/삭제"""
+        created_at = self._disk.get_created_at(key)
+        if created_at is not None and created_at <= item.created_at:
+            return
+        with self._lock:
+            if self._cache.get(key) is item:
+                self._remove(key)
+        if created_at is not None:
+            self._load_from_disk(key)
+    
+    @staticmethod
+    def _get_prefix(key: str) -> str:
+        return key.split(":", 1)[0]
+    
+    def _remove(self, key: str) -> None:
+        """항목 삭제 및 크기 집계 갱신 (lock 안에서 호출)"""
+        item = self._cache.pop(key, None)
+        if item is None:
+            return
+        for tag in item.tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+        metrics = self._get_metrics(key)
+        self._total_bytes -= item.size
+        metrics.items -= 1
+        metrics.bytes -= item.size
+        if item.stale:
+            self._expired_count -= 1
+    
+    def _mark_stale(self, item: CacheItem) -> None:
+        """만료된 항목을 expired 통계에 집계 (lock 안에서 호출)"""
+        if not item.stale:
+            item.stale = True
+            self._expired_count += 1
+    
+    def _push_expiry(self, when: float, key: str, item: CacheItem) -> None:
+        """만료 힙에 추가 (덮어쓴/삭제된 항목의 힙 원소는 꺼낼 때 무시, lock 안에서 호출)"""
+        heapq.heappush(self._expiry_heap, (when, next(self._seq), key, item))
+        # 무효 원소가 너무 많이 쌓이면 힙 재구성
+        if len(self._expiry_heap) > 2 * len(self._cache) + 1024:
+            self._expiry_heap = [e for e in self._expiry_heap if self._cache.get(e[2]) is e[3]]
+            heapq.heapify(self._expiry_heap)
+    
+    def _enforce_limits(self, new_key: str, prefix: str) -> None:
+        """quota/전체 한도를 넘으면 LRU 순서로 제거 (방금 저장한 항목은 유지, lock 안에서 호출)"""
+        quota = self.prefix_quotas.get(prefix)
+        metrics = self._metrics[prefix]
+        if quota is not None and metrics.bytes > quota:
+            for key in [k for k in self._cache if k != new_key and self._get_prefix(k) == prefix]:
+                if metrics.bytes <= quota:
+                    break
+                self._evict(key)
+        
+        while len(self._cache) > 1 and (len(self._cache) > self.max_entries or
+                                        self._total_bytes > self.max_bytes):
+            key = next(iter(self._cache))
+            if key == new_key:
+                break
+            self._evict(key)
+    
+    def _evict(self, key: str) -> None:
+        """용량 제한으로 항목 제거 (lock 안에서 호출)"""
+        self._remove(key)
+        self._evictions += 1
+        self._get_metrics(key).evictions += 1
     
     def delete(self, key: str) -> None:
         """캐시에서 항목 삭제"""
         with self._lock:
-            if key in self._cache:
-                del self._cache[key]
+            self._remove(key)
+        if self._is_persistent(key):
+            self._disk.delete(key)
+    
+    def invalidate_tag(self, tag: str) -> int:
+        """tag가 붙은 항목 모두 삭제
+        
+        Returns:
+            메모리에서 삭제한 항목 수
+        """
+        with self._lock:
+            keys = list(self._tag_index.get(tag, ()))
+            for key in keys:
+                self._remove(key)
+        if self._disk is not None:
+            self._disk.delete_tag(tag)
+        return len(keys)
     
     def clear(self) -> None:
         """모든 캐시 삭제"""
         with self._lock:
             self._cache.clear()
+            self._tag_index.clear()
+            self._total_bytes = 0
+            for metrics in self._metrics.values():
+                metrics.items = 0
+                metrics.bytes = 0
+            self._expired_count = 0
+            self._expiry_heap = []
+        if self._disk is not None:
+            self._disk.clear()
     
-    def cleanup_expired(self) -> None:
-        """만료된 항목 정리"""
+    # 정리 시 lock을 한 번에 잡고 처리할 최대 힙 원소 수 (동시 get 지연 방지)
+    SWEEP_BATCH = 500
+    
+    def cleanup_expired(self) -> int:
+        """만료된 항목 정리 (만료 힙에서 시각이 지난 원소만 꺼냄)
+        
+        stale 정책이 있는 항목은 grace 종료 시각으로 다시 넣고 그때 삭제합니다.
+        
+        Returns:
+            삭제한 항목 수
+        """
+        removed = 0
+        while True:
+            with self._lock:
+                now = time.time()
+                processed = 0
+                while self._expiry_heap and self._expiry_heap[0][0] <= now and processed < self.SWEEP_BATCH:
+                    _, _, key, item = heapq.heappop(self._expiry_heap)
+                    processed += 1
+                    if self._cache.get(key) is not item:
+                        continue
+                    grace = self._get_grace(key)
+                    if not item.stale and grace > 0:
+                        self._mark_stale(item)
+                        self._push_expiry(item.expires_at + grace, key, item)
+                    else:
+                        self._remove(key)
+                        self._get_metrics(key).expirations += 1
+                        removed += 1
+                done = not self._expiry_heap or self._expiry_heap[0][0] > now
+            if done:
+                if self._disk is not None:
+                    self._disk.cleanup_expired()
+                return removed
+    
+    def start_sweeper(self, interval: Optional[float] = None) -> None:
+        """백그라운드 만료 정리 스레드 시작 (이미 실행 중이면 무시)"""
+        interval = interval or settings.cache_sweep_interval
         with self._lock:
-            expired_keys = [
-                key for key, item in self._cache.items()
-                if item.is_expired()
-            ]
-            for key in expired_keys:
-                del self._cache[key]
+            if self._sweeper is not None:
+                return
+            self._sweeper = threading.Thread(target=self._sweep_loop, args=(interval,), daemon=True)
+        self._sweeper.start()
+    
+    def _sweep_loop(self, interval: float) -> None:
+        while True:
+            time.sleep(interval)
+            try:
+                self.cleanup_expired()
+            except Exception as e:
+                print(f"[WARNING] 캐시 만료 정리 실패: {e}")
     
     def get_stats(self) -> Dict:
-        """캐시 통계"""
+        """캐시 통계 (증분 카운터, O(1))
+        
+        expired_items는 정리 스레드나 조회 시 만료가 확인된 항목 수입니다.
+        """
         with self._lock:
             total = len(self._cache)
-            expired = sum(1 for item in self._cache.values() if item.is_expired())
+            expired = self._expired_count
             return {
                 "total_items": total,
                 "expired_items": expired,
-                "active_items": total - expired
+                "active_items": total - expired,
+                "total_bytes": self._total_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "evictions": self._evictions,
+                "bytes_by_prefix": {p: m.bytes for p, m in self._metrics.items() if m.bytes > 0}
+            }
+    
+    def get_metrics(self) -> Dict:
+        """prefix별 적중/미스/stale 제공/제거 횟수, 채우기 지연 히스토그램, 보유 크기"""
+        with self._lock:
+            return {
+                "prefixes": {p: m.to_dict() for p, m in sorted(self._metrics.items())},
+                "total_items": len(self._cache),
+                "total_bytes": self._total_bytes,
+                "evictions": self._evictions,
             }
 
 
+def _create_disk_cache() -> Optional[DiskCache]:
+    """설정에 따라 디스크 2차 캐시 생성 (실패 시 메모리 캐시만 사용)"""
+    if settings.cache_backend not in ("memory", "sqlite"):
+        print(f"[WARNING] 알 수 없는 cache_backend '{settings.cache_backend}', memory 사용")
+    if not settings.cache_disk_enabled and settings.cache_backend != "sqlite":
+        return None
+    try:
+        return DiskCache(settings.cache_disk_path)
+    except Exception as e:
+        print(f"[WARNING] 디스크 캐시 초기화 실패, 메모리 캐시만 사용: {e}")
+        return None
+
+
 # 전역 캐시 인스턴스
-cache = InMemoryCache()
+cache = InMemoryCache(
+    disk=_create_disk_cache(),
+    disk_prefixes={p.strip() for p in settings.cache_disk_prefixes.split(",") if p.strip()},
+    shared=settings.cache_backend == "sqlite",
+)
+
+
+# 데이터가 없는 심볼(오타, 상장폐지 등) 네거티브 캐시
+NEGATIVE_CACHE_TTL = 10 * 60  # 10분
+
+
+def mark_symbol_missing(symbol: str, ttl: int = NEGATIVE_CACHE_TTL) -> None:
+    """심볼을 '데이터 없음'으로 기록 (TTL 동안 외부 호출 생략)"""
+    cache.set(f"missing:{symbol.upper()}", True, ttl)
+
+
+def symbol_tag(symbol: str) -> str:
+    """심볼의 히스토리에서 계산된 캐시 항목에 붙이는 태그"""
+    return f"symbol:{symbol.upper()}"
+
 
+def is_symbol_missing(symbol: str) -> bool:
+    """최근에 '데이터 없음'으로 확인된 심볼인지 여부"""
+    return cache.get(f"missing:{symbol.upper()}") is not None
@@ -17,6 +17,29 @@ class Settings(BaseSettings):
     database_url: str = "sqlite:///./etf_advisor.db"
     host: str = "0.0.0.0"
     port: int = int(os.getenv("PORT", 8000))  # Render는 $PORT 환경 변수 제공
+    http_connect_timeout: float = 5.0  # 외부 API 연결 타임아웃 (초)
+    http_read_timeout: float = 15.0  # 외부 API 응답 타임아웃 (초)
+    http_pool_connections: int = 10  # 커넥션 풀을 유지할 호스트 수
+    http_pool_maxsize: int = 10  # 호스트당 최대 동시 연결 수
+    retry_time_budget: float = 20.0  # 요청 1건당 외부 호출 재시도 전체 시간 예산 (초)
+    retry_max_attempts: int = 3  # 최대 시도 횟수
+    retry_base_delay: float = 0.5  # 지수 백오프 기본 대기 (초)
+    retry_max_delay: float = 4.0  # 지수 백오프 최대 대기 (초)
+    breaker_failure_threshold: int = 5  # 연속 실패 시 서킷 브레이커 열림
+    breaker_reset_timeout: float = 60.0  # 브레이커가 열린 뒤 시험 호출까지 대기 (초)
+    cache_warmup_symbols: str = "VIG,QLD"  # 시작 시 배치 다운로드로 캐시를 채울 심볼 (쉼표 구분)
+    cache_max_entries: int = 5000  # 메모리 캐시 최대 항목 수
+    cache_max_mb: int = 128  # 메모리 캐시 최대 크기 (대략, MB)
+    cache_prefix_quotas: str = "news=16,fundamental=4"  # prefix별 최대 크기 (MB, 쉼표 구분)
+    cache_sweep_interval: float = 30.0  # 만료 캐시 정리 주기 (초)
+    cache_backend: str = "memory"  # memory: 프로세스별 캐시, sqlite: 워커 프로세스 간 공유 (cache_disk_path 사용)
+    cache_disk_enabled: bool = True  # 디스크 2차 캐시 사용 (재시작 후에도 유지)
+    cache_disk_path: str = "./cache.db"  # 디스크 캐시 SQLite 파일
+    cache_disk_prefixes: str = "history,price,ticker,fgi,news,fundamental,missing"  # 디스크에 저장할 키 prefix
+    screener_default_symbols: str = "VIG,QLD,SPY,QQQ,DIA,IWM,SCHD,VTI,VOO,TQQQ"  # /screener 기본 대상 심볼 (쉼표 구분)
+    streaming_max_symbols: int = 200  # 증분 지표 스트림을 유지할 최대 심볼 수 (최근 사용 순)
+    streaming_max_bars: int = 1260  # 스트림별로 보관할 최근 지표 값 개수 (약 5년)
+    indicator_jit_enabled: bool = True  # Numba 설치 시 경로 의존 지표(Wilder 평활, SAR 등)를 JIT 커널로 계산
 
     class Config:
         env_file = str(env_path) if env_path.exists() else ".env"
@@ -0,0 +1,158 @@
+"""
+디스크 캐시 (SQLite 기반 2차 캐시, 재시작 후에도 TTL 유지)
+"""
+import io
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Optional, Tuple
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (DataFrame을 Parquet으로 저장)
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+class DiskCache:
+    """키-값 디스크 캐시 (스레드 안전)
+
+    DataFrame은 Parquet(pyarrow 설치 시), 그 외 값은 pickle 바이너리로 저장합니다.
+    만료 시각은 벽시계(time.time) 기준이라 프로세스가 재시작되어도 유지됩니다.
+    같은 파일을 여러 프로세스(uvicorn 워커)가 열어 공유할 수 있습니다 (WAL 모드).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            " key TEXT PRIMARY KEY,"
+            " value BLOB NOT NULL,"
+            " format TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " ttl REAL NOT NULL,"
+            " purge_at REAL NOT NULL,"
+            " tags TEXT NOT NULL DEFAULT '')"
+        )
+        # 태그 컬럼이 없던 기존 파일 보완
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(cache_entries)")}
+        if "tags" not in columns:
+            self._conn.execute("ALTER TABLE cache_entries ADD COLUMN tags TEXT NOT NULL DEFAULT ''")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_cache_entries_purge_at ON cache_entries (purge_at)")
+
+    @staticmethod
+    def _encode(value: Any) -> Tuple[bytes, str]:
+        """값 직렬화 (bytes, format)"""
+        if HAS_PYARROW and isinstance(value, pd.DataFrame):
+            buffer = io.BytesIO()
+            value.to_parquet(buffer, index=True)
+            return buffer.getvalue(), "parquet"
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), "pickle"
+
+    @staticmethod
+    def _decode(data: bytes, fmt: str) -> Any:
+        if fmt == "parquet":
+            return pd.read_parquet(io.BytesIO(data))
+        return pickle.loads(data)
+
+    @staticmethod
+    def _encode_tags(tags: Tuple[str, ...]) -> str:
+        """"|tag1|tag2|" 형식 ("|tag|" 부분 문자열로 검색)"""
+        return "|" + "|".join(tags) + "|" if tags else ""
+
+    def get(self, key: str) -> Optional[Tuple[Any, float, float, Tuple[str, ...]]]:
+        """저장된 값 조회
+
+        Returns:
+            (value, created_at, ttl, tags) 또는 None (없거나 보관 기간이 지난 경우)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, format, created_at, ttl, tags FROM cache_entries WHERE key = ? AND purge_at > ?",
+                (key, time.time())
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            tags = tuple(t for t in row[4].split("|") if t)
+            return self._decode(row[0], row[1]), row[2], row[3], tags
+        except Exception as e:
+            print(f"[WARNING] 디스크 캐시 읽기 실패 ({key}): {e}")
+            self.delete(key)
+            return None
+
+    def get_created_at(self, key: str) -> Optional[float]:
+        """저장된 값의 생성 시각 (값을 읽지 않고 다른 프로세스의 갱신/삭제 여부만 확인, 없으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT created_at FROM cache_entries WHERE key = ? AND purge_at > ?",
+                (key, time.time())
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def set(self, key: str, value: Any, created_at: float, ttl: float, grace: float = 0,
+            tags: Tuple[str, ...] = ()) -> bool:
+        """값 저장 (created_at + ttl + grace 이후 삭제 대상)
+
+        Returns:
+            저장했으면 True, 직렬화에 실패했으면 False
+        """
+        try:
+            data, fmt = self._encode(value)
+        except Exception as e:
+            print(f"[WARNING] 디스크 캐시 직렬화 실패 ({key}): {e}")
+            return False
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, format, created_at, ttl, purge_at, tags)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, sqlite3.Binary(data), fmt, created_at, ttl, created_at + ttl + grace,
+                 self._encode_tags(tags))
+            )
+        return True
+
+    def add(self, key: str, value: Any, created_at: float, ttl: float, grace: float = 0) -> bool:
+        """키가 없거나 만료된 경우에만 저장 (프로세스 간 원자적 set-if-absent)
+
+        Returns:
+            저장했으면 True, 유효한 값이 이미 있으면 False
+        """
+        data, fmt = self._encode(value)
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO cache_entries (key, value, format, created_at, ttl, purge_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT(key) DO UPDATE SET value = excluded.value, format = excluded.format,"
+                " created_at = excluded.created_at, ttl = excluded.ttl, purge_at = excluded.purge_at"
+                " WHERE cache_entries.created_at + cache_entries.ttl <= ?",
+                (key, sqlite3.Binary(data), fmt, created_at, ttl, created_at + ttl + grace, created_at)
+            )
+            return cursor.rowcount > 0
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def delete_tag(self, tag: str) -> int:
+        """tag가 붙은 항목 모두 삭제"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM cache_entries WHERE instr(tags, ?) > 0", (f"|{tag}|",)
+            )
+            return cursor.rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries")
+
+    def cleanup_expired(self) -> int:
+        """보관 기간이 지난 항목 삭제 (purge_at 인덱스 사용)"""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM cache_entries WHERE purge_at <= ?", (time.time(),))
+            return cursor.rowcount
@@ -0,0 +1,86 @@
+"""
+공유 HTTP 클라이언트 (호스트별 keep-alive 커넥션 풀)
+"""
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Optional
+from urllib.parse import urlparse
+from core.config import settings
+from core.retry import CircuitOpenError, get_breaker
+
+
+class HttpClient:
+    """requests.Session 기반 공유 HTTP 클라이언트 (스레드 안전)
+
+    호스트마다 커넥션 풀을 유지하므로 같은 호스트로 가는 요청은
+    TCP/TLS 핸드셰이크 없이 기존 연결을 재사용합니다.
+    """
+
+    def __init__(self, verify: bool = True):
+        self._verify = verify
+        self._session: Optional[requests.Session] = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        """공유 Session (최초 사용 시 생성)"""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        session.verify = self._verify
+        session.headers.update({"Accept-Encoding": "gzip, deflate"})
+
+        # pool_connections: 풀을 유지할 호스트 수, pool_maxsize: 호스트당 최대 연결 수
+        # pool_block=True: 호스트당 연결 수를 pool_maxsize로 제한 (초과 요청은 대기)
+        adapter = HTTPAdapter(
+            pool_connections=settings.http_pool_connections,
+            pool_maxsize=settings.http_pool_maxsize,
+            pool_block=True,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def get(self, url: str, timeout=None, **kwargs) -> requests.Response:
+        """GET 요청 (timeout 미지정 시 설정값 (connect, read) 사용)
+
+        호스트별 서킷 브레이커가 열려 있으면 연결을 시도하지 않고 CircuitOpenError를 던집니다.
+        """
+        if timeout is None:
+            timeout = (settings.http_connect_timeout, settings.http_read_timeout)
+
+        breaker = get_breaker(urlparse(url).netloc)
+        if not breaker.allow():
+            raise CircuitOpenError(f"{urlparse(url).netloc} 서킷 브레이커 열림")
+
+        try:
+            response = self.session.get(url, timeout=timeout, **kwargs)
+        except requests.RequestException:
+            breaker.record_failure()
+            raise
+
+        if response.status_code >= 500 or response.status_code == 429:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    def close(self) -> None:
+        """커넥션 풀 정리"""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+# 전역 HTTP 클라이언트 (CNN FGI, Marketaux 등)
+http_client = HttpClient()
+
+# Yahoo Finance 전용 (기존과 같이 SSL 검증 비활성화)
+yahoo_http_client = HttpClient(verify=False)
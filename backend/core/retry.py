@@ -0,0 +1,180 @@
+"""
+외부 API 재시도 엔진 (시간 예산, 지터 지수 백오프, 호스트별 서킷 브레이커)
+"""
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from core.config import settings
+
+
+class CircuitOpenError(Exception):
+    """서킷 브레이커가 열려 있어 호출하지 않음"""
+
+
+class Deadline:
+    """요청 1건의 전체 시간 예산"""
+
+    def __init__(self, seconds: float):
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """남은 시간 (초, 0 이상)"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+class CircuitBreaker:
+    """호스트별 서킷 브레이커 (closed → open → half-open)
+
+    연속 실패가 failure_threshold에 도달하면 reset_timeout 동안 호출을 즉시 거부하고,
+    이후 한 번의 시험 호출이 성공하면 다시 닫힙니다.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_progress = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """호출 가능 여부 (half-open 상태에서는 시험 호출 1건만 허용)"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            if self._trial_in_progress:
+                return False
+            self._trial_in_progress = True
+            return True
+
+    def is_open(self) -> bool:
+        with self._lock:
+            return (self._opened_at is not None and
+                    time.monotonic() - self._opened_at < self.reset_timeout)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_progress = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_progress = False
+            if self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    print(f"[WARNING] 서킷 브레이커 열림: {self.name} (연속 실패 {self._failures}회)")
+                self._opened_at = time.monotonic()
+
+    def get_state(self) -> Dict:
+        with self._lock:
+            if self._opened_at is None:
+                state = "closed"
+            elif time.monotonic() - self._opened_at < self.reset_timeout:
+                state = "open"
+            else:
+                state = "half_open"
+            return {"state": state, "failures": self._failures}
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(host: str) -> CircuitBreaker:
+    """호스트별 서킷 브레이커 (없으면 생성)"""
+    with _breakers_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                host,
+                failure_threshold=settings.breaker_failure_threshold,
+                reset_timeout=settings.breaker_reset_timeout,
+            )
+            _breakers[host] = breaker
+        return breaker
+
+
+def get_breaker_states() -> Dict[str, Dict]:
+    """전체 서킷 브레이커 상태"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {b.name: b.get_state() for b in breakers}
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """지터 지수 백오프 대기 시간 (full jitter)"""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+def call_with_retry(
+    fn: Callable[[], Any],
+    host: str,
+    deadline: Optional[Deadline] = None,
+    max_attempts: Optional[int] = None,
+    retry_if: Optional[Callable[[Any], bool]] = None,
+    is_failure: Optional[Callable[[Any], bool]] = None,
+) -> Any:
+    """fn을 재시도하며 호출
+
+    Args:
+        fn: 호출할 함수
+        host: 서킷 브레이커 키 (호스트 이름)
+        deadline: 전체 시간 예산 (없으면 settings.retry_time_budget)
+        max_attempts: 최대 시도 횟수 (없으면 settings.retry_max_attempts)
+        retry_if: 정상 반환값이어도 재시도할지 판단 (브레이커는 성공으로 기록)
+        is_failure: 정상 반환값이어도 호스트 장애로 볼지 판단 (예: 연결 실패 시 yfinance가 반환하는
+            빈 DataFrame). True이면 브레이커 실패로 기록하고 재시도합니다.
+
+    Returns:
+        fn의 마지막 반환값
+
+    Raises:
+        CircuitOpenError: 브레이커가 열려 있음 (대기하지 않고 즉시 실패)
+        Exception: 모든 시도가 예외로 끝난 경우 마지막 예외
+    """
+    deadline = deadline or Deadline(settings.retry_time_budget)
+    max_attempts = max_attempts or settings.retry_max_attempts
+    breaker = get_breaker(host)
+    last_error: Optional[BaseException] = None
+    last_result: Any = None
+
+    for attempt in range(max_attempts):
+        if not breaker.allow():
+            raise CircuitOpenError(f"{host} 서킷 브레이커 열림")
+
+        try:
+            result = fn()
+        except Exception as e:
+            breaker.record_failure()
+            last_error = e
+            print(f"[ERROR] {host} 호출 실패 (시도 {attempt + 1}/{max_attempts}): {e}")
+        else:
+            last_error = None
+            last_result = result
+            if is_failure is not None and is_failure(result):
+                breaker.record_failure()
+                print(f"[WARNING] {host} 응답 실패로 판단 (시도 {attempt + 1}/{max_attempts})")
+            else:
+                breaker.record_success()
+                if retry_if is None or not retry_if(result):
+                    return result
+
+        if attempt < max_attempts - 1:
+            delay = backoff_delay(attempt, settings.retry_base_delay, settings.retry_max_delay)
+            if delay >= deadline.remaining():
+                print(f"[WARNING] {host} 시간 예산 소진, 재시도 중단")
+                break
+            time.sleep(delay)
+
+    if last_error is not None:
+        raise last_error
+    return last_result
@@ -0,0 +1,89 @@
+"""
+지표/히스토리 응답 직렬화 (행 단위 루프 없이 컬럼 단위로 변환)
+"""
+from typing import Any, Dict, Iterable, List, Optional, Union
+import numpy as np
+import pandas as pd
+
+# 응답 형식
+RECORDS = "records"  # [{"date": ..., "rsi": ...}, ...]
+COLUMNAR = "columnar"  # {"date": [...], "rsi": [...]}
+FORMATS = (RECORDS, COLUMNAR)
+
+Payload = Union[List[Dict[str, Any]], Dict[str, List[Any]]]
+
+
+class Serializer:
+    """DataFrame 컬럼을 JSON 응답용 리스트로 변환
+
+    날짜 포맷과 float 변환을 컬럼 전체에 한 번씩만 수행하고,
+    결과는 컬럼 형식(dict of lists)으로 캐시한 뒤 요청 형식에 맞춰 내보냅니다.
+    """
+
+    @staticmethod
+    def format_dates(dates: pd.Series) -> List[str]:
+        """날짜 컬럼을 "YYYY-MM-DD" 문자열 목록으로 (datetime이 아니면 str)"""
+        if pd.api.types.is_datetime64_any_dtype(dates):
+            return dates.dt.strftime("%Y-%m-%d").tolist()
+        return [d.strftime("%Y-%m-%d") if hasattr(d, "strftime") else str(d) for d in dates]
+
+    @staticmethod
+    def float_list(values: pd.Series, nullable: bool = False) -> List[Optional[float]]:
+        """float 목록 (nullable이면 NaN을 None으로)"""
+        array = np.asarray(values, dtype=float)
+        if nullable:
+            nan = np.isnan(array)
+            if nan.any():
+                return np.where(nan, None, array).tolist()
+        return array.tolist()
+
+    @staticmethod
+    def int_list(values: pd.Series) -> List[int]:
+        """int 목록 (NaN은 0)"""
+        array = np.asarray(values, dtype=float)
+        return np.where(np.isnan(array), 0, array).astype(np.int64).tolist()
+
+    @staticmethod
+    def columns(dates: pd.Series, fields: Dict[str, pd.Series],
+                mask: Optional[pd.Series] = None, nullable: Iterable[str] = ()) -> Dict[str, List[Any]]:
+        """날짜와 값 컬럼을 컬럼 형식으로 변환
+
+        Args:
+            dates: 날짜 컬럼 ("date" 키로 저장)
+            fields: 응답 키 → 값 Series (키 순서가 레코드의 키 순서)
+            mask: True인 행만 포함 (예: 지표 값이 NaN이 아닌 행)
+            nullable: NaN을 None으로 내보낼 키 (나머지는 float 그대로)
+        """
+        if mask is not None:
+            keep = np.asarray(mask, dtype=bool)
+            dates = dates[keep]
+            fields = {name: values[keep] for name, values in fields.items()}
+        nullable = set(nullable)
+        result: Dict[str, List[Any]] = {"date": Serializer.format_dates(dates)}
+        for name, values in fields.items():
+            result[name] = Serializer.float_list(values, nullable=name in nullable)
+        return result
+
+    @staticmethod
+    def records(columns: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+        """컬럼 형식 → 레코드 목록"""
+        keys = list(columns)
+        return [dict(zip(keys, row)) for row in zip(*columns.values())]
+
+    @staticmethod
+    def render(columns: Dict[str, List[Any]], fmt: str = RECORDS) -> Payload:
+        """요청 형식으로 변환 (columnar면 그대로, records면 행 목록)"""
+        if fmt == COLUMNAR:
+            return columns
+        return Serializer.records(columns)
+
+    @staticmethod
+    def count(payload: Payload) -> int:
+        """응답 데이터 개수 (형식과 무관)"""
+        if isinstance(payload, dict):
+            return len(payload.get("date", []))
+        return len(payload)
+
+    @staticmethod
+    def is_empty(payload: Payload) -> bool:
+        return Serializer.count(payload) == 0
@@ -0,0 +1,115 @@
+"""
+Single-flight 요청 병합 (같은 키의 동시 캐시 미스를 한 번의 fetch/계산으로 합침)
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator
+from core.cache import cache
+
+
+class _Call:
+    """진행 중인 fetch/계산 1건"""
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+
+
+class _Hold:
+    """hold() 키 1개의 lock과 대기 중인 호출 수"""
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.users = 0
+
+
+class SingleFlight:
+    """첫 호출자만 실행하고 동시에 들어온 호출자는 그 결과를 기다림 (스레드 안전)
+    
+    공유 캐시(cache_backend=sqlite)를 쓰면 cache.add로 워커 프로세스 간 lease를 잡아
+    다른 워커가 같은 키를 채우는 동안 기다린 뒤 실행합니다. fn은 시작 시 캐시를
+    다시 확인하므로 기다린 워커는 다른 워커가 채운 값을 그대로 사용합니다.
+    """
+    
+    LEASE_TTL = 30  # 워커 간 lease 최대 유지 시간 (초, 보유 워커가 죽어도 이 시간 후 해제)
+    LEASE_POLL = 0.1  # lease 대기 중 확인 간격 (초)
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self._holds: Dict[str, _Hold] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """key에 대해 fn을 한 번만 실행하고 결과를 공유
+
+        fn이 예외를 던지면 대기 중인 호출자에게도 같은 예외가 전달됩니다.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._run_with_lease(key, fn) if cache.shared else fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def _run_with_lease(self, key: str, fn: Callable[[], Any]) -> Any:
+        """워커 간 lease를 잡고 fn 실행 (LEASE_TTL 동안 못 잡으면 그냥 실행)"""
+        lease_key = f"lease:{key}"
+        waited_until = time.monotonic() + self.LEASE_TTL
+        acquired = cache.add(lease_key, os.getpid(), self.LEASE_TTL)
+        while not acquired and time.monotonic() < waited_until:
+            time.sleep(self.LEASE_POLL)
+            acquired = cache.add(lease_key, os.getpid(), self.LEASE_TTL)
+        try:
+            return fn()
+        finally:
+            if acquired:
+                cache.delete(lease_key)
+    
+    @contextmanager
+    def hold(self, key: str) -> Iterator[None]:
+        """key 구간을 한 번에 한 호출만 실행 (같은 스레드는 재진입 가능)
+
+        결과를 반환값 대신 캐시로 전달하는 경우에 사용합니다. 먼저 들어온 호출이 캐시를
+        채우는 동안 나머지는 기다렸다가, 들어와서 캐시를 다시 확인하면 채워진 값을 읽습니다.
+        """
+        with self._lock:
+            hold = self._holds.get(key)
+            if hold is None:
+                hold = self._holds[key] = _Hold()
+            hold.users += 1
+        hold.lock.acquire()
+        try:
+            yield
+        finally:
+            hold.lock.release()
+            with self._lock:
+                hold.users -= 1
+                if hold.users == 0:
+                    del self._holds[key]
+    
+    def in_flight(self) -> int:
+        """현재 진행 중인 키 개수"""
+        with self._lock:
+            return len(self._calls)
+
+
+# 전역 single-flight 인스턴스
+singleflight = SingleFlight()
@@ -4,8 +4,11 @@ ETF Advisor 백엔드 (무료 API 기반)
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from core.database import init_db
-from routers import market, etf, news, signal, analysis, backtest
+from routers import market, etf, news, signal, analysis, backtest, screener
 from core.cache import cache
+from core.retry import get_breaker_states
+from services.yahoo_service import YahooService
+import threading
 import uvicorn
 from core.config import settings
 
@@ -38,6 +41,7 @@ app.include_router(news.router)
 app.include_router(signal.router)
 app.include_router(analysis.router)
 app.include_router(backtest.router)
+app.include_router(screener.router)
 
 
 @app.on_event("startup")
@@ -45,8 +49,14 @@ async def startup_event():
     """앱 시작 시 초기화"""
     init_db()
     
-    # 캐시 정리
+    # 캐시 정리 (이후 백그라운드에서 주기적으로 정리)
     cache.cleanup_expired()
+    cache.start_sweeper()
+    
+    # 기본 심볼 캐시 워밍업 (배치 다운로드, 백그라운드)
+    warmup_symbols = [s.strip() for s in settings.cache_warmup_symbols.split(",") if s.strip()]
+    if warmup_symbols:
+        threading.Thread(target=YahooService.warm_up, args=(warmup_symbols,), daemon=True).start()
     
     print("[INFO] ETF Advisor 백엔드 시작")
     print("[INFO] 데이터 소스: Yahoo Finance (yfinance)")
@@ -73,10 +83,17 @@ def health_check():
     cache_stats = cache.get_stats()
     return {
         "status": "healthy",
-        "cache": cache_stats
+        "cache": cache_stats,
+        "breakers": get_breaker_states()
     }
 
 
+@app.get("/metrics/cache")
+def cache_metrics():
+    """캐시 prefix별 적중률, 채우기 지연, 보유 크기 (TTL 조정용)"""
+    return cache.get_metrics()
+
+
 @app.get("/debug/env")
 def debug_env():
     """환경변수 디버깅용 엔드포인트"""
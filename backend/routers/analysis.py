@@ -10,6 +10,7 @@ from services.recommendation_service import RecommendationService
 from services.advanced_indicators_service import AdvancedIndicatorsService
 from services.fundamental_service import FundamentalService
 from services.advanced_analysis_service import AdvancedAnalysisService
+from core.serializer import Serializer, FORMATS, RECORDS
 from typing import Dict, Any, List
 import traceback
 
@@ -318,6 +319,52 @@ def get_comprehensive_analysis(symbol: str) -> Dict[str, Any]:
         }
 
 
+@router.get("/{symbol}/candles")
+def get_candlestick_patterns(
+    symbol: str,
+    years: int = Query(3, ge=1, le=5, description="데이터 기간 (년, 1-5)"),
+    extended: bool = Query(False, description="확장 패턴 포함 (Harami, Three Soldiers/Crows, Shooting Star, Marubozu)")
+) -> Dict[str, Any]:
+    """전체 기간 캔들 패턴 목록"""
+    symbol = symbol.upper()
+    try:
+        result = AdvancedAnalysisService.detect_candlestick_patterns(symbol, period_years=years, extended=extended)
+        result["symbol"] = symbol
+        result["count"] = len(result["patterns"])
+        return result
+    except Exception as e:
+        error_msg = f"{symbol} 캔들 패턴 조회 오류: {str(e)}"
+        print(f"[ERROR] {error_msg}")
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=error_msg)
+
+
+@router.get("/{symbol}/regime-history")
+def get_regime_history(
+    symbol: str,
+    window: int = Query(252, ge=0, le=1260, description="백분위 순위 윈도우 (일, 0이면 전체 기간 누적)"),
+    years: int = Query(3, ge=1, le=5, description="데이터 기간 (년, 1-5)"),
+    format: str = Query(RECORDS, description="응답 형식 (records: 행 목록, columnar: 컬럼별 리스트)")
+) -> Dict[str, Any]:
+    """ATR%, 변동성, 거래량, RSI의 롤링 백분위 순위 히스토리 (레짐 차트용)"""
+    symbol = symbol.upper()
+    if format not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"format은 {', '.join(FORMATS)} 중 하나여야 합니다.")
+    try:
+        history = AdvancedAnalysisService.get_regime_history(symbol, window=window, period_years=years, fmt=format)
+        return {
+            "symbol": symbol,
+            "window": window,
+            "count": Serializer.count(history),
+            "data": history
+        }
+    except Exception as e:
+        error_msg = f"{symbol} 레짐 히스토리 조회 오류: {str(e)}"
+        print(f"[ERROR] {error_msg}")
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=error_msg)
+
+
 @router.get("/{symbol}/enhanced")
 def get_enhanced_analysis(symbol: str) -> Dict[str, Any]:
     """확장된 종합 분석 API (캔들 패턴, 추세, 패턴 탐지 등 포함)
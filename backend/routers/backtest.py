@@ -6,6 +6,7 @@ from pydantic import BaseModel
 from typing import Dict, List, Optional
 from services.yahoo_service import YahooService
 from services.indicator_service import IndicatorService
+from services import indicator_kernels
 # SignalService는 signal.py에서 직접 사용하지 않음
 from datetime import datetime, timedelta
 import traceback
@@ -304,22 +305,23 @@ def _run_ma_cross_backtest(symbol: str, history: List[Dict], initial_investment:
     max_equity = initial_investment
     max_drawdown = 0.0
     
+    # 이동평균은 한 번에 계산 (sma[i-1] = 전일까지 window일 평균)
+    closes = [h["close"] for h in history]
+    sma20 = indicator_kernels.sma(closes, 20)
+    sma200 = indicator_kernels.sma(closes, 200)
+    
     for i in range(200, len(history)):  # MA200 계산을 위해 최소 200일 필요
         current_data = history[i]
         current_price = current_data["close"]
         current_date = current_data["date"]
         
-        # MA20, MA200 계산
-        ma20_prices = [h["close"] for h in history[i-20:i]]
-        ma200_prices = [h["close"] for h in history[i-200:i]]
-        
-        ma20 = sum(ma20_prices) / len(ma20_prices)
-        ma200 = sum(ma200_prices) / len(ma200_prices)
+        # MA20, MA200 (당일 제외 과거 20일/200일)
+        ma20 = sma20[i - 1]
+        ma200 = sma200[i - 1]
         
         # 이전 값
         if i > 200:
-            prev_ma20_prices = [h["close"] for h in history[i-21:i-1]]
-            prev_ma20 = sum(prev_ma20_prices) / len(prev_ma20_prices)
+            prev_ma20 = sma20[i - 2]
             
             # 골든 크로스 (MA20이 MA200을 상향 돌파)
             if prev_ma20 <= ma200 and ma20 > ma200 and position == "cash":
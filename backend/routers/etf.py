@@ -6,12 +6,23 @@ from sqlalchemy.orm import Session
 from core.database import get_db
 from services.yahoo_service import YahooService
 from services.indicator_service import IndicatorService
+from services.streaming_indicators import StreamingIndicatorService
+from core.serializer import Serializer, FORMATS, RECORDS
 from typing import List, Dict
 import traceback
 
 router = APIRouter(prefix="/etf", tags=["etf"])
 
 
+def _check_format(fmt: str) -> None:
+    """응답 형식 파라미터 검증"""
+    if fmt not in FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"format은 {', '.join(FORMATS)} 중 하나여야 합니다."
+        )
+
+
 @router.get("/{symbol}/price")
 def get_etf_price(symbol: str):
     """ETF 최신 가격 조회 (모든 심볼 지원)"""
@@ -37,12 +48,14 @@ def get_etf_price(symbol: str):
 @router.get("/{symbol}/history")
 def get_etf_history(
     symbol: str,
-    years: int = Query(3, ge=1, le=5, description="데이터 기간 (년, 1-5)")
+    years: int = Query(3, ge=1, le=5, description="데이터 기간 (년, 1-5)"),
+    format: str = Query(RECORDS, description="응답 형식 (records: 행 목록, columnar: 컬럼별 리스트)")
 ):
     """ETF 가격 히스토리 (3년치 기본, 모든 심볼 지원)"""
     try:
         symbol = symbol.upper()  # 대문자 변환
-        history = YahooService.get_history_list(symbol, years)
+        _check_format(format)
+        history = YahooService.get_history_list(symbol, years, fmt=format)
         if not history:
             return {
                 "symbol": symbol,
@@ -55,7 +68,7 @@ def get_etf_history(
         return {
             "symbol": symbol.upper(),
             "years": years,
-            "count": len(history),
+            "count": Serializer.count(history),
             "data": history
         }
     except HTTPException:
@@ -70,7 +83,8 @@ def get_etf_history(
 @router.get("/{symbol}/ma")
 def get_moving_average(
     symbol: str,
-    days: int = Query(200, description="이동평균 기간 (20, 60, 120, 200 등)")
+    days: int = Query(200, description="이동평균 기간 (20, 60, 120, 200 등)"),
+    format: str = Query(RECORDS, description="응답 형식 (records: 행 목록, columnar: 컬럼별 리스트)")
 ):
     """이동평균선 데이터 (모든 심볼 지원)"""
     try:
@@ -80,8 +94,9 @@ def get_moving_average(
                 status_code=400,
                 detail="days는 20, 60, 120, 200 중 하나여야 합니다."
             )
+        _check_format(format)
         
-        ma_data = IndicatorService.get_moving_average(symbol, days)
+        ma_data = IndicatorService.get_moving_average(symbol, days, fmt=format)
         if not ma_data:
             return {
                 "symbol": symbol,
@@ -94,7 +109,7 @@ def get_moving_average(
         return {
             "symbol": symbol.upper(),
             "period": days,
-            "count": len(ma_data),
+            "count": Serializer.count(ma_data),
             "data": ma_data
         }
     except HTTPException:
@@ -109,12 +124,14 @@ def get_moving_average(
 @router.get("/{symbol}/rsi")
 def get_rsi_data(
     symbol: str,
-    days: int = Query(1095, description="데이터 기간 (일)")
+    days: int = Query(1095, description="데이터 기간 (일)"),
+    format: str = Query(RECORDS, description="응답 형식 (records: 행 목록, columnar: 컬럼별 리스트)")
 ):
     """RSI 데이터 (14일 기준, 모든 심볼 지원)"""
     try:
         symbol = symbol.upper()  # 대문자 변환
-        rsi_data = IndicatorService.get_rsi(symbol)
+        _check_format(format)
+        rsi_data = IndicatorService.get_rsi(symbol, fmt=format)
         if not rsi_data:
             return {
                 "symbol": symbol,
@@ -127,7 +144,7 @@ def get_rsi_data(
         return {
             "symbol": symbol.upper(),
             "period": 14,
-            "count": len(rsi_data),
+            "count": Serializer.count(rsi_data),
             "data": rsi_data
         }
     except HTTPException:
@@ -140,11 +157,15 @@ def get_rsi_data(
 
 
 @router.get("/{symbol}/macd")
-def get_macd_data(symbol: str):
+def get_macd_data(
+    symbol: str,
+    format: str = Query(RECORDS, description="응답 형식 (records: 행 목록, columnar: 컬럼별 리스트)")
+):
     """MACD 데이터 (12/26/9, 모든 심볼 지원)"""
     try:
         symbol = symbol.upper()  # 대문자 변환
-        macd_data = IndicatorService.get_macd(symbol)
+        _check_format(format)
+        macd_data = IndicatorService.get_macd(symbol, fmt=format)
         if not macd_data:
             return {
                 "symbol": symbol,
@@ -161,7 +182,7 @@ def get_macd_data(symbol: str):
             "fast": 12,
             "slow": 26,
             "signal": 9,
-            "count": len(macd_data),
+            "count": Serializer.count(macd_data),
             "data": macd_data
         }
     except HTTPException:
@@ -174,11 +195,15 @@ def get_macd_data(symbol: str):
 
 
 @router.get("/{symbol}/stochastic")
-def get_stochastic_data(symbol: str):
+def get_stochastic_data(
+    symbol: str,
+    format: str = Query(RECORDS, description="응답 형식 (records: 행 목록, columnar: 컬럼별 리스트)")
+):
     """Stochastic Oscillator 데이터 (14일 + 3일 smoothing, 모든 심볼 지원)"""
     try:
         symbol = symbol.upper()  # 대문자 변환
-        stoch_data = IndicatorService.get_stochastic(symbol)
+        _check_format(format)
+        stoch_data = IndicatorService.get_stochastic(symbol, fmt=format)
         if not stoch_data:
             return {
                 "symbol": symbol,
@@ -193,7 +218,7 @@ def get_stochastic_data(symbol: str):
             "symbol": symbol.upper(),
             "k_period": 14,
             "d_period": 3,
-            "count": len(stoch_data),
+            "count": Serializer.count(stoch_data),
             "data": stoch_data
         }
     except HTTPException:
@@ -314,6 +339,37 @@ def get_divergence(symbol: str):
         }
 
 
+@router.get("/{symbol}/divergence/history")
+def get_divergence_history(
+    symbol: str,
+    years: int = Query(3, ge=1, le=5, description="데이터 기간 (년, 1-5)"),
+    left: int = Query(5, ge=1, le=30, description="스윙 피벗 왼쪽 확인 봉 수"),
+    right: int = Query(5, ge=1, le=30, description="스윙 피벗 오른쪽 확인 봉 수"),
+    max_gap: int = Query(60, ge=2, le=252, description="두 피벗 사이 최대 간격 (봉)"),
+    format: str = Query(RECORDS, description="응답 형식 (records: 행 목록, columnar: 컬럼별 리스트)")
+):
+    """RSI/가격 Divergence 히스토리 (스윙 고점/저점 기준 전체 기간, 모든 심볼 지원)"""
+    try:
+        symbol = symbol.upper()
+        _check_format(format)
+        history = IndicatorService.get_divergence_history(
+            symbol, period_years=years, left=left, right=right, max_gap=max_gap, fmt=format
+        )
+        return {
+            "symbol": symbol,
+            "years": years,
+            "count": Serializer.count(history),
+            "data": history
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        error_msg = f"{symbol} Divergence 히스토리 계산 오류: {str(e)}"
+        print(f"[ERROR] {error_msg}")
+        traceback.print_exc()
+        raise HTTPException(status_code=400, detail=error_msg)
+
+
 @router.get("/{symbol}/risk-score")
 def get_risk_score(symbol: str):
     """Risk Score 계산 (모든 심볼 지원)"""
@@ -334,6 +390,46 @@ def get_risk_score(symbol: str):
         }
 
 
+@router.get("/{symbol}/indicators/latest")
+def get_latest_indicators(symbol: str):
+    """최신 봉의 지표 값 (증분 스트림, 새 봉만 반영)"""
+    try:
+        symbol = symbol.upper()
+        latest = StreamingIndicatorService.get_latest(symbol)
+        if not latest:
+            raise HTTPException(status_code=404, detail=f"{symbol} 데이터가 없습니다")
+        return {"symbol": symbol, **latest, "date": latest["date"].strftime("%Y-%m-%d")}
+    except HTTPException:
+        raise
+    except Exception as e:
+        error_msg = f"{symbol} 최신 지표 계산 오류: {str(e)}"
+        print(f"[ERROR] {error_msg}")
+        traceback.print_exc()
+        raise HTTPException(status_code=400, detail=error_msg)
+
+
+@router.get("/{symbol}/indicators/latest/{name}")
+def get_latest_indicator_series(
+    symbol: str,
+    name: str,
+    limit: int = Query(20, ge=1, le=1260, description="최근 값 개수")
+):
+    """증분 스트림에 누적된 지표의 최근 값"""
+    try:
+        symbol = symbol.upper()
+        series = StreamingIndicatorService.get_latest_series(symbol, name, limit)
+        if not series:
+            raise HTTPException(status_code=404, detail=f"{symbol} {name} 지표가 없습니다")
+        return [{"date": date.strftime("%Y-%m-%d"), name: value} for date, value in series]
+    except HTTPException:
+        raise
+    except Exception as e:
+        error_msg = f"{symbol} {name} 지표 조회 오류: {str(e)}"
+        print(f"[ERROR] {error_msg}")
+        traceback.print_exc()
+        raise HTTPException(status_code=400, detail=error_msg)
+
+
 @router.get("/correlation")
 def get_correlation(
     symbol1: str = Query("VIG", description="첫 번째 심볼"),
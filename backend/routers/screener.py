@@ -0,0 +1,68 @@
+"""
+스크리너 라우터 (여러 심볼을 지표 조건으로 필터링/정렬)
+"""
+from fastapi import APIRouter, HTTPException, Query
+from typing import Dict, Optional
+from core.config import settings
+from services.screener_service import ScreenerService
+import traceback
+
+router = APIRouter(prefix="/screener", tags=["screener"])
+
+
+@router.get("")
+def screen_symbols(
+    symbols: Optional[str] = Query(None, description="쉼표 구분 심볼 (없으면 기본 스크리닝 대상)"),
+    years: int = Query(1, ge=1, le=3, description="데이터 기간 (년, 1-3)"),
+    sort: str = Query("rsi", description=f"정렬 기준 ({', '.join(ScreenerService.METRICS)})"),
+    order: str = Query("asc", description="정렬 방향 (asc, desc)"),
+    limit: int = Query(50, ge=1, le=ScreenerService.MAX_SYMBOLS, description="반환할 최대 심볼 수"),
+    ma_days: int = Query(200, ge=2, le=500, description="이동평균 괴리율 기준 기간 (일)"),
+    rsi_min: Optional[float] = Query(None, description="RSI 최소값"),
+    rsi_max: Optional[float] = Query(None, description="RSI 최대값"),
+    ma_distance_min: Optional[float] = Query(None, description="이동평균 괴리율 최소값 (%)"),
+    ma_distance_max: Optional[float] = Query(None, description="이동평균 괴리율 최대값 (%)"),
+    macd_hist_min: Optional[float] = Query(None, description="MACD 히스토그램 최소값"),
+    macd_hist_max: Optional[float] = Query(None, description="MACD 히스토그램 최대값"),
+    volatility_min: Optional[float] = Query(None, description="연율화 변동성 최소값 (%)"),
+    volatility_max: Optional[float] = Query(None, description="연율화 변동성 최대값 (%)"),
+    drawdown_min: Optional[float] = Query(None, description="고점 대비 하락률 최소값 (%)"),
+    drawdown_max: Optional[float] = Query(None, description="고점 대비 하락률 최대값 (%)")
+) -> Dict:
+    """여러 심볼의 RSI, 이동평균 괴리율, MACD 히스토그램, 변동성, 낙폭을 한 번에 계산해 필터/정렬"""
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="order는 asc, desc 중 하나여야 합니다.")
+    
+    raw_symbols = symbols if symbols else settings.screener_default_symbols
+    symbol_list = [s for s in raw_symbols.split(",") if s.strip()]
+    if not symbol_list:
+        raise HTTPException(status_code=400, detail="스크리닝할 심볼이 없습니다.")
+    
+    filters = {
+        name: (low, high)
+        for name, low, high in [
+            ("rsi", rsi_min, rsi_max),
+            ("ma_distance", ma_distance_min, ma_distance_max),
+            ("macd_hist", macd_hist_min, macd_hist_max),
+            ("volatility", volatility_min, volatility_max),
+            ("drawdown", drawdown_min, drawdown_max),
+        ]
+        if low is not None or high is not None
+    }
+    
+    try:
+        result = ScreenerService.screen(
+            symbol_list, years, filters=filters, sort_by=sort,
+            descending=order == "desc", limit=limit, ma_days=ma_days
+        )
+        result["years"] = years
+        result["sort"] = sort
+        result["order"] = order
+        return result
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        error_msg = f"스크리너 실행 오류: {str(e)}"
+        print(f"[ERROR] {error_msg}")
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=error_msg)
@@ -1,23 +1,29 @@
 """
 확장된 기술 분석 서비스 (캔들 패턴, 추세 분석, 패턴 탐지 등)
 """
-import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
-from services.indicator_service import IndicatorService
+from services.indicator_service import IndicatorService, coalesce_fills
+from services.feature_engine import FeatureEngine
+from services import jit_kernels, candlestick_patterns
 from services.yahoo_service import YahooService
 from services.fgi_service import FGIService
 from services.fundamental_service import FundamentalService
 from core.cache import cache
+from core.serializer import Serializer, Payload, RECORDS
 
 
 class AdvancedAnalysisService:
     """확장된 기술 분석 서비스"""
     
     @staticmethod
-    def detect_candlestick_patterns(symbol: str, period_years: int = 3) -> Dict:
-        """캔들 패턴 탐지
+    def detect_candlestick_patterns(symbol: str, period_years: int = 3, extended: bool = False) -> Dict:
+        """캔들 패턴 탐지 (전체 히스토리를 배열 마스크로 한 번에 판정)
+        
+        Args:
+            extended: True면 Harami, Three Soldiers/Crows, Shooting Star, Marubozu도 탐지
+                      (기존 패턴이 맞지 않는 봉에만 적용)
         
         Returns:
             Dict: {
@@ -30,96 +36,29 @@ class AdvancedAnalysisService:
         try:
             symbol = symbol.upper()
             df = IndicatorService._get_history_with_fallback(symbol, period_years)
-            if df is None or df.empty or len(df) < 3:
+            if df is None or df.empty or len(df) < candlestick_patterns.MIN_BARS:
                 return {"patterns": [], "recent_patterns": [], "bullish_count": 0, "bearish_count": 0}
             
-            patterns = []
-            bullish_count = 0
-            bearish_count = 0
+            codes = candlestick_patterns.classify(df["open"], df["high"], df["low"], df["close"], extended)
+            table = candlestick_patterns.patterns(extended)
             
-            for i in range(2, len(df)):
-                row = df.iloc[i]
-                prev_row = df.iloc[i-1]
-                prev2_row = df.iloc[i-2]
-                
-                open_price = row["open"]
-                high = row["high"]
-                low = row["low"]
-                close = row["close"]
-                prev_open = prev_row["open"]
-                prev_high = prev_row["high"]
-                prev_low = prev_row["low"]
-                prev_close = prev_row["close"]
-                prev2_open = prev2_row["open"]
-                prev2_close = prev2_row["close"]
-                
-                body = abs(close - open_price)
-                upper_shadow = high - max(open_price, close)
-                lower_shadow = min(open_price, close) - low
-                total_range = high - low
-                
-                pattern_name = None
-                signal = None
-                
-                # Hammer (망치형)
-                if lower_shadow > 2 * body and upper_shadow < 0.1 * body and close > open_price:
-                    pattern_name = "Hammer"
-                    signal = "bullish"
-                    bullish_count += 1
-                
-                # Doji (십자형)
-                elif body < 0.1 * total_range:
-                    pattern_name = "Doji"
-                    signal = "neutral"
-                
-                # Bullish Engulfing
-                elif prev_close < prev_open and close > open_price and open_price < prev_close and close > prev_open:
-                    pattern_name = "Bullish Engulfing"
-                    signal = "bullish"
-                    bullish_count += 1
-                
-                # Bearish Engulfing
-                elif prev_close > prev_open and close < open_price and open_price > prev_close and close < prev_open:
-                    pattern_name = "Bearish Engulfing"
-                    signal = "bearish"
-                    bearish_count += 1
-                
-                # Morning Star
-                elif (i >= 2 and 
-                      prev2_close < prev2_open and
-                      prev_close < prev2_close and
-                      close > prev2_close and
-                      close > open_price):
-                    pattern_name = "Morning Star"
-                    signal = "bullish"
-                    bullish_count += 1
-                
-                # Evening Star
-                elif (i >= 2 and
-                      prev2_close > prev2_open and
-                      prev_close > prev2_close and
-                      close < prev2_close and
-                      close < open_price):
-                    pattern_name = "Evening Star"
-                    signal = "bearish"
-                    bearish_count += 1
-                
-                if pattern_name:
-                    date_str = row["date"].strftime("%Y-%m-%d") if hasattr(row["date"], 'strftime') else str(row["date"])
-                    patterns.append({
-                        "date": date_str,
-                        "pattern": pattern_name,
-                        "signal": signal,
-                        "price": float(close)
-                    })
+            positions = np.flatnonzero(codes >= 0)
+            found = codes[positions]
+            signals = [table[code][1] for code in found]
+            patterns = Serializer.records({
+                "date": Serializer.format_dates(df["date"].iloc[positions]),
+                "pattern": [table[code][0] for code in found],
+                "signal": signals,
+                "price": Serializer.float_list(df["close"].iloc[positions]),
+            })
             
             recent_patterns = patterns[-5:] if len(patterns) >= 5 else patterns
             
             return {
                 "patterns": patterns,
                 "recent_patterns": recent_patterns,
-                "bullish_count": bullish_count,
-                "bearish_count": bearish_count
+                "bullish_count": signals.count("bullish"),
+                "bearish_count": signals.count("bearish")
             }
         except Exception as e:
             print(f"[ERROR] 캔들 패턴 탐지 오류 ({symbol}): {e}")
@@ -146,7 +85,6 @@ class AdvancedAnalysisService:
                     "recent_crosses": []
                 }
             
-            df = df.copy()
             df["ma20"] = df["close"].rolling(window=20, min_periods=1).mean()
             df["ma50"] = df["close"].rolling(window=50, min_periods=1).mean()
             df["ma60"] = df["close"].rolling(window=60, min_periods=1).mean()
@@ -254,7 +192,6 @@ class AdvancedAnalysisService:
                     "overall_trend": "unknown"
                 }
             
-            df = df.copy()
             df["ma20"] = df["close"].rolling(window=20, min_periods=1).mean()
             df["ma200"] = df["close"].rolling(window=200, min_periods=1).mean()
             
@@ -380,7 +317,6 @@ class AdvancedAnalysisService:
                     "bollinger": {"upper_touch": False, "lower_touch": False, "position": "middle"}
                 }
             
-            df = df.copy()
             recent_60 = df.tail(60)
             
             # 박스권 탐지
@@ -514,32 +450,18 @@ class AdvancedAnalysisService:
                     "buy_timing_score": 50
                 }
             
-            df = df.copy()
             period = 14
             
-            # ATR 계산
-            high_low = df["high"] - df["low"]
-            high_close = abs(df["high"] - df["close"].shift(1))
-            low_close = abs(df["low"] - df["close"].shift(1))
-            tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-            atr = tr.rolling(window=period).mean()
+            # ATR과 ATR% (심볼 피처 프레임에서 읽기)
+            atr, atr_pct = FeatureEngine.features(symbol, df, ("atr", period), ("atr_pct", period))
             
             current_atr = atr.iloc[-1]
             current_price = df.iloc[-1]["close"]
             atr_percent = (current_atr / current_price * 100) if current_price > 0 else 0
             
-            # ATR 히스토리 백분위수
-            atr_percentiles = []
-            for i in range(period, len(df)):
-                price_at_i = df.iloc[i]["close"]
-                atr_at_i = atr.iloc[i]
-                if price_at_i > 0:
-                    atr_percentiles.append((atr_at_i / price_at_i * 100))
-            
-            if atr_percentiles:
-                atr_percentile = (sum(1 for p in atr_percentiles if p < atr_percent) / len(atr_percentiles) * 100)
-            else:
-                atr_percentile = 50
+            # ATR% 히스토리 대비 현재 백분위수 (period번째 봉부터 누적, Fenwick 트리 순위)
+            ranks = jit_kernels.rolling_percentile_rank(atr_pct.iloc[period:])
+            atr_percentile = float(ranks[-1]) if len(ranks) and not np.isnan(ranks[-1]) else 50
             
             # ATR 스파이크 감지 (90% 백분위수 이상)
             atr_spike = atr_percentile >= 90
@@ -567,6 +489,49 @@ class AdvancedAnalysisService:
                 "buy_timing_score": 50
             }
     
+    @staticmethod
+    @coalesce_fills
+    def get_regime_history(symbol: str, window: int = 252, period_years: int = 3, fmt: str = RECORDS) -> Payload:
+        """변동성/거래량/RSI 레짐 히스토리 (각 지표의 최근 window일 롤링 백분위 순위, 0이면 누적)
+        
+        Returns:
+            List[Dict]: [{"date": str, "atr_pct": float, "atr_pct_rank": float, "volatility": float,
+                          "volatility_rank": float, "volume_rank": float, "rsi_rank": float}]
+            fmt="columnar"이면 {"date": [...], ...} 형식의 키별 리스트
+        """
+        symbol = symbol.upper()
+        cache_key = IndicatorService._get_cache_key("regime", symbol, window, period_years)
+        cached = IndicatorService._get_cached(symbol, cache_key)
+        if cached is not None:
+            return Serializer.render(cached, fmt)
+        
+        try:
+            df = IndicatorService._get_history_with_fallback(symbol, period_years)
+            if df is None or df.empty or len(df) < 30:
+                return []
+            
+            atr_pct, volatility, atr_rank, volatility_rank, volume_rank, rsi_rank = FeatureEngine.features(
+                symbol, df, ("atr_pct", 14), ("volatility", 30),
+                ("pct_rank", ("atr_pct", 14), window), ("pct_rank", ("volatility", 30), window),
+                ("pct_rank", "volume", window), ("pct_rank", ("rsi", 14), window)
+            )
+            
+            result = Serializer.columns(
+                df["date"],
+                {"atr_pct": atr_pct, "atr_pct_rank": atr_rank, "volatility": volatility,
+                 "volatility_rank": volatility_rank, "volume_rank": volume_rank, "rsi_rank": rsi_rank},
+                mask=volatility_rank.notna(),
+                nullable=("atr_pct_rank", "volume_rank", "rsi_rank")
+            )
+            
+            # 캐시 저장 (컬럼 형식, 히스토리 변경 시 무효화)
+            IndicatorService._set_cached(symbol, cache_key, result)
+            return Serializer.render(result, fmt)
+            
+        except Exception as e:
+            print(f"[ERROR] {symbol} 레짐 히스토리 계산 실패: {e}")
+            return []
+    
     @staticmethod
     def analyze_obv(symbol: str, period_years: int = 3) -> Dict:
         """OBV (On-Balance Volume) 분석
@@ -590,20 +555,12 @@ class AdvancedAnalysisService:
                     "money_flow": "neutral"
                 }
             
-            df = df.copy()
-            df["obv"] = 0.0
-            obv = 0.0
-            
-            for i in range(1, len(df)):
-                if df.iloc[i]["close"] > df.iloc[i-1]["close"]:
-                    obv += df.iloc[i]["volume"]
-                elif df.iloc[i]["close"] < df.iloc[i-1]["close"]:
-                    obv -= df.iloc[i]["volume"]
-                df.iloc[i, df.columns.get_loc("obv")] = obv
+            # OBV = sign(종가 변화) * 거래량의 누적합 (심볼 피처 프레임에서 읽기)
+            obv, = FeatureEngine.features(symbol, df, "obv")
             
             # OBV 추세
             if len(df) >= 20:
-                recent_obv = df.tail(20)["obv"]
+                recent_obv = obv.iloc[-20:]
                 obv_slope = (recent_obv.iloc[-1] - recent_obv.iloc[0]) / abs(recent_obv.iloc[0]) * 100 if recent_obv.iloc[0] != 0 else 0
                 
                 if obv_slope > 5:
@@ -1,11 +1,11 @@
 """
-고급 기술지표 계산 서비스 (CCI, ADX, OBV, 볼린저밴드, VWAP)
+고급 기술지표 계산 서비스 (CCI, ADX, Parabolic SAR, SuperTrend, OBV, A/D, CMF, 볼린저밴드, VWAP)
 """
-import pandas as pd
-import numpy as np
 from typing import List, Dict, Optional
+from core.serializer import Serializer, Payload, RECORDS
 from services.yahoo_service import YahooService
-from core.cache import cache
+from services.indicator_service import IndicatorService, coalesce_fills
+from services.feature_engine import FeatureEngine
 
 
 class AdvancedIndicatorsService:
@@ -21,252 +21,314 @@ class AdvancedIndicatorsService:
         return ":".join(key_parts)
     
     @staticmethod
-    def get_cci(symbol: str, period: int = 20, period_years: int = 1) -> List[Dict]:
+    @coalesce_fills
+    def get_cci(symbol: str, period: int = 20, period_years: int = 1, fmt: str = RECORDS) -> Payload:
         """CCI (Commodity Channel Index) 계산
         
         Returns:
             List[Dict]: [{"date": str, "cci": float}]
+            fmt="columnar"이면 {"date": [...], ...} 형식의 키별 리스트
         """
         symbol = symbol.upper()
         cache_key = AdvancedIndicatorsService._get_cache_key("cci", symbol, period, period_years)
-        cached = cache.get(cache_key)
+        cached = IndicatorService._get_cached(symbol, cache_key)
         if cached is not None:
-            return cached
+            return Serializer.render(cached, fmt)
         
         try:
             df = YahooService.get_history(symbol, period_years)
             if df is None or df.empty or len(df) < period:
                 return []
             
-            df = df.copy()
-            # Typical Price
-            df["tp"] = (df["high"] + df["low"] + df["close"]) / 3
-            # SMA of TP
-            df["sma_tp"] = df["tp"].rolling(window=period).mean()
-            # Mean Deviation
-            df["md"] = df["tp"].rolling(window=period).apply(
-                lambda x: np.mean(np.abs(x - x.mean()))
-            )
-            # CCI
-            df["cci"] = (df["tp"] - df["sma_tp"]) / (0.015 * df["md"])
+            # CCI (Typical Price 기준, 심볼 피처 프레임에서 읽기)
+            cci, = FeatureEngine.features(symbol, df, ("cci", period))
             
-            result = []
-            for _, row in df.iterrows():
-                if pd.notna(row.get("cci")):
-                    date_str = row["date"].strftime("%Y-%m-%d") if hasattr(row["date"], 'strftime') else str(row["date"])
-                    result.append({
-                        "date": date_str,
-                        "cci": float(row["cci"])
-                    })
+            result = Serializer.columns(df["date"], {"cci": cci}, mask=cci.notna())
             
-            cache.set(cache_key, result, 15 * 60)
-            return result
+            IndicatorService._set_cached(symbol, cache_key, result)
+            return Serializer.render(result, fmt)
             
         except Exception as e:
             print(f"[ERROR] {symbol} CCI 계산 실패: {e}")
             return []
     
     @staticmethod
-    def get_adx(symbol: str, period: int = 14, period_years: int = 1) -> List[Dict]:
+    @coalesce_fills
+    def get_adx(symbol: str, period: int = 14, period_years: int = 1, fmt: str = RECORDS,
+                smoothing: str = "simple") -> Payload:
         """ADX (Average Directional Index) 계산
         
+        Args:
+            smoothing: "simple" - TR/DM/DX의 period일 단순 평균, "wilder" - Wilder 평활
+        
         Returns:
             List[Dict]: [{"date": str, "adx": float, "di_plus": float, "di_minus": float}]
+            fmt="columnar"이면 {"date": [...], ...} 형식의 키별 리스트
         """
         symbol = symbol.upper()
-        cache_key = AdvancedIndicatorsService._get_cache_key("adx", symbol, period, period_years)
-        cached = cache.get(cache_key)
+        if smoothing not in ("simple", "wilder"):
+            raise ValueError(f"지원하지 않는 평활 방식: {smoothing}")
+        cache_key = AdvancedIndicatorsService._get_cache_key("adx", symbol, period, period_years, smoothing)
+        cached = IndicatorService._get_cached(symbol, cache_key)
         if cached is not None:
-            return cached
+            return Serializer.render(cached, fmt)
         
         try:
             df = YahooService.get_history(symbol, period_years)
             if df is None or df.empty or len(df) < period * 2:
                 return []
             
-            df = df.copy()
-            # True Range
-            df["prev_close"] = df["close"].shift(1)
-            df["tr1"] = df["high"] - df["low"]
-            df["tr2"] = abs(df["high"] - df["prev_close"])
-            df["tr3"] = abs(df["low"] - df["prev_close"])
-            df["tr"] = df[["tr1", "tr2", "tr3"]].max(axis=1)
-            
-            # Directional Movement
-            df["dm_plus"] = np.where(
-                (df["high"] - df["high"].shift(1)) > (df["low"].shift(1) - df["low"]),
-                np.maximum(df["high"] - df["high"].shift(1), 0),
-                0
+            # ADX와 DI+/DI- (ATR과 함께 심볼 피처 프레임에서 읽기)
+            suffix = "_wilder" if smoothing == "wilder" else ""
+            adx, di_plus, di_minus = FeatureEngine.features(
+                symbol, df, ("adx" + suffix, period), ("di_plus" + suffix, period), ("di_minus" + suffix, period)
             )
-            df["dm_minus"] = np.where(
-                (df["low"].shift(1) - df["low"]) > (df["high"] - df["high"].shift(1)),
-                np.maximum(df["low"].shift(1) - df["low"], 0),
-                0
+            
+            result = Serializer.columns(
+                df["date"],
+                {"adx": adx, "di_plus": di_plus.fillna(0.0), "di_minus": di_minus.fillna(0.0)},
+                mask=adx.notna()
             )
             
-            # Smoothed TR, DM+
-            atr = df["tr"].rolling(window=period).mean()
-            df["atr"] = atr
-            df["di_plus"] = 100 * (df["dm_plus"].rolling(window=period).mean() / df["atr"])
-            df["di_minus"] = 100 * (df["dm_minus"].rolling(window=period).mean() / df["atr"])
-            
-            # DX and ADX
-            df["dx"] = 100 * abs(df["di_plus"] - df["di_minus"]) / (df["di_plus"] + df["di_minus"])
-            df["adx"] = df["dx"].rolling(window=period).mean()
-            
-            result = []
-            for _, row in df.iterrows():
-                if pd.notna(row.get("adx")):
-                    date_str = row["date"].strftime("%Y-%m-%d") if hasattr(row["date"], 'strftime') else str(row["date"])
-                    result.append({
-                        "date": date_str,
-                        "adx": float(row["adx"]),
-                        "di_plus": float(row["di_plus"]) if pd.notna(row.get("di_plus")) else 0.0,
-                        "di_minus": float(row["di_minus"]) if pd.notna(row.get("di_minus")) else 0.0,
-                    })
-            
-            cache.set(cache_key, result, 15 * 60)
-            return result
+            IndicatorService._set_cached(symbol, cache_key, result)
+            return Serializer.render(result, fmt)
             
         except Exception as e:
             print(f"[ERROR] {symbol} ADX 계산 실패: {e}")
             return []
     
     @staticmethod
-    def get_obv(symbol: str, period_years: int = 1) -> List[Dict]:
+    @coalesce_fills
+    def get_parabolic_sar(symbol: str, step: float = 0.02, max_step: float = 0.2, period_years: int = 1,
+                          fmt: str = RECORDS) -> Payload:
+        """Parabolic SAR 계산
+        
+        Returns:
+            List[Dict]: [{"date": str, "sar": float, "trend": float}] (trend: 상승 1 / 하락 -1)
+            fmt="columnar"이면 {"date": [...], ...} 형식의 키별 리스트
+        """
+        symbol = symbol.upper()
+        cache_key = AdvancedIndicatorsService._get_cache_key("psar", symbol, step, max_step, period_years)
+        cached = IndicatorService._get_cached(symbol, cache_key)
+        if cached is not None:
+            return Serializer.render(cached, fmt)
+        
+        try:
+            df = YahooService.get_history(symbol, period_years)
+            if df is None or df.empty or len(df) < 2:
+                return []
+            
+            sar, trend = FeatureEngine.features(
+                symbol, df, ("psar", step, max_step), ("psar_trend", step, max_step)
+            )
+            
+            result = Serializer.columns(df["date"], {"sar": sar, "trend": trend}, mask=sar.notna())
+            
+            IndicatorService._set_cached(symbol, cache_key, result)
+            return Serializer.render(result, fmt)
+            
+        except Exception as e:
+            print(f"[ERROR] {symbol} Parabolic SAR 계산 실패: {e}")
+            return []
+    
+    @staticmethod
+    @coalesce_fills
+    def get_supertrend(symbol: str, period: int = 10, multiplier: float = 3.0, period_years: int = 1,
+                       fmt: str = RECORDS) -> Payload:
+        """SuperTrend 계산 (hl2 ± multiplier * Wilder ATR)
+        
+        Returns:
+            List[Dict]: [{"date": str, "supertrend": float, "direction": float}] (direction: 상승 1 / 하락 -1)
+            fmt="columnar"이면 {"date": [...], ...} 형식의 키별 리스트
+        """
+        symbol = symbol.upper()
+        cache_key = AdvancedIndicatorsService._get_cache_key("supertrend", symbol, period, multiplier, period_years)
+        cached = IndicatorService._get_cached(symbol, cache_key)
+        if cached is not None:
+            return Serializer.render(cached, fmt)
+        
+        try:
+            df = YahooService.get_history(symbol, period_years)
+            if df is None or df.empty or len(df) <= period:
+                return []
+            
+            line, direction = FeatureEngine.features(
+                symbol, df, ("supertrend", period, multiplier), ("supertrend_direction", period, multiplier)
+            )
+            
+            result = Serializer.columns(df["date"], {"supertrend": line, "direction": direction},
+                                        mask=line.notna())
+            
+            IndicatorService._set_cached(symbol, cache_key, result)
+            return Serializer.render(result, fmt)
+            
+        except Exception as e:
+            print(f"[ERROR] {symbol} SuperTrend 계산 실패: {e}")
+            return []
+    
+    @staticmethod
+    @coalesce_fills
+    def get_obv(symbol: str, period_years: int = 1, fmt: str = RECORDS) -> Payload:
         """OBV (On-Balance Volume) 계산
         
         Returns:
             List[Dict]: [{"date": str, "obv": float}]
+            fmt="columnar"이면 {"date": [...], ...} 형식의 키별 리스트
         """
         symbol = symbol.upper()
         cache_key = AdvancedIndicatorsService._get_cache_key("obv", symbol, period_years)
-        cached = cache.get(cache_key)
+        cached = IndicatorService._get_cached(symbol, cache_key)
         if cached is not None:
-            return cached
+            return Serializer.render(cached, fmt)
         
         try:
             df = YahooService.get_history(symbol, period_years)
             if df is None or df.empty:
                 return []
             
-            df = df.copy()
-            df["volume"] = df["volume"].fillna(0)
-            df["prev_close"] = df["close"].shift(1)
-            
-            # OBV 계산
-            df["obv"] = 0.0
-            for i in range(1, len(df)):
-                if df.iloc[i]["close"] > df.iloc[i-1]["close"]:
-                    df.iloc[i, df.columns.get_loc("obv")] = df.iloc[i-1]["obv"] + df.iloc[i]["volume"]
-                elif df.iloc[i]["close"] < df.iloc[i-1]["close"]:
-                    df.iloc[i, df.columns.get_loc("obv")] = df.iloc[i-1]["obv"] - df.iloc[i]["volume"]
-                else:
-                    df.iloc[i, df.columns.get_loc("obv")] = df.iloc[i-1]["obv"]
-            
-            result = []
-            for _, row in df.iterrows():
-                if pd.notna(row.get("obv")):
-                    date_str = row["date"].strftime("%Y-%m-%d") if hasattr(row["date"], 'strftime') else str(row["date"])
-                    result.append({
-                        "date": date_str,
-                        "obv": float(row["obv"])
-                    })
-            
-            cache.set(cache_key, result, 15 * 60)
-            return result
+            # OBV = sign(종가 변화) * 거래량의 누적합 (심볼 피처 프레임에서 읽기)
+            obv, = FeatureEngine.features(symbol, df, "obv")
+            
+            result = Serializer.columns(df["date"], {"obv": obv}, mask=obv.notna())
+            
+            IndicatorService._set_cached(symbol, cache_key, result)
+            return Serializer.render(result, fmt)
             
         except Exception as e:
             print(f"[ERROR] {symbol} OBV 계산 실패: {e}")
             return []
     
     @staticmethod
-    def get_bollinger_bands(symbol: str, period: int = 20, std_dev: int = 2, period_years: int = 1) -> List[Dict]:
+    @coalesce_fills
+    def get_ad_line(symbol: str, period_years: int = 1, fmt: str = RECORDS) -> Payload:
+        """A/D Line (Accumulation/Distribution) 계산
+        
+        Returns:
+            List[Dict]: [{"date": str, "ad": float}]
+            fmt="columnar"이면 {"date": [...], ...} 형식의 키별 리스트
+        """
+        symbol = symbol.upper()
+        cache_key = AdvancedIndicatorsService._get_cache_key("ad", symbol, period_years)
+        cached = IndicatorService._get_cached(symbol, cache_key)
+        if cached is not None:
+            return Serializer.render(cached, fmt)
+        
+        try:
+            df = YahooService.get_history(symbol, period_years)
+            if df is None or df.empty:
+                return []
+            
+            # A/D = Close Location Value * 거래량의 누적합 (심볼 피처 프레임에서 읽기)
+            ad, = FeatureEngine.features(symbol, df, "ad")
+            
+            result = Serializer.columns(df["date"], {"ad": ad}, mask=ad.notna())
+            
+            IndicatorService._set_cached(symbol, cache_key, result)
+            return Serializer.render(result, fmt)
+            
+        except Exception as e:
+            print(f"[ERROR] {symbol} A/D Line 계산 실패: {e}")
+            return []
+    
+    @staticmethod
+    @coalesce_fills
+    def get_cmf(symbol: str, period: int = 20, period_years: int = 1, fmt: str = RECORDS) -> Payload:
+        """CMF (Chaikin Money Flow) 계산
+        
+        Returns:
+            List[Dict]: [{"date": str, "cmf": float}]
+            fmt="columnar"이면 {"date": [...], ...} 형식의 키별 리스트
+        """
+        symbol = symbol.upper()
+        cache_key = AdvancedIndicatorsService._get_cache_key("cmf", symbol, period, period_years)
+        cached = IndicatorService._get_cached(symbol, cache_key)
+        if cached is not None:
+            return Serializer.render(cached, fmt)
+        
+        try:
+            df = YahooService.get_history(symbol, period_years)
+            if df is None or df.empty or len(df) < period:
+                return []
+            
+            # CMF = period일 Money Flow Volume 합 / period일 거래량 합 (심볼 피처 프레임에서 읽기)
+            cmf, = FeatureEngine.features(symbol, df, ("cmf", period))
+            
+            result = Serializer.columns(df["date"], {"cmf": cmf}, mask=cmf.notna())
+            
+            IndicatorService._set_cached(symbol, cache_key, result)
+            return Serializer.render(result, fmt)
+            
+        except Exception as e:
+            print(f"[ERROR] {symbol} CMF 계산 실패: {e}")
+            return []
+    
+    @staticmethod
+    @coalesce_fills
+    def get_bollinger_bands(symbol: str, period: int = 20, std_dev: int = 2, period_years: int = 1,
+                            fmt: str = RECORDS) -> Payload:
         """볼린저밴드 계산
         
         Returns:
             List[Dict]: [{"date": str, "upper": float, "middle": float, "lower": float, "width": float}]
+            fmt="columnar"이면 {"date": [...], ...} 형식의 키별 리스트
         """
         symbol = symbol.upper()
         cache_key = AdvancedIndicatorsService._get_cache_key("bb", symbol, period, std_dev, period_years)
-        cached = cache.get(cache_key)
+        cached = IndicatorService._get_cached(symbol, cache_key)
         if cached is not None:
-            return cached
+            return Serializer.render(cached, fmt)
         
         try:
             df = YahooService.get_history(symbol, period_years)
             if df is None or df.empty or len(df) < period:
                 return []
             
-            df = df.copy()
-            # Middle Band (SMA)
-            df["middle"] = df["close"].rolling(window=period).mean()
-            # Standard Deviation
-            df["std"] = df["close"].rolling(window=period).std()
-            # Upper and Lower Bands
-            df["upper"] = df["middle"] + (df["std"] * std_dev)
-            df["lower"] = df["middle"] - (df["std"] * std_dev)
-            # Band Width
-            df["width"] = (df["upper"] - df["lower"]) / df["middle"] * 100
-            
-            result = []
-            for _, row in df.iterrows():
-                if pd.notna(row.get("middle")):
-                    date_str = row["date"].strftime("%Y-%m-%d") if hasattr(row["date"], 'strftime') else str(row["date"])
-                    result.append({
-                        "date": date_str,
-                        "upper": float(row["upper"]) if pd.notna(row.get("upper")) else None,
-                        "middle": float(row["middle"]),
-                        "lower": float(row["lower"]) if pd.notna(row.get("lower")) else None,
-                        "width": float(row["width"]) if pd.notna(row.get("width")) else None,
-                    })
-            
-            cache.set(cache_key, result, 15 * 60)
-            return result
+            # Middle(SMA), Upper/Lower(± std_dev 표준편차), Band Width (심볼 피처 프레임에서 읽기)
+            middle, upper, lower, width = FeatureEngine.features(
+                symbol, df, ("bb_middle", period), ("bb_upper", period, std_dev),
+                ("bb_lower", period, std_dev), ("bb_width", period, std_dev)
+            )
+            
+            result = Serializer.columns(
+                df["date"],
+                {"upper": upper, "middle": middle, "lower": lower, "width": width},
+                mask=middle.notna(), nullable=("upper", "lower", "width")
+            )
+            
+            IndicatorService._set_cached(symbol, cache_key, result)
+            return Serializer.render(result, fmt)
             
         except Exception as e:
             print(f"[ERROR] {symbol} 볼린저밴드 계산 실패: {e}")
             return []
     
     @staticmethod
-    def get_vwap(symbol: str, period_years: int = 1) -> List[Dict]:
+    @coalesce_fills
+    def get_vwap(symbol: str, period_years: int = 1, fmt: str = RECORDS) -> Payload:
         """VWAP (Volume Weighted Average Price) 계산
         
         Returns:
             List[Dict]: [{"date": str, "vwap": float}]
+            fmt="columnar"이면 {"date": [...], ...} 형식의 키별 리스트
         """
         symbol = symbol.upper()
         cache_key = AdvancedIndicatorsService._get_cache_key("vwap", symbol, period_years)
-        cached = cache.get(cache_key)
+        cached = IndicatorService._get_cached(symbol, cache_key)
         if cached is not None:
-            return cached
+            return Serializer.render(cached, fmt)
         
         try:
             df = YahooService.get_history(symbol, period_years)
             if df is None or df.empty:
                 return []
             
-            df = df.copy()
-            df["volume"] = df["volume"].fillna(0)
-            # Typical Price
-            df["tp"] = (df["high"] + df["low"] + df["close"]) / 3
-            # VWAP = (TP * Volume)의 누적합 / Volume의 누적합
-            df["pv"] = df["tp"] * df["volume"]
-            df["cum_pv"] = df["pv"].cumsum()
-            df["cum_volume"] = df["volume"].cumsum()
-            df["vwap"] = df["cum_pv"] / df["cum_volume"]
-            
-            result = []
-            for _, row in df.iterrows():
-                if pd.notna(row.get("vwap")):
-                    date_str = row["date"].strftime("%Y-%m-%d") if hasattr(row["date"], 'strftime') else str(row["date"])
-                    result.append({
-                        "date": date_str,
-                        "vwap": float(row["vwap"])
-                    })
-            
-            cache.set(cache_key, result, 15 * 60)
-            return result
+            # VWAP = (TP * Volume)의 누적합 / Volume의 누적합 (심볼 피처 프레임에서 읽기)
+            vwap, = FeatureEngine.features(symbol, df, "vwap")
+            
+            result = Serializer.columns(df["date"], {"vwap": vwap}, mask=vwap.notna())
+            
+            IndicatorService._set_cached(symbol, cache_key, result)
+            return Serializer.render(result, fmt)
             
         except Exception as e:
             print(f"[ERROR] {symbol} VWAP 계산 실패: {e}")
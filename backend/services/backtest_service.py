@@ -2,59 +2,37 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from services.etf_service import ETFService
+from services.yahoo_service import YahooService
 from services.indicator_service import IndicatorService
-from services.signal_service import SignalService
-from services.portfolio_service import PortfolioService
+from services import indicator_kernels
 from typing import Dict, List
 from models.schemas import BacktestResult
 
 
 class BacktestService:
+    @staticmethod
+    def _load_closes(symbol: str, period_years: int) -> pd.DataFrame:
+        """백테스트 기간(+ 지표 계산용 100일) 종가 (date, close)"""
+        df = YahooService.get_history(symbol, period_years + 1)
+        if df is None or df.empty:
+            return pd.DataFrame(columns=["date", "close"])
+        df = df[["date", "close"]]
+        start = df["date"].iloc[-1] - timedelta(days=period_years * 365 + 100)
+        return df[(df["date"] >= start) & (df["close"] > 0)]
+    
     @staticmethod
     def run_backtest(db: Session, period_years: int, initial_investment: float = 10000) -> Dict:
-        """백테스트 실행"""
+        """백테스트 실행 (db는 기존 호출 호환용, 가격은 YahooService 히스토리 사용)"""
         try:
             # 데이터 가져오기
-            vig_prices = ETFService.get_price_history(db, "VIG", days=period_years * 365 + 100)
-            qld_prices = ETFService.get_price_history(db, "QLD", days=period_years * 365 + 100)
-            
-            if not vig_prices or len(vig_prices) < 200:
-                return {"error": f"VIG 데이터가 부족합니다. 현재 {len(vig_prices) if vig_prices else 0}개 데이터만 있습니다. (최소 200일 필요)\n먼저 ETF 데이터를 업데이트해주세요."}
-            
-            if not qld_prices or len(qld_prices) < 200:
-                return {"error": f"QLD 데이터가 부족합니다. 현재 {len(qld_prices) if qld_prices else 0}개 데이터만 있습니다. (최소 200일 필요)\n먼저 ETF 데이터를 업데이트해주세요."}
+            vig_df = BacktestService._load_closes("VIG", period_years)
+            qld_df = BacktestService._load_closes("QLD", period_years)
             
-            # DataFrame 생성 (ETFPriceResponse 객체에서 속성 추출)
-            vig_data = []
-            for p in vig_prices:
-                try:
-                    date_val = p.date if hasattr(p, 'date') else p.get('date', None) if isinstance(p, dict) else None
-                    close_val = float(p.close if hasattr(p, 'close') else p.get('close', 0) if isinstance(p, dict) else 0)
-                    if date_val and close_val > 0:
-                        vig_data.append({"date": date_val, "close": close_val})
-                except:
-                    continue
+            if len(vig_df) < 200:
+                return {"error": f"VIG 데이터가 부족합니다. 현재 {len(vig_df)}개 데이터만 있습니다. (최소 200일 필요)"}
             
-            qld_data = []
-            for p in qld_prices:
-                try:
-                    date_val = p.date if hasattr(p, 'date') else p.get('date', None) if isinstance(p, dict) else None
-                    close_val = float(p.close if hasattr(p, 'close') else p.get('close', 0) if isinstance(p, dict) else 0)
-                    if date_val and close_val > 0:
-                        qld_data.append({"date": date_val, "close": close_val})
-                except:
-                    continue
-            
-            if not vig_data or not qld_data:
-                return {"error": "ETF 데이터가 없습니다. 먼저 ETF 데이터를 업데이트해주세요."}
-            
-            vig_df = pd.DataFrame(vig_data)
-            qld_df = pd.DataFrame(qld_data)
-            
-            # 날짜를 datetime으로 변환
-            vig_df['date'] = pd.to_datetime(vig_df['date'])
-            qld_df['date'] = pd.to_datetime(qld_df['date'])
+            if len(qld_df) < 200:
+                return {"error": f"QLD 데이터가 부족합니다. 현재 {len(qld_df)}개 데이터만 있습니다. (최소 200일 필요)"}
             
             # 날짜 기준 병합 (inner join - 양쪽 모두 있는 날짜만)
             df = pd.merge(vig_df, qld_df, on="date", suffixes=("_vig", "_qld"), how="inner")
@@ -63,37 +41,31 @@ class BacktestService:
             if len(df) < 200:
                 return {"error": f"충분한 데이터가 없습니다. 현재 {len(df)}일치 데이터만 있습니다. (최소 200일 필요)"}
             
-            # Strategy A: VIG 단순 보유 (스칼라 값으로 변환)
-            first_close_vig = float(df.iloc[0]["close_vig"])
+            close_vig = df["close_vig"].to_numpy(dtype=float)
+            close_qld = df["close_qld"].to_numpy(dtype=float)
+            
+            # 지표는 시리즈 전체에 대해 한 번만 계산 (i번째 값 = 과거 200일 윈도우로 계산한 값)
+            vig_rsi_series = indicator_kernels.rsi(close_vig)
+            qld_rsi_series = indicator_kernels.rsi(close_qld)
+            vig_ma200_series = indicator_kernels.sma(close_vig, 200)
+            qld_ma200_series = indicator_kernels.sma(close_qld, 200)
+            
+            # Strategy A: VIG 단순 보유
+            first_close_vig = float(close_vig[0])
             strategy_a_shares = initial_investment / first_close_vig
-            strategy_a_values = (df["close_vig"] * strategy_a_shares).tolist()  # 리스트로 변환
+            strategy_a_values = (close_vig * strategy_a_shares).tolist()
             strategy_a_final = float(strategy_a_values[-1])
             strategy_a_return = ((strategy_a_final - initial_investment) / initial_investment) * 100
             
             # Strategy B: VIG↔QLD 스위칭
             current_etf = "VIG"
-            shares = initial_investment / df.iloc[0]["close_vig"]
+            shares = initial_investment / close_vig[0]
             strategy_b_values = []
             
             for i in range(200, len(df)):
-                # 현재 가격
-                if current_etf == "VIG":
-                    current_price = df.iloc[i]["close_vig"]
-                else:
-                    current_price = df.iloc[i]["close_qld"]
-                
-                # 지표 계산 (과거 200일 데이터 사용)
-                window_data = df.iloc[i-199:i+1]
-                vig_prices_window = window_data["close_vig"].tolist()
-                qld_prices_window = window_data["close_qld"].tolist()
-                
-                vig_rsi = IndicatorService.calculate_rsi(vig_prices_window)[-1]
-                qld_rsi = IndicatorService.calculate_rsi(qld_prices_window)[-1]
-                vig_ma200 = np.mean(vig_prices_window)
-                qld_ma200 = np.mean(qld_prices_window)
-                
-                vig_price = df.iloc[i]["close_vig"]
-                qld_price = df.iloc[i]["close_qld"]
+                vig_rsi, qld_rsi = vig_rsi_series[i], qld_rsi_series[i]
+                vig_ma200, qld_ma200 = vig_ma200_series[i], qld_ma200_series[i]
+                vig_price, qld_price = close_vig[i], close_qld[i]
                 
                 # 스위칭 로직 (간단화된 버전)
                 if current_etf == "VIG":
@@ -113,29 +85,20 @@ class BacktestService:
                 else:
                     value = shares * qld_price
                 
-                strategy_b_values.append(value)
+                strategy_b_values.append(float(value))
             
             strategy_b_final = strategy_b_values[-1]
             strategy_b_return = ((strategy_b_final - initial_investment) / initial_investment) * 100
             
             # Strategy C: AI 추천 비중 자동조절
-            vig_shares = (initial_investment * 0.5) / df.iloc[0]["close_vig"]
-            qld_shares = (initial_investment * 0.5) / df.iloc[0]["close_qld"]
+            vig_shares = (initial_investment * 0.5) / close_vig[0]
+            qld_shares = (initial_investment * 0.5) / close_qld[0]
             strategy_c_values = []
             
             for i in range(200, len(df)):
-                # AI 비중 계산 (간단화된 버전)
-                window_data = df.iloc[i-199:i+1]
-                vig_prices_window = window_data["close_vig"].tolist()
-                qld_prices_window = window_data["close_qld"].tolist()
-                
-                vig_rsi = IndicatorService.calculate_rsi(vig_prices_window)[-1]
-                qld_rsi = IndicatorService.calculate_rsi(qld_prices_window)[-1]
-                vig_ma200 = np.mean(vig_prices_window)
-                qld_ma200 = np.mean(qld_prices_window)
-                
-                vig_price = df.iloc[i]["close_vig"]
-                qld_price = df.iloc[i]["close_qld"]
+                vig_rsi, qld_rsi = vig_rsi_series[i], qld_rsi_series[i]
+                vig_ma200, qld_ma200 = vig_ma200_series[i], qld_ma200_series[i]
+                vig_price, qld_price = close_vig[i], close_qld[i]
                 
                 # AI 비중 계산 (규칙 기반)
                 vig_score = 50.0
@@ -180,7 +143,7 @@ class BacktestService:
                 
                 # 현재 포트폴리오 가치
                 value = vig_shares * vig_price + qld_shares * qld_price
-                strategy_c_values.append(value)
+                strategy_c_values.append(float(value))
             
             strategy_c_final = strategy_c_values[-1]
             strategy_c_return = ((strategy_c_final - initial_investment) / initial_investment) * 100
@@ -200,21 +163,10 @@ class BacktestService:
             strategy_b_cagr = ((strategy_b_final / initial_investment) ** (1/years) - 1) * 100
             strategy_c_cagr = ((strategy_c_final / initial_investment) ** (1/years) - 1) * 100
             
-            # 승률 계산 (간단화) - 안전한 접근 (리스트 기반)
-            strategy_a_wins = 0
-            for i in range(1, len(strategy_a_values)):
-                try:
-                    if float(strategy_a_values[i]) > float(strategy_a_values[i-1]):
-                        strategy_a_wins += 1
-                except:
-                    continue
-                    
-            strategy_b_wins = sum(1 for i in range(1, len(strategy_b_values)) 
-                                 if i < len(strategy_b_values) and 
-                                 float(strategy_b_values[i]) > float(strategy_b_values[i-1]))
-            strategy_c_wins = sum(1 for i in range(1, len(strategy_c_values)) 
-                                 if i < len(strategy_c_values) and 
-                                 float(strategy_c_values[i]) > float(strategy_c_values[i-1]))
+            # 승률 계산 (전일 대비 상승한 날의 비율)
+            strategy_a_wins = int(np.count_nonzero(np.diff(strategy_a_values) > 0))
+            strategy_b_wins = int(np.count_nonzero(np.diff(strategy_b_values) > 0))
+            strategy_c_wins = int(np.count_nonzero(np.diff(strategy_c_values) > 0))
             
             strategy_a_win_rate = (strategy_a_wins / (len(strategy_a_values) - 1)) * 100 if len(strategy_a_values) > 1 else 0
             strategy_b_win_rate = (strategy_b_wins / (len(strategy_b_values) - 1)) * 100 if len(strategy_b_values) > 1 else 0
@@ -314,7 +266,5 @@ class BacktestService:
     @staticmethod
     def calculate_mdd(values: pd.Series) -> float:
         """Maximum Drawdown 계산"""
-        peak = values.expanding().max()
-        drawdown = (values - peak) / peak * 100
-        return abs(drawdown.min())
+        return indicator_kernels.max_drawdown(values)
 
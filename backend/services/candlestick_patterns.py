@@ -0,0 +1,93 @@
+"""
+캔들 패턴 엔진 (몸통/꼬리/범위 배열을 한 번 계산하고, 패턴별 불리언 마스크를 우선순위대로 선택)
+"""
+from typing import List, Tuple
+import numpy as np
+
+# (패턴 이름, 신호) - 순서가 우선순위 (한 봉에 여러 패턴이 맞으면 앞의 패턴 하나만 사용)
+BASE_PATTERNS: Tuple[Tuple[str, str], ...] = (
+    ("Hammer", "bullish"),
+    ("Doji", "neutral"),
+    ("Bullish Engulfing", "bullish"),
+    ("Bearish Engulfing", "bearish"),
+    ("Morning Star", "bullish"),
+    ("Evening Star", "bearish"),
+)
+
+# 확장 패턴 (기본 패턴이 하나도 맞지 않는 봉에만 적용)
+EXTENDED_PATTERNS: Tuple[Tuple[str, str], ...] = (
+    ("Three White Soldiers", "bullish"),
+    ("Three Black Crows", "bearish"),
+    ("Bullish Harami", "bullish"),
+    ("Bearish Harami", "bearish"),
+    ("Shooting Star", "bearish"),
+    ("Bullish Marubozu", "bullish"),
+    ("Bearish Marubozu", "bearish"),
+)
+
+MIN_BARS = 3  # 직전 두 봉을 참조하므로 세 번째 봉부터 탐지
+
+
+def patterns(extended: bool = False) -> Tuple[Tuple[str, str], ...]:
+    """우선순위 순 패턴 목록"""
+    return BASE_PATTERNS + EXTENDED_PATTERNS if extended else BASE_PATTERNS
+
+
+def _shift(x: np.ndarray, n: int) -> np.ndarray:
+    """n봉 전 값 (앞부분은 NaN)"""
+    out = np.full(len(x), np.nan)
+    out[n:] = x[:len(x) - n]
+    return out
+
+
+def pattern_masks(open_, high, low, close, extended: bool = False) -> List[np.ndarray]:
+    """patterns(extended)와 같은 순서의 패턴별 불리언 마스크"""
+    o, h, l, c = (np.asarray(v, dtype=float) for v in (open_, high, low, close))
+    o1, h1, l1, c1 = _shift(o, 1), _shift(h, 1), _shift(l, 1), _shift(c, 1)
+    o2, c2 = _shift(o, 2), _shift(c, 2)
+
+    body = np.abs(c - o)
+    upper_shadow = h - np.maximum(o, c)
+    lower_shadow = np.minimum(o, c) - l
+    total_range = h - l
+    bullish, bearish = c > o, c < o
+    prev_bullish, prev_bearish = c1 > o1, c1 < o1
+
+    masks = [
+        # Hammer (망치형)
+        (lower_shadow > 2 * body) & (upper_shadow < 0.1 * body) & bullish,
+        # Doji (십자형)
+        body < 0.1 * total_range,
+        # Bullish / Bearish Engulfing
+        prev_bearish & bullish & (o < c1) & (c > o1),
+        prev_bullish & bearish & (o > c1) & (c < o1),
+        # Morning / Evening Star
+        (c2 < o2) & (c1 < c2) & (c > c2) & bullish,
+        (c2 > o2) & (c1 > c2) & (c < c2) & bearish,
+    ]
+    if extended:
+        prev2_bullish, prev2_bearish = c2 > o2, c2 < o2
+        masks += [
+            # Three White Soldiers / Black Crows (세 봉 연속, 시가는 직전 몸통 안)
+            prev2_bullish & prev_bullish & bullish & (c1 > c2) & (c > c1)
+            & (o1 > o2) & (o1 < c2) & (o > o1) & (o < c1),
+            prev2_bearish & prev_bearish & bearish & (c1 < c2) & (c < c1)
+            & (o1 < o2) & (o1 > c2) & (o < o1) & (o > c1),
+            # Bullish / Bearish Harami (몸통이 직전 반대 방향 몸통 안)
+            prev_bearish & bullish & (o > c1) & (c < o1),
+            prev_bullish & bearish & (o < c1) & (c > o1),
+            # Shooting Star (역망치형 하락)
+            (upper_shadow > 2 * body) & (lower_shadow < 0.1 * body) & bearish,
+            # Marubozu (꼬리가 거의 없는 장대 봉)
+            bullish & (body >= 0.95 * total_range),
+            bearish & (body >= 0.95 * total_range),
+        ]
+    return masks
+
+
+def classify(open_, high, low, close, extended: bool = False) -> np.ndarray:
+    """봉별 패턴 번호 (patterns(extended)의 인덱스, 해당 없음은 -1)"""
+    masks = pattern_masks(open_, high, low, close, extended)
+    codes = np.select(masks, np.arange(len(masks)), default=-1)
+    codes[:MIN_BARS - 1] = -1
+    return codes
@@ -0,0 +1,450 @@
+"""
+심볼별 피처 프레임 엔진 (지표 레지스트리, 의존 관계 해석, 지연 벡터 계산)
+"""
+import threading
+from typing import Callable, Dict, List, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from core.cache import cache, symbol_tag
+from core.singleflight import singleflight
+from services import jit_kernels
+
+# 지표 지정: "tr" 또는 ("rsi", 14)처럼 이름과 파라미터
+FeatureSpec = Union[str, Tuple]
+
+
+class Feature:
+    """등록된 지표 1개 (계산 함수와 의존 지표)"""
+
+    def __init__(self, name: str, compute: Callable[..., pd.Series],
+                 deps: Callable[..., List[FeatureSpec]]):
+        self.name = name
+        self.compute = compute  # compute(frame, *params) -> Series
+        self.deps = deps  # deps(*params) -> 먼저 계산할 지표 목록
+
+
+class FeatureFrame:
+    """히스토리 1개에 대해 계산된 지표 컬럼 모음 (스레드 안전)
+
+    컬럼은 처음 요청될 때 의존 지표부터 한 번만 계산되고, 이후에는 그대로 재사용됩니다.
+    반환되는 Series는 공유 객체이므로 값을 수정하면 안 됩니다.
+    """
+
+    BASE_COLUMNS = ("date", "open", "high", "low", "close", "volume")
+
+    def __init__(self, df: pd.DataFrame):
+        self._columns: Dict[str, pd.Series] = {
+            name: df[name] for name in self.BASE_COLUMNS if name in df.columns
+        }
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._columns["close"])
+
+    def __sizeof__(self) -> int:
+        # 캐시 용량 계산용 (기본 컬럼은 히스토리 캐시와 배열을 공유하므로 계산한 지표만 합산)
+        return object.__sizeof__(self) + sum(
+            int(s.memory_usage(index=False)) for name, s in self._columns.items()
+            if name not in self.BASE_COLUMNS
+        )
+
+    def __getstate__(self) -> Dict:
+        # 공유 캐시(디스크) 저장 시 lock은 제외
+        return {"_columns": self._columns}
+
+    def __setstate__(self, state: Dict) -> None:
+        self._columns = state["_columns"]
+        self._lock = threading.RLock()
+
+    def has(self, spec: FeatureSpec) -> bool:
+        return FeatureEngine.column_name(spec) in self._columns
+
+    def column(self, spec: FeatureSpec) -> pd.Series:
+        """지표 컬럼 (없으면 의존 지표부터 계산)"""
+        name = FeatureEngine.column_name(spec)
+        series = self._columns.get(name)
+        if series is not None:
+            return series
+
+        feature_name, params = FeatureEngine.split_spec(spec)
+        feature = FeatureEngine.REGISTRY.get(feature_name)
+        if feature is None:
+            raise KeyError(f"등록되지 않은 지표: {feature_name}")
+
+        with self._lock:
+            series = self._columns.get(name)
+            if series is None:
+                for dep in feature.deps(*params):
+                    self.column(dep)
+                series = feature.compute(self, *params)
+                self._columns[name] = series
+        return series
+
+    def to_frame(self) -> pd.DataFrame:
+        """지금까지 계산된 컬럼 전체를 DataFrame으로"""
+        with self._lock:
+            return pd.DataFrame(dict(self._columns))
+
+
+class FeatureEngine:
+    """지표 레지스트리와 심볼별 피처 프레임 캐시
+
+    같은 히스토리에 대한 지표는 하나의 FeatureFrame에 모아 캐시하므로
+    여러 지표를 요청해도 공통 중간값(EMA, True Range 등)은 한 번만 계산됩니다.
+    """
+
+    FRAME_TTL = 60 * 60  # 피처 프레임 캐시 시간 (히스토리가 바뀌면 symbol_tag로 무효화)
+    REGISTRY: Dict[str, Feature] = {}
+
+    @staticmethod
+    def register(name: str, deps: Optional[Callable[..., List[FeatureSpec]]] = None):
+        """지표 등록 데코레이터 (deps: 파라미터를 받아 먼저 계산할 지표 목록 반환)"""
+        def decorator(compute: Callable[..., pd.Series]):
+            FeatureEngine.REGISTRY[name] = Feature(name, compute, deps or (lambda *params: []))
+            return compute
+        return decorator
+
+    @staticmethod
+    def split_spec(spec: FeatureSpec) -> Tuple[str, Tuple]:
+        if isinstance(spec, str):
+            return spec, ()
+        return spec[0], tuple(spec[1:])
+
+    @staticmethod
+    def column_name(spec: FeatureSpec) -> str:
+        """("macd", 12, 26) -> "macd_12_26", ("pct_rank", ("rsi", 14), 252) -> "pct_rank_rsi_14_252" """
+        name, params = FeatureEngine.split_spec(spec)
+        return "_".join([name] + [
+            FeatureEngine.column_name(p) if isinstance(p, tuple) else str(p) for p in params
+        ])
+
+    @staticmethod
+    def _get_cache_key(symbol: str, df: pd.DataFrame) -> str:
+        """히스토리 구간(시작일, 마지막 날짜, 봉 개수)별 캐시 키"""
+        first = pd.Timestamp(df["date"].iloc[0]).strftime("%Y%m%d")
+        last = pd.Timestamp(df["date"].iloc[-1]).strftime("%Y%m%d")
+        return f"features:{symbol.upper()}:{first}:{last}:{len(df)}"
+
+    @staticmethod
+    def get_frame(symbol: str, df: pd.DataFrame) -> FeatureFrame:
+        """df에 대한 피처 프레임 (캐시에 없으면 생성)
+
+        동시에 들어온 캐시 미스는 프레임 1개를 공유하므로, 먼저 계산된 컬럼이
+        나중에 만든 프레임으로 덮어써져 사라지지 않습니다.
+        """
+        cache_key = FeatureEngine._get_cache_key(symbol, df)
+        frame = cache.get(cache_key)
+        if frame is None:
+            frame = singleflight.do(cache_key, lambda: FeatureEngine._create_frame(symbol, df, cache_key))
+        return frame
+
+    @staticmethod
+    def _create_frame(symbol: str, df: pd.DataFrame, cache_key: str) -> FeatureFrame:
+        """피처 프레임 생성 후 캐시 저장 (get_frame의 캐시 미스 처리)"""
+        # 직전에 다른 요청(또는 다른 워커)이 채웠을 수 있음
+        frame = cache.get(cache_key)
+        if frame is None:
+            frame = FeatureFrame(df)
+            cache.set(cache_key, frame, FeatureEngine.FRAME_TTL, tags=(symbol_tag(symbol),))
+        return frame
+
+    @staticmethod
+    def features(symbol: str, df: pd.DataFrame, *specs: FeatureSpec) -> List[pd.Series]:
+        """df의 지표 컬럼들 (캐시된 피처 프레임에서 읽고, 없는 컬럼만 계산)
+
+        Example:
+            rsi, = FeatureEngine.features("VIG", df, ("rsi", 14))
+        """
+        frame = FeatureEngine.get_frame(symbol, df)
+        missing = [spec for spec in specs if not frame.has(spec)]
+        columns = [frame.column(spec) for spec in specs]
+        if missing:
+            # 새 컬럼이 추가되었으므로 캐시 용량만 다시 계산 (TTL 유지, 공유 디스크에 다시 쓰지 않음)
+            cache.refresh_size(FeatureEngine._get_cache_key(symbol, df))
+        return columns
+
+
+# ===== 지표 레지스트리 =====
+
+@FeatureEngine.register("typical_price")
+def _typical_price(f: FeatureFrame) -> pd.Series:
+    return (f.column("high") + f.column("low") + f.column("close")) / 3
+
+
+@FeatureEngine.register("returns")
+def _returns(f: FeatureFrame) -> pd.Series:
+    return f.column("close").pct_change()
+
+
+@FeatureEngine.register("range_pct")
+def _range_pct(f: FeatureFrame) -> pd.Series:
+    """일일 변동폭 / 종가"""
+    return (f.column("high") - f.column("low")) / f.column("close")
+
+
+@FeatureEngine.register("sma")
+def _sma(f: FeatureFrame, window: int) -> pd.Series:
+    """종가 이동평균 (데이터가 부족한 초반 구간은 있는 만큼 평균)"""
+    return f.column("close").rolling(window=window, min_periods=1).mean()
+
+
+@FeatureEngine.register("ema")
+def _ema(f: FeatureFrame, span: int) -> pd.Series:
+    return f.column("close").ewm(span=span, adjust=False).mean()
+
+
+@FeatureEngine.register("rsi")
+def _rsi(f: FeatureFrame, period: int) -> pd.Series:
+    """RSI (period일 단순 평균 상승/하락폭, 하락이 없으면 50)"""
+    delta = f.column("close").diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=period, min_periods=1).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=period, min_periods=1).mean()
+    rs = gain / loss.replace(0, np.nan)
+    return (100 - (100 / (1 + rs))).fillna(50)
+
+
+@FeatureEngine.register("macd", deps=lambda fast, slow: [("ema", fast), ("ema", slow)])
+def _macd(f: FeatureFrame, fast: int, slow: int) -> pd.Series:
+    return f.column(("ema", fast)) - f.column(("ema", slow))
+
+
+@FeatureEngine.register("macd_signal", deps=lambda fast, slow, signal: [("macd", fast, slow)])
+def _macd_signal(f: FeatureFrame, fast: int, slow: int, signal: int) -> pd.Series:
+    return f.column(("macd", fast, slow)).ewm(span=signal, adjust=False).mean()
+
+
+@FeatureEngine.register("macd_hist", deps=lambda fast, slow, signal: [("macd", fast, slow),
+                                                                      ("macd_signal", fast, slow, signal)])
+def _macd_hist(f: FeatureFrame, fast: int, slow: int, signal: int) -> pd.Series:
+    return f.column(("macd", fast, slow)) - f.column(("macd_signal", fast, slow, signal))
+
+
+@FeatureEngine.register("stoch_k")
+def _stoch_k(f: FeatureFrame, k_period: int) -> pd.Series:
+    low_min = f.column("low").rolling(window=k_period, min_periods=1).min()
+    high_max = f.column("high").rolling(window=k_period, min_periods=1).max()
+    return 100 * ((f.column("close") - low_min) / (high_max - low_min))
+
+
+@FeatureEngine.register("stoch_d", deps=lambda k_period, d_period: [("stoch_k", k_period)])
+def _stoch_d(f: FeatureFrame, k_period: int, d_period: int) -> pd.Series:
+    return f.column(("stoch_k", k_period)).rolling(window=d_period, min_periods=1).mean()
+
+
+@FeatureEngine.register("tr")
+def _true_range(f: FeatureFrame) -> pd.Series:
+    high, low = f.column("high"), f.column("low")
+    prev_close = f.column("close").shift(1)
+    return pd.concat([
+        high - low,
+        (high - prev_close).abs(),
+        (low - prev_close).abs(),
+    ], axis=1).max(axis=1)
+
+
+@FeatureEngine.register("atr", deps=lambda period: ["tr"])
+def _atr(f: FeatureFrame, period: int) -> pd.Series:
+    """ATR (True Range의 period일 단순 평균, 초반 구간은 있는 만큼 평균)"""
+    return f.column("tr").rolling(window=period, min_periods=1).mean()
+
+
+@FeatureEngine.register("atr_pct", deps=lambda period: [("atr", period)])
+def _atr_pct(f: FeatureFrame, period: int) -> pd.Series:
+    """ATR / 종가 (%, 종가가 0 이하인 봉은 NaN)"""
+    close = f.column("close")
+    return f.column(("atr", period)) / close.where(close > 0) * 100
+
+
+@FeatureEngine.register("volatility", deps=lambda period: ["returns"])
+def _volatility(f: FeatureFrame, period: int) -> pd.Series:
+    """period일 수익률의 연율화 표준편차 (%, get_volatility와 같음)"""
+    return f.column("returns").rolling(window=period).std() * np.sqrt(252) * 100
+
+
+@FeatureEngine.register("pct_rank", deps=lambda source, window: [source])
+def _pct_rank(f: FeatureFrame, source: FeatureSpec, window: int) -> pd.Series:
+    """source 지표의 롤링 백분위 순위 (%, window가 0이면 시작부터 누적)"""
+    values = f.column(source)
+    return pd.Series(jit_kernels.rolling_percentile_rank(values, window), index=values.index)
+
+
+@FeatureEngine.register("dm_plus")
+def _dm_plus(f: FeatureFrame) -> pd.Series:
+    up = f.column("high") - f.column("high").shift(1)
+    down = f.column("low").shift(1) - f.column("low")
+    return pd.Series(np.where(up > down, np.maximum(up, 0), 0), index=up.index)
+
+
+@FeatureEngine.register("dm_minus")
+def _dm_minus(f: FeatureFrame) -> pd.Series:
+    up = f.column("high") - f.column("high").shift(1)
+    down = f.column("low").shift(1) - f.column("low")
+    return pd.Series(np.where(down > up, np.maximum(down, 0), 0), index=up.index)
+
+
+@FeatureEngine.register("di_plus", deps=lambda period: ["dm_plus", ("atr", period)])
+def _di_plus(f: FeatureFrame, period: int) -> pd.Series:
+    # DM 이동평균이 period개 미만인 구간은 NaN이므로 ATR 초반 구간은 결과에 영향 없음
+    return 100 * (f.column("dm_plus").rolling(window=period).mean() / f.column(("atr", period)))
+
+
+@FeatureEngine.register("di_minus", deps=lambda period: ["dm_minus", ("atr", period)])
+def _di_minus(f: FeatureFrame, period: int) -> pd.Series:
+    return 100 * (f.column("dm_minus").rolling(window=period).mean() / f.column(("atr", period)))
+
+
+@FeatureEngine.register("adx", deps=lambda period: [("di_plus", period), ("di_minus", period)])
+def _adx(f: FeatureFrame, period: int) -> pd.Series:
+    di_plus, di_minus = f.column(("di_plus", period)), f.column(("di_minus", period))
+    dx = 100 * abs(di_plus - di_minus) / (di_plus + di_minus)
+    return dx.rolling(window=period).mean()
+
+
+@FeatureEngine.register("rsi_wilder")
+def _rsi_wilder(f: FeatureFrame, period: int) -> pd.Series:
+    """Wilder RSI (경로 의존 평활이라 jit_kernels 커널 사용)"""
+    close = f.column("close")
+    return pd.Series(jit_kernels.wilder_rsi(close, period), index=close.index)
+
+
+@FeatureEngine.register("atr_wilder", deps=lambda period: ["tr"])
+def _atr_wilder(f: FeatureFrame, period: int) -> pd.Series:
+    """Wilder ATR (두 번째 봉부터의 True Range를 Wilder 평활)"""
+    tr = f.column("tr")
+    return pd.Series(jit_kernels.wilder_smooth(tr, period, start=1), index=tr.index)
+
+
+@FeatureEngine.register("di_plus_wilder", deps=lambda period: ["dm_plus", ("atr_wilder", period)])
+def _di_plus_wilder(f: FeatureFrame, period: int) -> pd.Series:
+    dm = f.column("dm_plus")
+    smoothed = pd.Series(jit_kernels.wilder_smooth(dm, period, start=1), index=dm.index)
+    return 100 * (smoothed / f.column(("atr_wilder", period)))
+
+
+@FeatureEngine.register("di_minus_wilder", deps=lambda period: ["dm_minus", ("atr_wilder", period)])
+def _di_minus_wilder(f: FeatureFrame, period: int) -> pd.Series:
+    dm = f.column("dm_minus")
+    smoothed = pd.Series(jit_kernels.wilder_smooth(dm, period, start=1), index=dm.index)
+    return 100 * (smoothed / f.column(("atr_wilder", period)))
+
+
+@FeatureEngine.register("adx_wilder", deps=lambda period: [("di_plus_wilder", period), ("di_minus_wilder", period)])
+def _adx_wilder(f: FeatureFrame, period: int) -> pd.Series:
+    """Wilder ADX (DI는 period번째 봉부터 값이 있으므로 DX도 그 위치부터 Wilder 평활)"""
+    di_plus, di_minus = f.column(("di_plus_wilder", period)), f.column(("di_minus_wilder", period))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dx = np.array(100 * (di_plus - di_minus).abs() / (di_plus + di_minus), dtype=float)
+    # DI 합이 0인 봉(변동 없음)은 DX 0으로 처리해 평활이 끊기지 않도록 함
+    dx[period:] = np.nan_to_num(dx[period:], nan=0.0, posinf=0.0, neginf=0.0)
+    return pd.Series(jit_kernels.wilder_smooth(dx, period, start=period), index=di_plus.index)
+
+
+@FeatureEngine.register("psar")
+def _psar(f: FeatureFrame, step: float, max_step: float) -> pd.Series:
+    high = f.column("high")
+    sar, _ = jit_kernels.parabolic_sar(high, f.column("low"), step, max_step)
+    return pd.Series(sar, index=high.index)
+
+
+@FeatureEngine.register("psar_trend")
+def _psar_trend(f: FeatureFrame, step: float, max_step: float) -> pd.Series:
+    """Parabolic SAR 추세 (상승 1 / 하락 -1, 첫 봉 0)"""
+    high = f.column("high")
+    _, trend = jit_kernels.parabolic_sar(high, f.column("low"), step, max_step)
+    return pd.Series(trend, index=high.index)
+
+
+@FeatureEngine.register("supertrend")
+def _supertrend(f: FeatureFrame, period: int, multiplier: float) -> pd.Series:
+    close = f.column("close")
+    line, _ = jit_kernels.supertrend(f.column("high"), f.column("low"), close, period, multiplier)
+    return pd.Series(line, index=close.index)
+
+
+@FeatureEngine.register("supertrend_direction")
+def _supertrend_direction(f: FeatureFrame, period: int, multiplier: float) -> pd.Series:
+    """SuperTrend 방향 (상승 1 / 하락 -1, ATR 계산 전 0)"""
+    close = f.column("close")
+    _, direction = jit_kernels.supertrend(f.column("high"), f.column("low"), close, period, multiplier)
+    return pd.Series(direction, index=close.index)
+
+
+@FeatureEngine.register("cci", deps=lambda period: ["typical_price"])
+def _cci(f: FeatureFrame, period: int) -> pd.Series:
+    """CCI (평균 편차는 슬라이딩 윈도우 배열로 한 번에 계산)"""
+    tp = f.column("typical_price")
+    sma_tp = tp.rolling(window=period).mean()
+    md = np.full(len(tp), np.nan)
+    if len(tp) >= period:
+        windows = sliding_window_view(tp.to_numpy(dtype=float), period)
+        md[period - 1:] = np.abs(windows - windows.mean(axis=1, keepdims=True)).mean(axis=1)
+    return (tp - sma_tp) / (0.015 * pd.Series(md, index=tp.index))
+
+
+@FeatureEngine.register("bb_middle")
+def _bb_middle(f: FeatureFrame, period: int) -> pd.Series:
+    return f.column("close").rolling(window=period).mean()
+
+
+@FeatureEngine.register("bb_std")
+def _bb_std(f: FeatureFrame, period: int) -> pd.Series:
+    return f.column("close").rolling(window=period).std()
+
+
+@FeatureEngine.register("bb_upper", deps=lambda period, std_dev: [("bb_middle", period), ("bb_std", period)])
+def _bb_upper(f: FeatureFrame, period: int, std_dev: float) -> pd.Series:
+    return f.column(("bb_middle", period)) + (f.column(("bb_std", period)) * std_dev)
+
+
+@FeatureEngine.register("bb_lower", deps=lambda period, std_dev: [("bb_middle", period), ("bb_std", period)])
+def _bb_lower(f: FeatureFrame, period: int, std_dev: float) -> pd.Series:
+    return f.column(("bb_middle", period)) - (f.column(("bb_std", period)) * std_dev)
+
+
+@FeatureEngine.register("bb_width", deps=lambda period, std_dev: [("bb_upper", period, std_dev),
+                                                                  ("bb_lower", period, std_dev)])
+def _bb_width(f: FeatureFrame, period: int, std_dev: float) -> pd.Series:
+    upper, lower = f.column(("bb_upper", period, std_dev)), f.column(("bb_lower", period, std_dev))
+    return (upper - lower) / f.column(("bb_middle", period)) * 100
+
+
+@FeatureEngine.register("obv")
+def _obv(f: FeatureFrame) -> pd.Series:
+    """OBV = sign(종가 변화) * 거래량의 누적합 (첫 봉은 0, 거래량 NaN은 0)"""
+    direction = np.sign(f.column("close").diff()).fillna(0)
+    return (direction * f.column("volume").fillna(0)).cumsum()
+
+
+@FeatureEngine.register("clv")
+def _clv(f: FeatureFrame) -> pd.Series:
+    """Close Location Value = ((C - L) - (H - C)) / (H - L), 고가 = 저가인 봉은 0"""
+    high, low, close = f.column("high"), f.column("low"), f.column("close")
+    spread = (high - low).replace(0, np.nan)
+    return (((close - low) - (high - close)) / spread).fillna(0)
+
+
+@FeatureEngine.register("money_flow_volume", deps=lambda: ["clv"])
+def _money_flow_volume(f: FeatureFrame) -> pd.Series:
+    return f.column("clv") * f.column("volume").fillna(0)
+
+
+@FeatureEngine.register("ad", deps=lambda: ["money_flow_volume"])
+def _accumulation_distribution(f: FeatureFrame) -> pd.Series:
+    """A/D Line (Money Flow Volume의 누적합)"""
+    return f.column("money_flow_volume").cumsum()
+
+
+@FeatureEngine.register("cmf", deps=lambda period: ["money_flow_volume"])
+def _chaikin_money_flow(f: FeatureFrame, period: int) -> pd.Series:
+    """CMF = period일 Money Flow Volume 합 / period일 거래량 합"""
+    volume = f.column("volume").fillna(0)
+    return (f.column("money_flow_volume").rolling(window=period).sum() /
+            volume.rolling(window=period).sum().replace(0, np.nan))
+
+
+@FeatureEngine.register("vwap", deps=lambda: ["typical_price"])
+def _vwap(f: FeatureFrame) -> pd.Series:
+    """누적 VWAP = (TP * Volume)의 누적합 / Volume의 누적합"""
+    volume = f.column("volume").fillna(0)
+    return (f.column("typical_price") * volume).cumsum() / volume.cumsum()
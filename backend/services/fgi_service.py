@@ -1,12 +1,12 @@
 """
 Fear & Greed Index 서비스 (CNN FGI Scraper / Mirror API)
 """
-import requests
 import json
 from typing import Optional, Dict
 from datetime import datetime
 import traceback
 from core.cache import cache
+from core.http_client import http_client
 
 
 class FGIService:
@@ -25,6 +25,7 @@ class FGIService:
     ]
     
     CACHE_TTL = 15 * 60  # 15분 캐시
+    STALE_GRACE = 30 * 60  # 만료 후 이전 값을 제공하며 백그라운드 갱신하는 시간
     
     @staticmethod
     def _fetch_from_mirror(url: str) -> Optional[Dict]:
@@ -33,7 +34,7 @@ class FGIService:
             headers = {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
             }
-            response = requests.get(url, headers=headers, timeout=10)
+            response = http_client.get(url, headers=headers)
             if response.status_code == 200:
                 data = response.json()
                 return data
@@ -49,7 +50,7 @@ class FGIService:
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
                 "Accept": "application/json"
             }
-            response = requests.get(url, headers=headers, timeout=10)
+            response = http_client.get(url, headers=headers)
             if response.status_code == 200:
                 data = response.json()
                 return data
@@ -121,7 +122,7 @@ class FGIService:
             }
         """
         cache_key = "fgi:current"
-        cached = cache.get(cache_key)
+        cached = cache.get(cache_key, refresher=FGIService.fetch_fgi)
         if cached is not None:
             return cached
         
@@ -196,3 +197,7 @@ class FGIService:
                 "timestamp": datetime.now().isoformat(),
                 "error": "Fear & Greed Index를 가져올 수 없습니다."
             }
+
+
+# FGI 캐시는 만료 후에도 grace 시간 동안 이전 값을 제공 (stale-while-revalidate)
+cache.set_stale_policy("fgi", FGIService.STALE_GRACE)
@@ -1,10 +1,9 @@
 """
 펀더멘털 데이터 서비스 (yfinance 기반)
 """
-import yfinance as yf
 from typing import Dict, Optional
 from services.yahoo_service import YahooService
-from core.cache import cache
+from core.cache import cache, is_symbol_missing, mark_symbol_missing
 
 
 class FundamentalService:
@@ -35,10 +34,18 @@ class FundamentalService:
         if cached is not None:
             return cached
         
+        if is_symbol_missing(symbol):
+            return FundamentalService._empty_result(symbol, "데이터 없음")
+        
         try:
-            ticker = yf.Ticker(symbol)
+            ticker = YahooService._create_ticker(symbol)
             info = ticker.info
             
+            # 잘못된 심볼은 빈 dict 또는 키 1개짜리 dict가 반환됨
+            if not info or len(info) <= 1:
+                mark_symbol_missing(symbol)
+                return FundamentalService._empty_result(symbol, "데이터 없음")
+            
             per = info.get("trailingPE") or info.get("forwardPE")
             psr = info.get("priceToSalesTrailing12Months")
             pbr = info.get("priceToBook")
@@ -118,17 +125,22 @@ class FundamentalService:
             
         except Exception as e:
             print(f"[ERROR] {symbol} 펀더멘털 데이터 가져오기 실패: {e}")
-            return {
-                "symbol": symbol,
-                "per": None,
-                "psr": None,
-                "pbr": None,
-                "peg": None,
-                "revenue_growth": None,
-                "eps_growth": None,
-                "value_score": 50.0,
-                "value_grade": "정상",
-                "factors": [],
-                "error": str(e)
-            }
+            return FundamentalService._empty_result(symbol, str(e))
+    
+    @staticmethod
+    def _empty_result(symbol: str, error: str) -> Dict:
+        """데이터를 가져오지 못했을 때의 기본 결과"""
+        return {
+            "symbol": symbol,
+            "per": None,
+            "psr": None,
+            "pbr": None,
+            "peg": None,
+            "revenue_growth": None,
+            "eps_growth": None,
+            "value_score": 50.0,
+            "value_grade": "정상",
+            "factors": [],
+            "error": error
+        }
 
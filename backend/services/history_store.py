@@ -0,0 +1,181 @@
+"""
+OHLCV 로컬 저장소 (ETFPrice 테이블 기반, 재시작 후에도 유지)
+"""
+import numpy as np
+import pandas as pd
+import threading
+from typing import Optional
+from datetime import datetime, timedelta
+from core.database import SessionLocal, engine, ETFPrice
+
+
+class HistoryStore:
+    """심볼별 일봉 OHLCV 저장소
+
+    YahooService.get_history가 먼저 이 저장소를 읽고,
+    마지막 저장일 이후의 봉만 yfinance에서 가져와 덧붙입니다.
+    """
+
+    # 당일 봉(장중)은 이 시간이 지나면 다시 갱신
+    INTRADAY_REFRESH = 30 * 60
+    # 요청 시작일보다 저장 데이터가 이 일수 이내로 늦게 시작하면 전체 기간을 보유한 것으로 간주
+    COVERAGE_TOLERANCE_DAYS = 7
+
+    _table_ready = False
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _ensure_table():
+        """etf_prices 테이블 생성 (init_db 이전 호출 대비)"""
+        if HistoryStore._table_ready:
+            return
+        with HistoryStore._lock:
+            if not HistoryStore._table_ready:
+                ETFPrice.__table__.create(bind=engine, checkfirst=True)
+                HistoryStore._table_ready = True
+
+    @staticmethod
+    def _normalize_dates(dates: pd.Series) -> pd.Series:
+        """날짜를 tz 없는 자정 기준 datetime으로 통일"""
+        dates = pd.to_datetime(dates)
+        if getattr(dates.dt, "tz", None) is not None:
+            dates = dates.dt.tz_localize(None)
+        return dates.dt.normalize()
+
+    @staticmethod
+    def load(symbol: str) -> Optional[pd.DataFrame]:
+        """저장된 히스토리 로드
+
+        Returns:
+            DataFrame (date, open, high, low, close, volume, adjusted_close, updated_at) 또는 None
+        """
+        symbol = symbol.upper()
+        try:
+            HistoryStore._ensure_table()
+            db = SessionLocal()
+            try:
+                rows = db.query(
+                    ETFPrice.date, ETFPrice.open, ETFPrice.high, ETFPrice.low,
+                    ETFPrice.close, ETFPrice.volume, ETFPrice.created_at
+                ).filter(ETFPrice.symbol == symbol).order_by(ETFPrice.date.asc()).all()
+            finally:
+                db.close()
+        except Exception as e:
+            print(f"[WARNING] {symbol} 로컬 히스토리 로드 실패: {e}")
+            return None
+
+        if not rows:
+            return None
+
+        df = pd.DataFrame(rows, columns=["date", "open", "high", "low", "close", "volume", "updated_at"])
+        df["date"] = pd.to_datetime(df["date"])
+        df["volume"] = df["volume"].fillna(0).astype(int)
+        df["adjusted_close"] = df["close"]
+        return df
+
+    @staticmethod
+    def save(symbol: str, df: pd.DataFrame, replace: bool = False) -> None:
+        """히스토리 저장 (df의 날짜 구간에 있는 기존 봉은 새 값으로 교체)
+
+        replace=True이면 심볼의 기존 봉 전체를 지우고 df로 교체합니다 (배당/분할로 수정주가가 바뀐 경우).
+        """
+        symbol = symbol.upper()
+        if df is None or df.empty:
+            return
+
+        dates = HistoryStore._normalize_dates(df["date"])
+        now = datetime.utcnow()
+        records = [
+            {
+                "symbol": symbol,
+                "date": date.to_pydatetime(),
+                "open": float(o),
+                "high": float(h),
+                "low": float(l),
+                "close": float(c),
+                "volume": int(v) if pd.notna(v) else 0,
+                "created_at": now,
+            }
+            for date, o, h, l, c, v in zip(
+                dates, df["open"], df["high"], df["low"], df["close"], df["volume"]
+            )
+        ]
+
+        try:
+            HistoryStore._ensure_table()
+            db = SessionLocal()
+            try:
+                query = db.query(ETFPrice).filter(ETFPrice.symbol == symbol)
+                if not replace:
+                    query = query.filter(
+                        ETFPrice.date >= dates.min().to_pydatetime(),
+                        ETFPrice.date <= dates.max().to_pydatetime()
+                    )
+                query.delete(synchronize_session=False)
+                db.bulk_insert_mappings(ETFPrice, records)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+        except Exception as e:
+            print(f"[WARNING] {symbol} 로컬 히스토리 저장 실패: {e}")
+
+    @staticmethod
+    def window_start(years: int) -> pd.Timestamp:
+        """최근 years년 구간의 시작일"""
+        return pd.Timestamp.now().normalize() - timedelta(days=365 * years)
+
+    @staticmethod
+    def covers(stored: pd.DataFrame, years: int) -> bool:
+        """저장 데이터가 요청 기간의 시작일까지 포함하는지 확인"""
+        start = HistoryStore.window_start(years)
+        return stored["date"].iloc[0] <= start + timedelta(days=HistoryStore.COVERAGE_TOLERANCE_DAYS)
+
+    @staticmethod
+    def coverage_years(stored: pd.DataFrame) -> int:
+        """저장 데이터가 포함하는 최대 기간 (년, 내림)"""
+        first = stored["date"].iloc[0] - timedelta(days=HistoryStore.COVERAGE_TOLERANCE_DAYS)
+        return max(0, (pd.Timestamp.now().normalize() - first).days // 365)
+
+    @staticmethod
+    def needs_update(stored: pd.DataFrame) -> bool:
+        """마지막 저장 봉 이후 새 봉이 있을 수 있는지 확인 (네트워크 호출 여부 판단)"""
+        today = pd.Timestamp.now().normalize()
+        last_business_day = pd.offsets.BDay().rollback(today)
+        last_date = stored["date"].iloc[-1].normalize()
+
+        if last_date < last_business_day:
+            return True
+
+        # 당일 봉은 장중에 값이 바뀌므로 일정 시간이 지나면 다시 가져옴
+        updated_at = stored["updated_at"].iloc[-1]
+        if last_date >= today and pd.notna(updated_at):
+            age = (datetime.utcnow() - pd.Timestamp(updated_at).to_pydatetime()).total_seconds()
+            return age > HistoryStore.INTRADAY_REFRESH
+        return False
+
+    @staticmethod
+    def freeze(df: pd.DataFrame) -> pd.DataFrame:
+        """컬럼마다 읽기 전용 NumPy 배열을 가진 DataFrame 생성 (캐시에서 복사 없이 공유)
+
+        공유 배열을 제자리에서 수정하려 하면 ValueError가 발생하므로,
+        파생 지표는 별도 Series/배열로 계산하거나 새 컬럼으로 추가해야 합니다.
+        """
+        columns = {}
+        for name in df.columns:
+            values = np.array(df[name].to_numpy(), copy=True)
+            values.flags.writeable = False
+            columns[name] = values
+        return pd.DataFrame(columns, copy=False)
+
+    @staticmethod
+    def slice_years(stored: pd.DataFrame, years: int) -> pd.DataFrame:
+        """최근 years년 구간만 잘라서 반환 (date 정렬 기준 이분 탐색, 데이터 복사 없음)"""
+        pos = stored["date"].searchsorted(HistoryStore.window_start(years))
+        df = stored.iloc[pos:]
+        if "updated_at" in df.columns:
+            df = df.drop(columns=["updated_at"])
+        df.index = pd.RangeIndex(len(df))
+        return df
@@ -0,0 +1,161 @@
+"""
+배열 단위 지표 커널 (NumPy 배열을 받아 전체 롤링 시리즈를 한 번에 계산)
+
+모든 함수는 입력과 같은 길이의 float 배열을 반환하며, 값을 계산할 수 없는 앞부분은 NaN입니다.
+입력에는 NaN이 없다고 가정합니다 (히스토리의 종가/평가액 시리즈).
+"""
+from typing import Optional, Sequence, Union
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from services import jit_kernels
+
+ArrayLike = Union[Sequence[float], np.ndarray, pd.Series]
+
+TRADING_DAYS = 252  # 연율화 기준 거래일 수
+
+
+def as_array(values: ArrayLike) -> np.ndarray:
+    """float64 1차원 배열로 변환 (복사 없이 가능하면 그대로)"""
+    return np.asarray(values, dtype=float).reshape(-1)
+
+
+def _windowed(x: np.ndarray, window: int, reducer, min_periods: Optional[int] = None,
+              expanding=None) -> np.ndarray:
+    """길이 window 슬라이딩 윈도우에 reducer(axis=1) 적용
+
+    min_periods < window이면 앞의 window-1개는 expanding(누적 계산)으로 채웁니다.
+    """
+    n = len(x)
+    out = np.full(n, np.nan)
+    if n == 0 or window <= 0:
+        return out
+    if n >= window:
+        out[window - 1:] = reducer(sliding_window_view(x, window), axis=1)
+    if min_periods is not None and min_periods < window and expanding is not None:
+        head = min(window - 1, n)
+        out[:head] = expanding(x[:head])
+        out[:max(min_periods, 1) - 1] = np.nan
+    return out
+
+
+def sma(values: ArrayLike, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """단순 이동평균 (min_periods 미지정 시 window개가 모여야 값 계산)"""
+    return _windowed(as_array(values), window, np.mean, min_periods,
+                     expanding=lambda head: np.cumsum(head) / np.arange(1, len(head) + 1))
+
+
+def ema(values: ArrayLike, span: int) -> np.ndarray:
+    """지수 이동평균 (ewm(span, adjust=False), 첫 값에서 시작)"""
+    x = as_array(values)
+    if len(x) == 0:
+        return x.copy()
+    return pd.Series(x).ewm(span=span, adjust=False).mean().to_numpy()
+
+
+def rolling_std(values: ArrayLike, window: int, ddof: int = 1) -> np.ndarray:
+    """롤링 표준편차 (기본 표본 표준편차)"""
+    x = as_array(values)
+    return _windowed(x, window, lambda w, axis: np.std(w, axis=axis, ddof=ddof))
+
+
+def rolling_max(values: ArrayLike, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    return _windowed(as_array(values), window, np.max, min_periods, expanding=np.maximum.accumulate)
+
+
+def rolling_min(values: ArrayLike, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    return _windowed(as_array(values), window, np.min, min_periods, expanding=np.minimum.accumulate)
+
+
+def returns(values: ArrayLike) -> np.ndarray:
+    """단순 수익률 (첫 값은 NaN)"""
+    x = as_array(values)
+    out = np.full(len(x), np.nan)
+    if len(x) > 1:
+        out[1:] = x[1:] / x[:-1] - 1
+    return out
+
+
+def rolling_volatility(values: ArrayLike, window: int = 30, periods_per_year: int = TRADING_DAYS) -> np.ndarray:
+    """롤링 연율화 변동성 (%): 수익률 window개의 표본 표준편차 * sqrt(periods_per_year) * 100
+
+    i번째 값은 values[i-window..i] 구간의 수익률 window개로 계산합니다.
+    """
+    r = returns(values)
+    out = np.full(len(r), np.nan)
+    if len(r) > 1:
+        out[1:] = rolling_std(r[1:], window)
+    return out * np.sqrt(periods_per_year) * 100
+
+
+def rsi(values: ArrayLike, period: int = 14, method: str = "simple") -> np.ndarray:
+    """RSI
+
+    Args:
+        values: 종가 시리즈
+        period: 기간
+        method: "simple" - 최근 period개 변화량의 단순 평균 (IndicatorService.get_rsi와 같은 정의,
+                초반 구간은 있는 만큼 평균, 하락이 없으면 50)
+                "wilder" - 첫 period개 평균으로 시작하는 Wilder 평활 (period번째 변화량 이전은 NaN)
+    """
+    x = as_array(values)
+    n = len(x)
+    if n == 0:
+        return x.copy()
+    delta = np.zeros(n)
+    delta[1:] = np.diff(x)
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+
+    if method == "simple":
+        avg_gain = sma(gain, period, min_periods=1)
+        avg_loss = sma(loss, period, min_periods=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out = 100 - 100 / (1 + avg_gain / avg_loss)
+        return np.where(avg_loss == 0, 50.0, out)
+
+    if method == "wilder":
+        return jit_kernels.wilder_rsi(x, period)
+
+    raise ValueError(f"지원하지 않는 RSI 방식: {method}")
+
+
+def drawdown(values: ArrayLike) -> np.ndarray:
+    """고점 대비 하락률 (%, 0 이하)"""
+    x = as_array(values)
+    if len(x) == 0:
+        return x.copy()
+    peak = np.maximum.accumulate(x)
+    return (x - peak) / peak * 100
+
+
+def max_drawdown(values: ArrayLike) -> float:
+    """최대 낙폭 (%, 양수)"""
+    dd = drawdown(values)
+    return float(abs(np.nanmin(dd))) if len(dd) else 0.0
+
+
+def _pivots(values: ArrayLike, left: int, right: int, highs: bool) -> np.ndarray:
+    x = as_array(values)
+    mask = np.zeros(len(x), dtype=bool)
+    span = left + right + 1
+    if left < 1 or right < 1 or len(x) < span:
+        return mask
+    windows = sliding_window_view(x if highs else -x, span)
+    center = windows[:, left]
+    # 왼쪽보다 엄격히 크고 오른쪽 이상 (같은 값이 이어지면 첫 봉만 피벗)
+    mask[left:len(x) - right] = (center > windows[:, :left].max(axis=1)) & (center >= windows[:, left + 1:].max(axis=1))
+    return mask
+
+
+def pivot_highs(values: ArrayLike, left: int = 5, right: int = 5) -> np.ndarray:
+    """스윙 고점 위치 (앞 left개, 뒤 right개 봉보다 높은 봉, bool 배열)
+
+    뒤 right개 봉이 있어야 확정되므로 마지막 right개 봉은 항상 False입니다.
+    """
+    return _pivots(values, left, right, highs=True)
+
+
+def pivot_lows(values: ArrayLike, left: int = 5, right: int = 5) -> np.ndarray:
+    """스윙 저점 위치 (앞 left개, 뒤 right개 봉보다 낮은 봉, bool 배열)"""
+    return _pivots(values, left, right, highs=False)
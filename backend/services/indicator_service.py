@@ -1,12 +1,49 @@
 """
 기술적 지표 계산 서비스 (yfinance 데이터 기반, fallback 로직 포함)
 """
+import functools
+import threading
 import pandas as pd
 import numpy as np
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 from services.yahoo_service import YahooService
-from core.cache import cache
+from services.feature_engine import FeatureEngine
+from services import indicator_kernels
+from core.cache import cache, is_symbol_missing, symbol_tag
+from core.serializer import Serializer, Payload, RECORDS
+from core.config import settings
+from core.retry import Deadline
+from core.singleflight import singleflight
+
+# 스레드별로 실행 중인 지표 getter의 캐시 키 hold (getter 1개당 {캐시 키: hold})
+_fill_state = threading.local()
+
+
+def _fill_scopes() -> List[Dict]:
+    scopes = getattr(_fill_state, "scopes", None)
+    if scopes is None:
+        scopes = _fill_state.scopes = []
+    return scopes
+
+
+def coalesce_fills(getter):
+    """지표 getter의 결과 캐시 채우기를 캐시 키별로 한 번만 수행 (동시 캐시 미스 병합)
+
+    getter 안의 _get_cached가 미스를 내면 그 캐시 키를 잡고(singleflight.hold) 캐시를 다시 확인하며,
+    _set_cached에서 (저장하지 못한 경우 getter가 끝날 때) 놓습니다.
+    같은 키를 기다리던 호출은 먼저 들어온 호출이 채운 캐시를 읽습니다.
+    """
+    @functools.wraps(getter)
+    def wrapper(*args, **kwargs):
+        scopes = _fill_scopes()
+        scopes.append({})
+        try:
+            return getter(*args, **kwargs)
+        finally:
+            for hold in scopes.pop().values():
+                hold.__exit__(None, None, None)
+    return wrapper
 
 
 class IndicatorService:
@@ -14,6 +51,14 @@ class IndicatorService:
     
     # Fallback 기간 목록
     FALLBACK_YEARS = [3, 2, 1]
+    STALE_GRACE = 30 * 60  # 만료 후 이전 값을 제공하며 백그라운드 갱신하는 시간
+    # stale-while-revalidate를 적용할 지표 캐시 prefix
+    STALE_PREFIXES = ("ma", "rsi", "macd", "stochastic", "volatility", "mdd",
+                      "cross", "divergence", "patterns", "atr", "risk_score")
+    # 지표 캐시 TTL: 히스토리 캐시가 사라지는 시점(30분 + 유예 30분)까지 유지하고,
+    # 그 전에 히스토리가 바뀌면 symbol_tag 태그로 함께 무효화
+    # (shared 모드에서는 디스크 항목이 삭제되므로 다른 워커도 다음 조회에서 메모리 항목을 버림)
+    CACHE_TTL = 60 * 60
     
     @staticmethod
     def _get_cache_key(prefix: str, symbol: str, *args) -> str:
@@ -24,16 +69,52 @@ class IndicatorService:
             key_parts.extend(str(arg) for arg in args)
         return ":".join(key_parts)
     
+    @staticmethod
+    def _get_cached(symbol: str, cache_key: str, refresher=None):
+        """지표 캐시 조회 (원본 히스토리가 만료됐으면 백그라운드 갱신을 예약해 변경 시 무효화되도록 함)"""
+        YahooService.revalidate_history(symbol)
+        value = cache.get(cache_key, refresher=refresher)
+        scopes = _fill_scopes()
+        if value is None and scopes and cache_key not in scopes[-1]:
+            # 같은 키를 계산 중인 호출이 있으면 끝날 때까지 기다린 뒤 다시 확인 (coalesce_fills getter 안에서만)
+            hold = singleflight.hold(cache_key)
+            hold.__enter__()
+            scopes[-1][cache_key] = hold
+            value = cache.get(cache_key)
+        return value
+    
+    @staticmethod
+    def _set_cached(symbol: str, cache_key: str, value) -> None:
+        """지표 캐시 저장 (심볼 태그를 붙여 히스토리가 바뀌면 함께 무효화)"""
+        cache.set(cache_key, value, IndicatorService.CACHE_TTL, tags=(symbol_tag(symbol),))
+        scopes = _fill_scopes()
+        hold = scopes[-1].pop(cache_key, None) if scopes else None
+        if hold is not None:
+            # 기다리던 호출이 바로 캐시를 읽도록 getter 종료 전에 놓음
+            hold.__exit__(None, None, None)
+    
     @staticmethod
     def _get_history_with_fallback(symbol: str, preferred_years: int = 3) -> Optional[pd.DataFrame]:
         """히스토리 데이터 가져오기 (fallback 기간 포함)"""
         symbol = symbol.upper()
         
-        # 선호하는 기간부터 시도
+        # 최근 데이터 없음으로 확인된 심볼은 즉시 반환
+        if is_symbol_missing(symbol):
+            print(f"[WARNING] {symbol} 데이터 없음 (네거티브 캐시)")
+            return None
+        
+        # 선호하는 기간부터 시도 (모든 기간이 하나의 시간 예산을 공유)
         years_to_try = [preferred_years] + [y for y in IndicatorService.FALLBACK_YEARS if y != preferred_years]
+        deadline = Deadline(settings.retry_time_budget)
         
         for years in years_to_try:
-            df = YahooService.get_history(symbol, years)
+            if deadline.expired():
+                print(f"[WARNING] {symbol} 시간 예산 소진, 남은 fallback 기간 생략")
+                break
+            df = YahooService.get_history(symbol, years, deadline=deadline)
+            if df is None and is_symbol_missing(symbol):
+                # 심볼 자체에 데이터가 없으면 다른 기간도 결과가 같음
+                break
             if df is not None and not df.empty:
                 # date 컬럼 확인
                 if "date" in df.columns and len(df) > 0:
@@ -50,13 +131,29 @@ class IndicatorService:
         return None
     
     @staticmethod
-    def get_moving_average(symbol: str, days: int = 200, period_years: int = 3) -> List[Dict]:
-        """이동평균선 계산 (fallback 지원)"""
+    def calculate_rsi(prices: List[float], period: int = 14) -> List[float]:
+        """가격 리스트의 RSI 시리즈 (get_rsi와 같은 정의, 입력과 같은 길이)"""
+        if not prices:
+            return []
+        return indicator_kernels.rsi(prices, period).tolist()
+    
+    @staticmethod
+    def calculate_volatility(values: List[float], period: int = 30) -> float:
+        """값 리스트의 최근 period일 연율화 변동성 (%, get_volatility와 같은 정의, 계산 불가 시 0.0)"""
+        if len(values) <= period:
+            return 0.0
+        volatility = indicator_kernels.rolling_volatility(values, period)[-1]
+        return float(volatility) if not np.isnan(volatility) else 0.0
+    
+    @staticmethod
+    @coalesce_fills
+    def get_moving_average(symbol: str, days: int = 200, period_years: int = 3, fmt: str = RECORDS) -> Payload:
+        """이동평균선 계산 (fallback 지원, fmt: records | columnar)"""
         symbol = symbol.upper()
         cache_key = IndicatorService._get_cache_key("ma", symbol, days, period_years)
-        cached = cache.get(cache_key)
+        cached = IndicatorService._get_cached(symbol, cache_key, refresher=lambda: IndicatorService.get_moving_average(symbol, days, period_years))
         if cached is not None:
-            return cached
+            return Serializer.render(cached, fmt)
         
         try:
             # 히스토리 데이터 가져오기 (fallback 포함)
@@ -68,30 +165,20 @@ class IndicatorService:
             if len(df) < days:
                 # 최근 데이터만 사용
                 print(f"[WARNING] {symbol} 데이터 부족 ({len(df)}개 < {days}개), 최근 데이터만 사용")
-                df = df.tail(len(df)).copy()
             
-            # 이동평균 계산
-            df = df.copy()
-            df[f"ma{days}"] = df["close"].rolling(window=days, min_periods=1).mean()
+            # 이동평균 (심볼 피처 프레임에서 읽기)
+            ma, = FeatureEngine.features(symbol, df, ("sma", days))
             
-            result = []
-            for _, row in df.iterrows():
-                if pd.notna(row.get(f"ma{days}")):
-                    date_str = row["date"].strftime("%Y-%m-%d") if hasattr(row["date"], 'strftime') else str(row["date"])
-                    result.append({
-                        "date": date_str,
-                        "price": float(row["close"]),
-                        f"ma{days}": float(row[f"ma{days}"])
-                    })
+            result = Serializer.columns(df["date"], {"price": df["close"], f"ma{days}": ma}, mask=ma.notna())
             
-            if not result:
+            if Serializer.is_empty(result):
                 print(f"[ERROR] {symbol} 이동평균 계산 결과 없음")
                 return []
             
-            # 캐시 저장 (15분)
-            cache.set(cache_key, result, 15 * 60)
-            print(f"[INFO] {symbol} 이동평균 계산 완료: {len(result)}개 데이터")
-            return result
+            # 캐시 저장 (컬럼 형식, 히스토리 변경 시 무효화)
+            IndicatorService._set_cached(symbol, cache_key, result)
+            print(f"[INFO] {symbol} 이동평균 계산 완료: {Serializer.count(result)}개 데이터")
+            return Serializer.render(result, fmt)
             
         except Exception as e:
             print(f"[ERROR] {symbol} 이동평균 계산 실패: {e}")
@@ -100,13 +187,14 @@ class IndicatorService:
             return []
     
     @staticmethod
-    def get_rsi(symbol: str, period: int = 14, period_years: int = 3) -> List[Dict]:
-        """RSI 계산 (14일 기준, fallback 지원)"""
+    @coalesce_fills
+    def get_rsi(symbol: str, period: int = 14, period_years: int = 3, fmt: str = RECORDS) -> Payload:
+        """RSI 계산 (14일 기준, fallback 지원, fmt: records | columnar)"""
         symbol = symbol.upper()
         cache_key = IndicatorService._get_cache_key("rsi", symbol, period, period_years)
-        cached = cache.get(cache_key)
+        cached = IndicatorService._get_cached(symbol, cache_key, refresher=lambda: IndicatorService.get_rsi(symbol, period, period_years))
         if cached is not None:
-            return cached
+            return Serializer.render(cached, fmt)
         
         try:
             # 히스토리 데이터 가져오기 (fallback 포함)
@@ -118,34 +206,20 @@ class IndicatorService:
             if len(df) < period:
                 # 최근 데이터만 사용
                 print(f"[WARNING] {symbol} 데이터 부족 ({len(df)}개 < {period}개), 최근 데이터만 사용")
-                df = df.tail(len(df)).copy()
-            
-            # RSI 계산
-            df = df.copy()
-            delta = df["close"].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=period, min_periods=1).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=period, min_periods=1).mean()
-            rs = gain / loss.replace(0, np.nan)
-            df["rsi"] = 100 - (100 / (1 + rs))
-            df["rsi"] = df["rsi"].fillna(50)
-            
-            result = []
-            for _, row in df.iterrows():
-                date_str = row["date"].strftime("%Y-%m-%d") if hasattr(row["date"], 'strftime') else str(row["date"])
-                result.append({
-                    "date": date_str,
-                    "rsi": float(row["rsi"]),
-                    "price": float(row["close"])
-                })
-            
-            if not result:
+            
+            # RSI (심볼 피처 프레임에서 읽기)
+            rsi, = FeatureEngine.features(symbol, df, ("rsi", period))
+            
+            result = Serializer.columns(df["date"], {"rsi": rsi, "price": df["close"]})
+            
+            if Serializer.is_empty(result):
                 print(f"[ERROR] {symbol} RSI 계산 결과 없음")
                 return []
             
-            # 캐시 저장 (15분)
-            cache.set(cache_key, result, 15 * 60)
-            print(f"[INFO] {symbol} RSI 계산 완료: {len(result)}개 데이터")
-            return result
+            # 캐시 저장 (컬럼 형식, 히스토리 변경 시 무효화)
+            IndicatorService._set_cached(symbol, cache_key, result)
+            print(f"[INFO] {symbol} RSI 계산 완료: {Serializer.count(result)}개 데이터")
+            return Serializer.render(result, fmt)
             
         except Exception as e:
             print(f"[ERROR] {symbol} RSI 계산 실패: {e}")
@@ -154,13 +228,15 @@ class IndicatorService:
             return []
     
     @staticmethod
-    def get_macd(symbol: str, fast: int = 12, slow: int = 26, signal: int = 9, period_years: int = 3) -> List[Dict]:
-        """MACD 계산 (12/26/9, fallback 지원)"""
+    @coalesce_fills
+    def get_macd(symbol: str, fast: int = 12, slow: int = 26, signal: int = 9, period_years: int = 3,
+                 fmt: str = RECORDS) -> Payload:
+        """MACD 계산 (12/26/9, fallback 지원, fmt: records | columnar)"""
         symbol = symbol.upper()
         cache_key = IndicatorService._get_cache_key("macd", symbol, fast, slow, signal, period_years)
-        cached = cache.get(cache_key)
+        cached = IndicatorService._get_cached(symbol, cache_key, refresher=lambda: IndicatorService.get_macd(symbol, fast, slow, signal, period_years))
         if cached is not None:
-            return cached
+            return Serializer.render(cached, fmt)
         
         try:
             # 히스토리 데이터 가져오기 (fallback 포함)
@@ -173,36 +249,26 @@ class IndicatorService:
             if len(df) < min_required:
                 # 최근 데이터만 사용
                 print(f"[WARNING] {symbol} 데이터 부족 ({len(df)}개 < {min_required}개), 최근 데이터만 사용")
-                df = df.tail(len(df)).copy()
-            
-            # MACD 계산
-            df = df.copy()
-            ema_fast = df["close"].ewm(span=fast, adjust=False).mean()
-            ema_slow = df["close"].ewm(span=slow, adjust=False).mean()
-            df["macd"] = ema_fast - ema_slow
-            df["signal"] = df["macd"].ewm(span=signal, adjust=False).mean()
-            df["histogram"] = df["macd"] - df["signal"]
-            
-            result = []
-            for _, row in df.iterrows():
-                if pd.notna(row.get("macd")):
-                    date_str = row["date"].strftime("%Y-%m-%d") if hasattr(row["date"], 'strftime') else str(row["date"])
-                    result.append({
-                        "date": date_str,
-                        "macd": float(row["macd"]),
-                        "signal": float(row["signal"]),
-                        "histogram": float(row["histogram"]),
-                        "price": float(row["close"])
-                    })
             
-            if not result:
+            # MACD (심볼 피처 프레임에서 읽기, EMA는 다른 지표와 공유)
+            macd, signal_line, histogram = FeatureEngine.features(
+                symbol, df, ("macd", fast, slow), ("macd_signal", fast, slow, signal), ("macd_hist", fast, slow, signal)
+            )
+            
+            result = Serializer.columns(
+                df["date"],
+                {"macd": macd, "signal": signal_line, "histogram": histogram, "price": df["close"]},
+                mask=macd.notna()
+            )
+            
+            if Serializer.is_empty(result):
                 print(f"[ERROR] {symbol} MACD 계산 결과 없음")
                 return []
             
-            # 캐시 저장 (15분)
-            cache.set(cache_key, result, 15 * 60)
-            print(f"[INFO] {symbol} MACD 계산 완료: {len(result)}개 데이터")
-            return result
+            # 캐시 저장 (컬럼 형식, 히스토리 변경 시 무효화)
+            IndicatorService._set_cached(symbol, cache_key, result)
+            print(f"[INFO] {symbol} MACD 계산 완료: {Serializer.count(result)}개 데이터")
+            return Serializer.render(result, fmt)
             
         except Exception as e:
             print(f"[ERROR] {symbol} MACD 계산 실패: {e}")
@@ -211,13 +277,15 @@ class IndicatorService:
             return []
     
     @staticmethod
-    def get_stochastic(symbol: str, k_period: int = 14, d_period: int = 3, period_years: int = 3) -> List[Dict]:
-        """Stochastic Oscillator 계산 (14일 + 3일 smoothing, fallback 지원)"""
+    @coalesce_fills
+    def get_stochastic(symbol: str, k_period: int = 14, d_period: int = 3, period_years: int = 3,
+                       fmt: str = RECORDS) -> Payload:
+        """Stochastic Oscillator 계산 (14일 + 3일 smoothing, fallback 지원, fmt: records | columnar)"""
         symbol = symbol.upper()
         cache_key = IndicatorService._get_cache_key("stochastic", symbol, k_period, d_period, period_years)
-        cached = cache.get(cache_key)
+        cached = IndicatorService._get_cached(symbol, cache_key, refresher=lambda: IndicatorService.get_stochastic(symbol, k_period, d_period, period_years))
         if cached is not None:
-            return cached
+            return Serializer.render(cached, fmt)
         
         try:
             # 히스토리 데이터 가져오기 (fallback 포함)
@@ -230,34 +298,20 @@ class IndicatorService:
             if len(df) < min_required:
                 # 최근 데이터만 사용
                 print(f"[WARNING] {symbol} 데이터 부족 ({len(df)}개 < {min_required}개), 최근 데이터만 사용")
-                df = df.tail(len(df)).copy()
-            
-            # Stochastic 계산
-            df = df.copy()
-            low_min = df["low"].rolling(window=k_period, min_periods=1).min()
-            high_max = df["high"].rolling(window=k_period, min_periods=1).max()
-            df["%K"] = 100 * ((df["close"] - low_min) / (high_max - low_min))
-            df["%D"] = df["%K"].rolling(window=d_period, min_periods=1).mean()
-            
-            result = []
-            for _, row in df.iterrows():
-                if pd.notna(row.get("%K")):
-                    date_str = row["date"].strftime("%Y-%m-%d") if hasattr(row["date"], 'strftime') else str(row["date"])
-                    result.append({
-                        "date": date_str,
-                        "%K": float(row["%K"]),
-                        "%D": float(row["%D"]),
-                        "price": float(row["close"])
-                    })
             
-            if not result:
+            # Stochastic (심볼 피처 프레임에서 읽기)
+            k, d = FeatureEngine.features(symbol, df, ("stoch_k", k_period), ("stoch_d", k_period, d_period))
+            
+            result = Serializer.columns(df["date"], {"%K": k, "%D": d, "price": df["close"]}, mask=k.notna())
+            
+            if Serializer.is_empty(result):
                 print(f"[ERROR] {symbol} Stochastic 계산 결과 없음")
                 return []
             
-            # 캐시 저장 (15분)
-            cache.set(cache_key, result, 15 * 60)
-            print(f"[INFO] {symbol} Stochastic 계산 완료: {len(result)}개 데이터")
-            return result
+            # 캐시 저장 (컬럼 형식, 히스토리 변경 시 무효화)
+            IndicatorService._set_cached(symbol, cache_key, result)
+            print(f"[INFO] {symbol} Stochastic 계산 완료: {Serializer.count(result)}개 데이터")
+            return Serializer.render(result, fmt)
             
         except Exception as e:
             print(f"[ERROR] {symbol} Stochastic 계산 실패: {e}")
@@ -266,11 +320,12 @@ class IndicatorService:
             return []
     
     @staticmethod
+    @coalesce_fills
     def get_volatility(symbol: str, period: int = 30, period_years: int = 3) -> Optional[float]:
         """변동성 계산 (표준편차 기반, fallback 지원)"""
         symbol = symbol.upper()
         cache_key = IndicatorService._get_cache_key("volatility", symbol, period, period_years)
-        cached = cache.get(cache_key)
+        cached = IndicatorService._get_cached(symbol, cache_key, refresher=lambda: IndicatorService.get_volatility(symbol, period, period_years))
         if cached is not None:
             return cached
         
@@ -298,8 +353,8 @@ class IndicatorService:
             # 연율화 (252 거래일 기준)
             annualized_volatility = volatility * np.sqrt(252) * 100
             
-            # 캐시 저장 (15분)
-            cache.set(cache_key, annualized_volatility, 15 * 60)
+            # 캐시 저장 (히스토리 변경 시 무효화)
+            IndicatorService._set_cached(symbol, cache_key, annualized_volatility)
             return float(annualized_volatility)
             
         except Exception as e:
@@ -309,11 +364,12 @@ class IndicatorService:
             return None
     
     @staticmethod
+    @coalesce_fills
     def get_mdd(symbol: str, period_years: int = 3) -> Optional[float]:
         """MDD (Maximum Drawdown) 계산 (fallback 지원)"""
         symbol = symbol.upper()
         cache_key = IndicatorService._get_cache_key("mdd", symbol, period_years)
-        cached = cache.get(cache_key)
+        cached = IndicatorService._get_cached(symbol, cache_key, refresher=lambda: IndicatorService.get_mdd(symbol, period_years))
         if cached is not None:
             return cached
         
@@ -340,8 +396,8 @@ class IndicatorService:
             if pd.isna(mdd):
                 return None
             
-            # 캐시 저장 (15분)
-            cache.set(cache_key, mdd, 15 * 60)
+            # 캐시 저장 (히스토리 변경 시 무효화)
+            IndicatorService._set_cached(symbol, cache_key, mdd)
             return float(mdd)
             
         except Exception as e:
@@ -351,6 +407,7 @@ class IndicatorService:
             return None
     
     @staticmethod
+    @coalesce_fills
     def get_golden_death_cross(symbol: str, period_years: int = 3) -> Dict:
         """골든/데드크로스 판단 (MA20, MA60, MA200 기반)
         
@@ -369,7 +426,7 @@ class IndicatorService:
         """
         symbol = symbol.upper()
         cache_key = IndicatorService._get_cache_key("cross", symbol, period_years)
-        cached = cache.get(cache_key)
+        cached = IndicatorService._get_cached(symbol, cache_key, refresher=lambda: IndicatorService.get_golden_death_cross(symbol, period_years))
         if cached is not None:
             return cached
         
@@ -453,8 +510,8 @@ class IndicatorService:
                 "ma200_previous": ma200_previous
             }
             
-            # 캐시 저장 (15분)
-            cache.set(cache_key, result, 15 * 60)
+            # 캐시 저장 (히스토리 변경 시 무효화)
+            IndicatorService._set_cached(symbol, cache_key, result)
             return result
             
         except Exception as e:
@@ -474,6 +531,7 @@ class IndicatorService:
             }
     
     @staticmethod
+    @coalesce_fills
     def get_divergence(symbol: str, period_days: int = 60, period_years: int = 3) -> Dict:
         """RSI/가격 기반 Divergence 판단 (최근 30~60일)
         
@@ -492,16 +550,15 @@ class IndicatorService:
         """
         symbol = symbol.upper()
         cache_key = IndicatorService._get_cache_key("divergence", symbol, period_days, period_years)
-        cached = cache.get(cache_key)
+        cached = IndicatorService._get_cached(symbol, cache_key, refresher=lambda: IndicatorService.get_divergence(symbol, period_days, period_years))
         if cached is not None:
             return cached
         
         try:
-            # 히스토리 및 RSI 데이터 가져오기
+            # 히스토리 가져오기 (RSI는 같은 프레임에서 위치 기준으로 읽음)
             df = IndicatorService._get_history_with_fallback(symbol, period_years)
-            rsi_data = IndicatorService.get_rsi(symbol, period_years=period_years)
             
-            if df is None or df.empty or not rsi_data or len(rsi_data) < period_days:
+            if df is None or df.empty or len(df) < period_days:
                 return {
                     "divergence": "none",
                     "price_low1": None,
@@ -515,27 +572,9 @@ class IndicatorService:
                 }
             
             # 최근 period_days일 데이터만 사용
-            df_recent = df.tail(period_days).copy()
-            rsi_recent = rsi_data[-period_days:] if len(rsi_data) >= period_days else rsi_data
-            
-            # RSI 데이터를 DataFrame과 병합 (날짜 형식 통일)
-            rsi_dict = {}
-            for item in rsi_recent:
-                date_key = item["date"]
-                if hasattr(date_key, 'strftime'):
-                    date_key = date_key.strftime("%Y-%m-%d")
-                else:
-                    date_key = str(date_key)
-                rsi_dict[date_key] = item["rsi"]
-            
-            def get_rsi_value(date_val):
-                if hasattr(date_val, 'strftime'):
-                    date_key = date_val.strftime("%Y-%m-%d")
-                else:
-                    date_key = str(date_val)
-                return rsi_dict.get(date_key, None)
-            
-            df_recent["rsi"] = df_recent["date"].apply(get_rsi_value)
+            df_recent = df.tail(period_days)
+            rsi, = FeatureEngine.features(symbol, df, ("rsi", 14))
+            rsi_recent_values = rsi.tail(period_days)
             
             # 최근 두 개의 저점 찾기 (가격)
             price_lows = df_recent.nsmallest(2, "low")
@@ -546,12 +585,12 @@ class IndicatorService:
                 price_low2 = float(price_lows.iloc[1]["low"])
             
             # 최근 두 개의 저점 찾기 (RSI)
-            rsi_lows = df_recent.nsmallest(2, "rsi")
+            rsi_lows = rsi_recent_values.nsmallest(2)
             if len(rsi_lows) < 2:
                 rsi_low1 = rsi_low2 = None
             else:
-                rsi_low1 = float(rsi_lows.iloc[0]["rsi"])
-                rsi_low2 = float(rsi_lows.iloc[1]["rsi"])
+                rsi_low1 = float(rsi_lows.iloc[0])
+                rsi_low2 = float(rsi_lows.iloc[1])
             
             # 최근 두 개의 고점 찾기 (가격)
             price_highs = df_recent.nlargest(2, "high")
@@ -562,12 +601,12 @@ class IndicatorService:
                 price_high2 = float(price_highs.iloc[1]["high"])
             
             # 최근 두 개의 고점 찾기 (RSI)
-            rsi_highs = df_recent.nlargest(2, "rsi")
+            rsi_highs = rsi_recent_values.nlargest(2)
             if len(rsi_highs) < 2:
                 rsi_high1 = rsi_high2 = None
             else:
-                rsi_high1 = float(rsi_highs.iloc[0]["rsi"])
-                rsi_high2 = float(rsi_highs.iloc[1]["rsi"])
+                rsi_high1 = float(rsi_highs.iloc[0])
+                rsi_high2 = float(rsi_highs.iloc[1])
             
             divergence = "none"
             
@@ -595,8 +634,8 @@ class IndicatorService:
                 "rsi_high2": rsi_high2
             }
             
-            # 캐시 저장 (15분)
-            cache.set(cache_key, result, 15 * 60)
+            # 캐시 저장 (히스토리 변경 시 무효화)
+            IndicatorService._set_cached(symbol, cache_key, result)
             return result
             
         except Exception as e:
@@ -616,6 +655,92 @@ class IndicatorService:
             }
     
     @staticmethod
+    def _find_divergences(df: pd.DataFrame, rsi: pd.Series, left: int, right: int,
+                          max_gap: int) -> Dict[str, List]:
+        """연속한 스윙 저점/고점 쌍 중 가격과 RSI 방향이 엇갈리는 구간 (컬럼 형식)
+        
+        - bullish: 저점(low)은 낮아졌는데 RSI는 높아짐
+        - bearish: 고점(high)은 높아졌는데 RSI는 낮아짐
+        가격과 RSI는 같은 프레임의 위치로 맞추며, 두 피벗 간격이 max_gap봉을 넘는 쌍은 제외합니다.
+        """
+        rsi_values = rsi.to_numpy(dtype=float)
+        lows, highs = df["low"].to_numpy(dtype=float), df["high"].to_numpy(dtype=float)
+        
+        kinds, starts, ends, price_starts, price_ends = [], [], [], [], []
+        for kind, price, pivots, sign in (
+            ("bullish", lows, indicator_kernels.pivot_lows(lows, left, right), -1),
+            ("bearish", highs, indicator_kernels.pivot_highs(highs, left, right), 1),
+        ):
+            idx = np.flatnonzero(pivots)
+            start, end = idx[:-1], idx[1:]
+            # 가격은 sign 방향으로, RSI는 반대 방향으로 움직인 쌍
+            keep = ((end - start <= max_gap)
+                    & (np.sign(price[end] - price[start]) == sign)
+                    & (np.sign(rsi_values[end] - rsi_values[start]) == -sign))
+            start, end = start[keep], end[keep]
+            kinds.extend([kind] * len(end))
+            starts.append(start)
+            ends.append(end)
+            price_starts.append(price[start])
+            price_ends.append(price[end])
+        
+        # 두 번째 피벗 날짜 순으로 정렬
+        end = np.concatenate(ends)
+        order = np.argsort(end, kind="stable")
+        end = end[order]
+        start = np.concatenate(starts)[order]
+        price_start = np.concatenate(price_starts)[order]
+        price_end = np.concatenate(price_ends)[order]
+        
+        dates = df["date"]
+        return {
+            "date": Serializer.format_dates(dates.iloc[end]),
+            "type": [kinds[i] for i in order],
+            "start_date": Serializer.format_dates(dates.iloc[start]),
+            "confirmed_date": Serializer.format_dates(dates.iloc[end + right]),
+            "price_start": Serializer.float_list(price_start),
+            "price_end": Serializer.float_list(price_end),
+            "rsi_start": Serializer.float_list(rsi_values[start]),
+            "rsi_end": Serializer.float_list(rsi_values[end]),
+        }
+    
+    @staticmethod
+    @coalesce_fills
+    def get_divergence_history(symbol: str, period_years: int = 3, left: int = 5, right: int = 5,
+                               max_gap: int = 60, fmt: str = RECORDS) -> Payload:
+        """전체 히스토리의 RSI Divergence 목록 (스윙 피벗 기반, fmt: records | columnar)
+        
+        Returns:
+            List[Dict]: [{"date": 두 번째 피벗 날짜, "type": "bullish" | "bearish", "start_date": 첫 번째 피벗 날짜,
+                          "confirmed_date": 피벗이 확정된 날짜 (date + right봉), "price_start", "price_end",
+                          "rsi_start", "rsi_end"}] (date 오름차순)
+        """
+        symbol = symbol.upper()
+        cache_key = IndicatorService._get_cache_key("divergence_history", symbol, period_years, left, right, max_gap)
+        cached = IndicatorService._get_cached(symbol, cache_key)
+        if cached is not None:
+            return Serializer.render(cached, fmt)
+        
+        try:
+            df = IndicatorService._get_history_with_fallback(symbol, period_years)
+            if df is None or df.empty or len(df) < left + right + 1:
+                return []
+            
+            rsi, = FeatureEngine.features(symbol, df, ("rsi", 14))
+            result = IndicatorService._find_divergences(df, rsi, left, right, max_gap)
+            
+            # 캐시 저장 (컬럼 형식, 히스토리 변경 시 무효화)
+            IndicatorService._set_cached(symbol, cache_key, result)
+            return Serializer.render(result, fmt)
+            
+        except Exception as e:
+            print(f"[ERROR] {symbol} Divergence 히스토리 계산 실패: {e}")
+            import traceback
+            traceback.print_exc()
+            return []
+    
+    @staticmethod
+    @coalesce_fills
     def detect_patterns(symbol: str, period_years: int = 1) -> Dict:
         """시장 패턴 탐지 (삼각수렴, 쐐기, 박스권, 볼린저밴드 돌파, 급등/급락)
         
@@ -628,7 +753,7 @@ class IndicatorService:
         """
         symbol = symbol.upper()
         cache_key = IndicatorService._get_cache_key("patterns", symbol, period_years)
-        cached = cache.get(cache_key)
+        cached = IndicatorService._get_cached(symbol, cache_key, refresher=lambda: IndicatorService.detect_patterns(symbol, period_years))
         if cached is not None:
             return cached
         
@@ -645,7 +770,7 @@ class IndicatorService:
             spike_days = []
             
             # 최근 60일 데이터로 패턴 분석
-            df_recent = df.tail(60).copy()
+            df_recent = df.tail(60)
             
             # 1. 삼각수렴 패턴 (최근 30일)
             if len(df_recent) >= 30:
@@ -755,7 +880,7 @@ class IndicatorService:
                 "bollinger_breakout": bollinger_breakout
             }
             
-            cache.set(cache_key, result, 15 * 60)
+            IndicatorService._set_cached(symbol, cache_key, result)
             return result
             
         except Exception as e:
@@ -769,6 +894,7 @@ class IndicatorService:
             }
     
     @staticmethod
+    @coalesce_fills
     def get_atr(symbol: str, period: int = 14, period_years: int = 3) -> Optional[float]:
         """ATR (Average True Range) 계산
         
@@ -777,7 +903,7 @@ class IndicatorService:
         """
         symbol = symbol.upper()
         cache_key = IndicatorService._get_cache_key("atr", symbol, period, period_years)
-        cached = cache.get(cache_key)
+        cached = IndicatorService._get_cached(symbol, cache_key, refresher=lambda: IndicatorService.get_atr(symbol, period, period_years))
         if cached is not None:
             return cached
         
@@ -786,24 +912,16 @@ class IndicatorService:
             if df is None or df.empty or len(df) < period + 1:
                 return None
             
-            # True Range 계산
-            df = df.copy()
-            df["prev_close"] = df["close"].shift(1)
-            df["tr1"] = df["high"] - df["low"]
-            df["tr2"] = abs(df["high"] - df["prev_close"])
-            df["tr3"] = abs(df["low"] - df["prev_close"])
-            df["tr"] = df[["tr1", "tr2", "tr3"]].max(axis=1)
-            
-            # ATR 계산 (period일 평균)
-            atr = df["tr"].rolling(window=period, min_periods=1).mean().iloc[-1]
+            # ATR (True Range의 period일 평균, 심볼 피처 프레임에서 읽기)
+            atr = FeatureEngine.features(symbol, df, ("atr", period))[0].iloc[-1]
             
             if pd.isna(atr):
                 return None
             
             result = float(atr)
             
-            # 캐시 저장 (15분)
-            cache.set(cache_key, result, 15 * 60)
+            # 캐시 저장 (히스토리 변경 시 무효화)
+            IndicatorService._set_cached(symbol, cache_key, result)
             return result
             
         except Exception as e:
@@ -813,6 +931,7 @@ class IndicatorService:
             return None
     
     @staticmethod
+    @coalesce_fills
     def get_risk_score(symbol: str, period: int = 30, period_years: int = 3) -> Dict:
         """변동성 기반 Risk Score 계산
         
@@ -827,7 +946,7 @@ class IndicatorService:
         """
         symbol = symbol.upper()
         cache_key = IndicatorService._get_cache_key("risk_score", symbol, period, period_years)
-        cached = cache.get(cache_key)
+        cached = IndicatorService._get_cached(symbol, cache_key, refresher=lambda: IndicatorService.get_risk_score(symbol, period, period_years))
         if cached is not None:
             return cached
         
@@ -843,20 +962,19 @@ class IndicatorService:
                 }
             
             # 최근 period일 데이터만 사용
-            df_recent = df.tail(period).copy()
-            current_price = float(df_recent.iloc[-1]["close"])
+            current_price = float(df["close"].iloc[-1])
+            returns, range_pct = FeatureEngine.features(symbol, df, "returns", "range_pct")
             
             # 1) ATR 계산 및 정규화
             atr = IndicatorService.get_atr(symbol, period=14, period_years=period_years)
             atr_normalized = (atr / current_price) if atr and current_price > 0 else 0.0
             
             # 2) 최근 30일 수익률의 표준편차
-            returns = df_recent["close"].pct_change().dropna()
+            returns = returns.iloc[-(period - 1):] if period > 1 else returns.iloc[:0]
             volatility_std = float(returns.std()) if len(returns) > 0 else 0.0
             
             # 3) 일일 변동폭(고가-저가)의 평균값 / 종가
-            df_recent["range"] = (df_recent["high"] - df_recent["low"]) / df_recent["close"]
-            range_vol = float(df_recent["range"].mean()) if len(df_recent) > 0 else 0.0
+            range_vol = float(range_pct.iloc[-period:].mean()) if period > 0 else 0.0
             
             # 4) 총 변동성 = (ATR_normalized + volatility_std + range_vol) / 3
             total_volatility = (atr_normalized + volatility_std + range_vol) / 3.0
@@ -880,8 +998,8 @@ class IndicatorService:
                 "range_vol": round(range_vol, 6)
             }
             
-            # 캐시 저장 (15분)
-            cache.set(cache_key, result, 15 * 60)
+            # 캐시 저장 (히스토리 변경 시 무효화)
+            IndicatorService._set_cached(symbol, cache_key, result)
             return result
             
         except Exception as e:
@@ -895,3 +1013,8 @@ class IndicatorService:
                 "volatility_std": None,
                 "range_vol": None
             }
+
+
+# 지표 캐시는 만료 후에도 grace 시간 동안 이전 값을 제공 (stale-while-revalidate)
+for _prefix in IndicatorService.STALE_PREFIXES:
+    cache.set_stale_policy(_prefix, IndicatorService.STALE_GRACE)
@@ -0,0 +1,272 @@
+"""
+경로 의존 지표 커널 (이전 상태에 의존하는 순차 계산: Wilder 평활, Parabolic SAR, SuperTrend, 롤링 백분위 순위)
+
+Numba가 설치되어 있으면 루프를 JIT 컴파일해 사용하고, 없으면 NumPy/pandas 구현으로 대체합니다.
+두 구현은 같은 정의를 따르며 부동소수점 오차(1e-9 이하) 범위에서 같은 값을 반환합니다.
+모든 함수는 입력과 같은 길이의 float 배열을 반환하며, 값을 계산할 수 없는 구간은 NaN입니다.
+"""
+import math
+from typing import Optional, Tuple
+import numpy as np
+import pandas as pd
+from core.config import settings
+
+try:
+    import numba
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+def _wilder_smooth_loop(values, period, start):
+    """values[start..]의 첫 period개 평균으로 시작해 (이전 * (period - 1) + 현재) / period"""
+    n = len(values)
+    out = np.full(n, np.nan)
+    first = start + period - 1
+    if period <= 0 or first >= n:
+        return out
+    total = 0.0
+    for i in range(start, first + 1):
+        total += values[i]
+    avg = total / period
+    out[first] = avg
+    for i in range(first + 1, n):
+        avg = (avg * (period - 1) + values[i]) / period
+        out[i] = avg
+    return out
+
+
+def _psar_loop(high, low, step, max_step):
+    """Parabolic SAR (sar, trend: 상승 1 / 하락 -1, 첫 봉은 NaN/0)"""
+    n = len(high)
+    sar = np.full(n, np.nan)
+    trend = np.zeros(n)
+    if n < 2:
+        return sar, trend
+
+    # 첫 두 봉의 중간값으로 초기 추세 결정
+    is_up = high[1] + low[1] >= high[0] + low[0]
+    af = step
+    if is_up:
+        ep = max(high[0], high[1])
+        s = min(low[0], low[1])
+    else:
+        ep = min(low[0], low[1])
+        s = max(high[0], high[1])
+    sar[1] = s
+    trend[1] = 1.0 if is_up else -1.0
+
+    for i in range(2, n):
+        s = s + af * (ep - s)
+        if is_up:
+            # SAR은 직전 두 봉의 저가를 넘을 수 없음
+            s = min(s, low[i - 1], low[i - 2])
+            if low[i] < s:
+                is_up = False
+                s = ep
+                ep = low[i]
+                af = step
+            elif high[i] > ep:
+                ep = high[i]
+                af = min(af + step, max_step)
+        else:
+            s = max(s, high[i - 1], high[i - 2])
+            if high[i] > s:
+                is_up = True
+                s = ep
+                ep = high[i]
+                af = step
+            elif low[i] < ep:
+                ep = low[i]
+                af = min(af + step, max_step)
+        sar[i] = s
+        trend[i] = 1.0 if is_up else -1.0
+    return sar, trend
+
+
+def _supertrend_loop(high, low, close, atr, multiplier):
+    """SuperTrend (line, direction: 상승 1 / 하락 -1, ATR 계산 전 구간은 NaN/0)"""
+    n = len(close)
+    line = np.full(n, np.nan)
+    direction = np.zeros(n)
+    start = -1
+    for i in range(n):
+        if not math.isnan(atr[i]):
+            start = i
+            break
+    if start < 0:
+        return line, direction
+
+    hl2 = (high[start] + low[start]) / 2
+    upper = hl2 + multiplier * atr[start]
+    lower = hl2 - multiplier * atr[start]
+    is_up = close[start] >= lower
+    line[start] = lower if is_up else upper
+    direction[start] = 1.0 if is_up else -1.0
+
+    for i in range(start + 1, n):
+        hl2 = (high[i] + low[i]) / 2
+        basic_upper = hl2 + multiplier * atr[i]
+        basic_lower = hl2 - multiplier * atr[i]
+        # 밴드는 추세 방향으로만 좁혀짐 (직전 종가가 밴드를 벗어났으면 새 값 사용)
+        if basic_upper < upper or close[i - 1] > upper:
+            upper = basic_upper
+        if basic_lower > lower or close[i - 1] < lower:
+            lower = basic_lower
+        if is_up and close[i] < lower:
+            is_up = False
+        elif not is_up and close[i] > upper:
+            is_up = True
+        line[i] = lower if is_up else upper
+        direction[i] = 1.0 if is_up else -1.0
+    return line, direction
+
+
+def _rolling_rank_loop(ranks, tree, window, min_periods):
+    """Fenwick 트리로 윈도우 내 현재 값보다 작은 값의 비율 (%) 계산
+
+    ranks: 값의 밀집 순위 (0부터, NaN은 -1), tree: 0으로 채운 길이 (순위 개수 + 1) 버퍼
+    """
+    n = len(ranks)
+    size = len(tree) - 1
+    out = np.full(n, np.nan)
+    count = 0
+    for i in range(n):
+        r = ranks[i]
+        if r >= 0:
+            j = r + 1
+            while j <= size:
+                tree[j] += 1
+                j += j & -j
+            count += 1
+        # 윈도우를 벗어난 값 제거 (window <= 0이면 누적)
+        if window > 0 and i >= window:
+            old = ranks[i - window]
+            if old >= 0:
+                j = old + 1
+                while j <= size:
+                    tree[j] -= 1
+                    j += j & -j
+                count -= 1
+        if r >= 0 and count >= min_periods:
+            less = 0
+            j = r
+            while j > 0:
+                less += tree[j]
+                j -= j & -j
+            out[i] = less / count * 100
+    return out
+
+
+if HAS_NUMBA:
+    _wilder_smooth_jit = numba.njit(cache=True)(_wilder_smooth_loop)
+    _psar_jit = numba.njit(cache=True)(_psar_loop)
+    _supertrend_jit = numba.njit(cache=True)(_supertrend_loop)
+    _rolling_rank_jit = numba.njit(cache=True)(_rolling_rank_loop)
+
+
+def jit_enabled(use_jit: Optional[bool] = None) -> bool:
+    """JIT 커널 사용 여부 (use_jit 미지정 시 설정값, Numba가 없으면 항상 False)"""
+    if use_jit is None:
+        use_jit = settings.indicator_jit_enabled
+    return HAS_NUMBA and use_jit
+
+
+def _as_array(values) -> np.ndarray:
+    return np.ascontiguousarray(values, dtype=float).reshape(-1)
+
+
+def wilder_smooth(values, period: int, start: int = 0, use_jit: Optional[bool] = None) -> np.ndarray:
+    """Wilder 평활 (RMA)
+
+    values[start:start + period]의 단순 평균으로 시작하므로 start + period - 1 이전은 NaN입니다.
+    values는 start 이후에 NaN이 없어야 합니다.
+    """
+    x = _as_array(values)
+    if jit_enabled(use_jit):
+        return _wilder_smooth_jit(x, period, start)
+
+    out = np.full(len(x), np.nan)
+    first = start + period - 1
+    if period <= 0 or first >= len(x):
+        return out
+    # 시작값 뒤로는 alpha = 1 / period인 지수 평활과 같음
+    seed = x[start:first + 1].sum() / period
+    out[first:] = pd.Series(np.concatenate(([seed], x[first + 1:]))).ewm(
+        alpha=1.0 / period, adjust=False
+    ).mean().to_numpy()
+    return out
+
+
+def true_range(high, low, close) -> np.ndarray:
+    """True Range (첫 봉은 고가 - 저가)"""
+    high, low, close = _as_array(high), _as_array(low), _as_array(close)
+    tr = high - low
+    if len(tr) > 1:
+        prev_close = close[:-1]
+        tr[1:] = np.maximum.reduce([tr[1:], np.abs(high[1:] - prev_close), np.abs(low[1:] - prev_close)])
+    return tr
+
+
+def wilder_rsi(close, period: int = 14, use_jit: Optional[bool] = None) -> np.ndarray:
+    """Wilder RSI (변화량 1..period 평균으로 시작, 하락이 없으면 상승 시 100 / 보합 시 50)"""
+    x = _as_array(close)
+    delta = np.zeros(len(x))
+    delta[1:] = np.diff(x)
+    avg_gain = wilder_smooth(np.maximum(delta, 0), period, start=1, use_jit=use_jit)
+    avg_loss = wilder_smooth(np.maximum(-delta, 0), period, start=1, use_jit=use_jit)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+    flat = np.where(avg_gain > 0, 100.0, 50.0)
+    return np.where(avg_loss == 0, flat, rsi)
+
+
+def wilder_atr(high, low, close, period: int = 14, use_jit: Optional[bool] = None) -> np.ndarray:
+    """Wilder ATR (두 번째 봉부터의 True Range를 Wilder 평활)"""
+    return wilder_smooth(true_range(high, low, close), period, start=1, use_jit=use_jit)
+
+
+def parabolic_sar(high, low, step: float = 0.02, max_step: float = 0.2,
+                  use_jit: Optional[bool] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Parabolic SAR
+
+    Returns:
+        (sar, trend) - trend는 상승 1 / 하락 -1 (첫 봉은 sar NaN, trend 0)
+    """
+    high, low = _as_array(high), _as_array(low)
+    if jit_enabled(use_jit):
+        return _psar_jit(high, low, float(step), float(max_step))
+    # 순차 계산이라 벡터화할 수 없으므로 파이썬 float 리스트로 루프 (ndarray 원소 접근보다 빠름)
+    return _psar_loop(high.tolist(), low.tolist(), float(step), float(max_step))
+
+
+def supertrend(high, low, close, period: int = 10, multiplier: float = 3.0,
+               use_jit: Optional[bool] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """SuperTrend (hl2 ± multiplier * Wilder ATR 밴드)
+
+    Returns:
+        (line, direction) - direction은 상승 1 / 하락 -1 (ATR 계산 전 구간은 line NaN, direction 0)
+    """
+    high, low, close = _as_array(high), _as_array(low), _as_array(close)
+    atr = wilder_atr(high, low, close, period, use_jit=use_jit)
+    if jit_enabled(use_jit):
+        return _supertrend_jit(high, low, close, atr, float(multiplier))
+    return _supertrend_loop(high.tolist(), low.tolist(), close.tolist(), atr.tolist(), float(multiplier))
+
+
+def rolling_percentile_rank(values, window: Optional[int] = None, min_periods: int = 1,
+                            use_jit: Optional[bool] = None) -> np.ndarray:
+    """롤링 백분위 순위 (%): 최근 window개 값 중 현재 값보다 작은 값의 비율, O(n log n)
+
+    window가 None이면 시작부터 현재까지 누적 구간을 사용합니다. 분모에는 현재 값이 포함되므로
+    최솟값은 0, 최댓값은 (개수 - 1) / 개수 * 100입니다. NaN은 순위 계산에서 제외되고 결과도 NaN입니다.
+    """
+    x = _as_array(values)
+    valid = ~np.isnan(x)
+    unique = np.unique(x[valid])
+    ranks = np.full(len(x), -1, dtype=np.int64)
+    ranks[valid] = np.searchsorted(unique, x[valid])
+    window = window or 0
+    if jit_enabled(use_jit):
+        return _rolling_rank_jit(ranks, np.zeros(len(unique) + 1, dtype=np.int64), window, min_periods)
+    return _rolling_rank_loop(ranks.tolist(), [0] * (len(unique) + 1), window, min_periods)
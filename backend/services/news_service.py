@@ -7,6 +7,7 @@ from typing import List, Dict, Optional
 from datetime import datetime
 import traceback
 from core.cache import cache
+from core.http_client import http_client
 
 
 class NewsService:
@@ -66,11 +67,10 @@ class NewsService:
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
             }
             
-            response = requests.get(
+            response = http_client.get(
                 NewsService.BASE_URL,
                 params=params,
-                headers=headers,
-                timeout=10
+                headers=headers
             )
             
             if response.status_code == 200:
@@ -0,0 +1,135 @@
+"""
+다중 심볼 스크리너 서비스 (날짜 × 심볼 종가 행렬로 지표를 한 번에 계산해 필터/정렬)
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+from services.yahoo_service import YahooService
+from services.indicator_kernels import TRADING_DAYS
+
+
+class ScreenerService:
+    """다중 심볼 지표 행렬 서비스
+
+    심볼별로 지표 서비스를 반복 호출하지 않고, 종가를 날짜 × 심볼 행렬로 정렬한 뒤
+    모든 컬럼에 대해 같은 연산을 한 번에 수행합니다. 지표 정의는 IndicatorService와 같습니다.
+    """
+
+    MAX_SYMBOLS = 500  # 한 번에 스크리닝할 최대 심볼 수
+    FILL_LIMIT = 3  # 다른 심볼만 거래한 날(거래소 휴장일 차이)을 직전 값으로 채우는 최대 연속 일수
+    METRICS = ("price", "rsi", "ma_distance", "macd_hist", "volatility", "drawdown", "mdd")
+
+    @staticmethod
+    def build_matrix(histories: Dict[str, pd.DataFrame], field: str = "close") -> pd.DataFrame:
+        """심볼별 히스토리를 날짜 × 심볼 행렬로 정렬
+
+        거래일이 다른 심볼은 최대 FILL_LIMIT일까지만 직전 값으로 채웁니다. 그보다 오래 값이 없는 구간
+        (거래 정지, 상장폐지, 갱신이 멈춘 히스토리)과 상장 전 구간은 NaN으로 두어 오래된 가격이
+        최신 값처럼 지표에 섞이지 않게 합니다.
+        """
+        if not histories:
+            return pd.DataFrame()
+        dates = pd.DatetimeIndex(np.unique(np.concatenate(
+            [df["date"].to_numpy() for df in histories.values()]
+        )))
+        # 심볼별 컬럼을 하나의 2차원 배열에 채운 뒤 DataFrame 1개(블록 1개)로 감쌈
+        matrix = np.full((len(dates), len(histories)), np.nan)
+        for j, df in enumerate(histories.values()):
+            matrix[dates.get_indexer(df["date"]), j] = df[field].to_numpy(dtype=float)
+        return pd.DataFrame(matrix, index=dates, columns=list(histories)).ffill(limit=ScreenerService.FILL_LIMIT)
+
+    @staticmethod
+    def indicator_matrix(closes: pd.DataFrame, rsi_period: int = 14, ma_days: int = 200,
+                         fast: int = 12, slow: int = 26, signal: int = 9,
+                         volatility_period: int = 30) -> Dict[str, pd.DataFrame]:
+        """종가 행렬의 지표 행렬 (지표 이름 → 날짜 × 심볼 DataFrame)
+
+        - rsi: RSI (최근 rsi_period개 변화량의 단순 평균, get_rsi와 같음)
+        - ma_distance: ma_days일 이동평균 대비 괴리율 (%)
+        - macd_hist: MACD 히스토그램 (fast/slow/signal EMA)
+        - volatility: 최근 volatility_period일 수익률의 연율화 표준편차 (%, get_volatility와 같음)
+        - drawdown: 기간 내 고점 대비 현재 하락률 (%, 양수)
+        """
+        delta = closes.diff()
+        gain = delta.where(delta > 0, 0).rolling(window=rsi_period, min_periods=1).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(window=rsi_period, min_periods=1).mean()
+        rsi = (100 - 100 / (1 + gain / loss)).mask(loss == 0, 50.0)
+
+        ma = closes.rolling(window=ma_days).mean()
+        ma_distance = (closes / ma - 1) * 100
+
+        macd = closes.ewm(span=fast, adjust=False).mean() - closes.ewm(span=slow, adjust=False).mean()
+        macd_hist = macd - macd.ewm(span=signal, adjust=False).mean()
+
+        returns = closes.pct_change(fill_method=None)
+        volatility = returns.rolling(window=volatility_period).std() * np.sqrt(TRADING_DAYS) * 100
+
+        drawdown = (1 - closes / closes.cummax()) * 100
+
+        return {
+            "price": closes,
+            "rsi": rsi,
+            "ma_distance": ma_distance,
+            "macd_hist": macd_hist,
+            "volatility": volatility,
+            "drawdown": drawdown,
+        }
+
+    @staticmethod
+    def latest_metrics(closes: pd.DataFrame, **params) -> pd.DataFrame:
+        """심볼별 최신 지표 (행: 심볼, 컬럼: METRICS)"""
+        matrices = ScreenerService.indicator_matrix(closes, **params)
+        latest = pd.DataFrame({name: matrix.iloc[-1] for name, matrix in matrices.items()})
+        latest["mdd"] = matrices["drawdown"].max()
+        return latest[list(ScreenerService.METRICS)]
+
+    @staticmethod
+    def screen(symbols: List[str], years: int = 1,
+               filters: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+               sort_by: str = "rsi", descending: bool = False, limit: int = 50,
+               ma_days: int = 200) -> Dict:
+        """심볼 목록을 지표 조건으로 필터링하고 정렬
+
+        Args:
+            symbols: 대상 심볼 (최대 MAX_SYMBOLS개)
+            filters: 지표 이름 → (최소값, 최대값), None은 제한 없음 (값이 없는 심볼은 제외)
+            sort_by: 정렬 기준 지표 (값이 없는 심볼은 뒤로)
+
+        Returns:
+            {"as_of", "total", "matched", "missing", "results": [{"symbol", ...METRICS}]}
+        """
+        symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s.strip()))
+        if len(symbols) > ScreenerService.MAX_SYMBOLS:
+            raise ValueError(f"심볼은 최대 {ScreenerService.MAX_SYMBOLS}개까지 조회할 수 있습니다.")
+        if sort_by not in ScreenerService.METRICS:
+            raise ValueError(f"지원하지 않는 정렬 기준: {sort_by}")
+        for name in filters or {}:
+            if name not in ScreenerService.METRICS:
+                raise ValueError(f"지원하지 않는 필터 지표: {name}")
+
+        histories = YahooService.get_histories(symbols, years)
+        missing = [s for s in symbols if s not in histories]
+        if not histories:
+            return {"as_of": None, "total": len(symbols), "matched": 0, "missing": missing, "results": []}
+
+        closes = ScreenerService.build_matrix(histories)
+        metrics = ScreenerService.latest_metrics(closes, ma_days=ma_days)
+
+        keep = pd.Series(True, index=metrics.index)
+        for name, (low, high) in (filters or {}).items():
+            if low is not None:
+                keep &= metrics[name] >= low
+            if high is not None:
+                keep &= metrics[name] <= high
+        matched = metrics[keep].sort_values(sort_by, ascending=not descending, na_position="last")
+
+        top = matched.head(limit)
+        rows = top.astype(object).where(top.notna(), None)
+        results = [{"symbol": symbol, **row} for symbol, row in zip(rows.index, rows.to_dict("records"))]
+        return {
+            "as_of": closes.index[-1].strftime("%Y-%m-%d"),
+            "total": len(symbols),
+            "matched": int(len(matched)),
+            "missing": missing,
+            "results": results,
+        }
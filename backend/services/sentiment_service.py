@@ -5,6 +5,7 @@ import json
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from core.database import FearGreedIndex
+from core.http_client import http_client
 from typing import Optional, Dict
 import time
 
@@ -38,7 +39,7 @@ class SentimentService:
             
             for api_url in api_urls:
                 try:
-                    api_response = requests.get(api_url, headers=headers, timeout=10)
+                    api_response = http_client.get(api_url, headers=headers)
                     if api_response.status_code == 200:
                         api_data = api_response.json()
                         print(f"CNN API 응답 받음: {api_url}")
@@ -103,7 +104,7 @@ class SentimentService:
             if not value:
                 try:
                     url = "https://edition.cnn.com/markets/fear-and-greed"
-                    response = requests.get(url, headers=headers, timeout=15)
+                    response = http_client.get(url, headers=headers)
                     response.raise_for_status()
                     
                     page_text = response.text
@@ -246,7 +247,7 @@ class SentimentService:
             print("[WARNING] CNN 스크래핑 실패. Alternative.me API (Bitcoin FGI) 사용 중...")
             # Alternative.me의 무료 Fear & Greed Index API
             url = "https://api.alternative.me/fng/?limit=1"
-            response = requests.get(url, timeout=10)
+            response = http_client.get(url)
             
             if response.status_code == 200:
                 data = response.json()
@@ -538,7 +539,7 @@ class SentimentService:
             try:
                 print(f"[INFO] FGI 히스토리 데이터 부족 ({len(result)}개), Alternative.me API로 보완 시도...")
                 url = f"https://api.alternative.me/fng/?limit={min(days, 365)}"
-                response = requests.get(url, timeout=10)
+                response = http_client.get(url)
                 if response.status_code == 200:
                     data = response.json()
                     if "data" in data and len(data["data"]) > 0:
@@ -1,12 +1,12 @@
 """
 개선된 CNN Fear & Greed Index 스크래핑 로직
 """
-import requests
 from bs4 import BeautifulSoup
 import re
 import json
 from datetime import datetime
 from typing import Optional, Dict
+from core.http_client import http_client
 
 def fetch_cnn_fear_greed_index_improved() -> Optional[Dict]:
     """개선된 CNN Fear & Greed Index 스크래핑"""
@@ -18,7 +18,7 @@ def fetch_cnn_fear_greed_index_improved() -> Optional[Dict]:
             'Accept-Language': 'en-US,en;q=0.9',
         }
         
-        response = requests.get(url, headers=headers, timeout=15)
+        response = http_client.get(url, headers=headers)
         response.raise_for_status()
         
         page_text = response.text
@@ -36,7 +36,7 @@ def fetch_cnn_fear_greed_index_improved() -> Optional[Dict]:
         
         for api_url in api_urls:
             try:
-                api_response = requests.get(api_url, headers=headers, timeout=10)
+                api_response = http_client.get(api_url, headers=headers)
                 if api_response.status_code == 200:
                     api_data = api_response.json()
                     
@@ -5,6 +5,7 @@ from typing import Dict, Optional
 from services.yahoo_service import YahooService
 from services.indicator_service import IndicatorService
 from services.fgi_service import FGIService
+from services.streaming_indicators import StreamingIndicatorService
 from models.schemas import SignalResponse, MarketStatusResponse
 
 
@@ -22,26 +23,17 @@ class SignalService:
             MarketStatusResponse: 시장 상태
         """
         try:
-            # RSI 데이터 가져오기
-            rsi_data = IndicatorService.get_rsi(symbol)
-            if not rsi_data or len(rsi_data) == 0:
+            # 최신 RSI / 200MA는 증분 지표 스트림에서 가져옴 (새 봉만 반영, 전체 시리즈 재계산 없음)
+            latest = StreamingIndicatorService.get_latest(symbol)
+            latest_rsi = latest.get("rsi14")
+            ma200 = latest.get("sma200")
+            if latest_rsi is None or ma200 is None:
                 return MarketStatusResponse(
                     status="중립",
                     description="데이터 부족"
                 )
             
-            latest_rsi = rsi_data[-1]["rsi"]
-            
-            # MA 데이터 가져오기
-            ma_data = IndicatorService.get_moving_average(symbol, days=200)
-            if not ma_data or len(ma_data) == 0:
-                return MarketStatusResponse(
-                    status="중립",
-                    description="데이터 부족"
-                )
-            
-            current_price = ma_data[-1]["price"]
-            ma200 = ma_data[-1]["ma200"]
+            current_price = latest["close"]
             
             # FGI 가져오기
             fgi = FGIService.get_current_fgi()
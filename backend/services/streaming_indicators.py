@@ -0,0 +1,595 @@
+"""
+증분(스트리밍) 지표 계산기 (새 봉마다 update(bar)로 O(1) 갱신, undo()로 마지막 갱신 1회 취소)
+"""
+import math
+import threading
+from collections import OrderedDict, deque
+from itertools import islice
+from typing import Any, Deque, Dict, List, NamedTuple, Optional, Tuple
+import pandas as pd
+from core.config import settings
+
+
+class Bar(NamedTuple):
+    """일봉 1개 (update(bar)의 입력, 같은 속성을 가진 namedtuple이면 모두 사용 가능)"""
+    date: Any
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+
+def _is_missing(value: Optional[float]) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+_EMPTY = object()  # 길이 제한 deque에서 밀려난 값이 없음
+
+
+def _append_bounded(values: deque, value: Any) -> Any:
+    """maxlen deque에 추가하고 밀려난 값 반환 (없으면 _EMPTY)"""
+    dropped = values[0] if len(values) == values.maxlen else _EMPTY
+    values.append(value)
+    return dropped
+
+
+def _undo_bounded(values: deque, dropped: Any) -> None:
+    """_append_bounded 취소"""
+    values.pop()
+    if dropped is not _EMPTY:
+        values.appendleft(dropped)
+
+
+class _RollingWindow:
+    """최근 period개 값의 합/제곱합 (값 추가와 마지막 추가 취소 모두 O(1))"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self._values: Deque[float] = deque()
+        self.total = 0.0
+        self.total_sq = 0.0
+        self._undo: Optional[Tuple[Optional[float], float, float]] = None  # (밀려난 값, 이전 합, 이전 제곱합)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def push(self, value: float) -> None:
+        old = None
+        prev_total, prev_total_sq = self.total, self.total_sq
+        self._values.append(value)
+        self.total += value
+        self.total_sq += value * value
+        if len(self._values) > self.period:
+            old = self._values.popleft()
+            self.total -= old
+            self.total_sq -= old * old
+        self._undo = (old, prev_total, prev_total_sq)
+
+    def undo(self) -> None:
+        """마지막 push 취소 (합계는 저장한 값으로 되돌려 오차 누적 없음)"""
+        old, self.total, self.total_sq = self._undo
+        self._values.pop()
+        if old is not None:
+            self._values.appendleft(old)
+
+    def full(self) -> bool:
+        return len(self._values) == self.period
+
+    def mean(self) -> float:
+        return self.total / len(self._values)
+
+    def std(self) -> Optional[float]:
+        """표본 표준편차 (ddof=1)"""
+        n = len(self._values)
+        if n < 2:
+            return None
+        variance = (self.total_sq - self.total * self.total / n) / (n - 1)
+        return math.sqrt(max(variance, 0.0))
+
+
+class _MonotonicWindow:
+    """최근 period개 값의 최댓값(또는 최솟값) (분할 상환 O(1))"""
+
+    def __init__(self, period: int, is_max: bool):
+        self.period = period
+        self.is_max = is_max
+        self._items: Deque[Tuple[int, float]] = deque()
+        self._index = 0
+        self._undo: Optional[Tuple[List[Tuple[int, float]], Optional[Tuple[int, float]]]] = None
+
+    def push(self, value: float) -> float:
+        popped = []  # 새 값에 밀려 오른쪽에서 제거된 항목 (취소 시 복원)
+        if self.is_max:
+            while self._items and self._items[-1][1] <= value:
+                popped.append(self._items.pop())
+        else:
+            while self._items and self._items[-1][1] >= value:
+                popped.append(self._items.pop())
+        self._items.append((self._index, value))
+        expired = self._items.popleft() if self._items[0][0] <= self._index - self.period else None
+        self._undo = (popped, expired)
+        self._index += 1
+        return self._items[0][1]
+
+    def undo(self) -> None:
+        """마지막 push 취소 (제거했던 항목만 되돌리므로 분할 상환 O(1))"""
+        popped, expired = self._undo
+        self._index -= 1
+        if expired is not None:
+            self._items.appendleft(expired)
+        self._items.pop()
+        self._items.extend(reversed(popped))
+
+
+class StreamingSMA:
+    """종가 단순 이동평균 (FeatureEngine "sma"와 같이 초반 구간은 있는 만큼 평균)"""
+
+    def __init__(self, period: int):
+        self._window = _RollingWindow(period)
+
+    def update(self, bar) -> float:
+        self._window.push(bar.close)
+        return self._window.mean()
+
+    def undo(self) -> None:
+        self._window.undo()
+
+
+class StreamingEMA:
+    """종가 지수 이동평균 (ewm(span, adjust=False)와 같은 점화식)"""
+
+    def __init__(self, span: int):
+        self.alpha = 2.0 / (span + 1)
+        self.value: Optional[float] = None
+        self._prev: Optional[float] = None
+
+    def push(self, value: float) -> float:
+        self._prev = self.value
+        if self.value is None:
+            self.value = value
+        else:
+            self.value = (1 - self.alpha) * self.value + self.alpha * value
+        return self.value
+
+    def update(self, bar) -> float:
+        return self.push(bar.close)
+
+    def undo(self) -> None:
+        self.value = self._prev
+
+
+class StreamingRSI:
+    """RSI (최근 period개 변화량의 단순 평균, FeatureEngine "rsi"/get_rsi와 같음)
+
+    초반 구간은 있는 만큼 평균하며 (첫 봉은 변화량 0), 하락이 없으면 50입니다.
+    """
+
+    def __init__(self, period: int = 14):
+        self._gain = _RollingWindow(period)
+        self._loss = _RollingWindow(period)
+        self._down_days = _RollingWindow(period)  # 하락일 수 (합계 오차 없이 '하락 없음' 판단)
+        self._prev_close: Optional[float] = None
+        self._undo_close: Optional[float] = None
+
+    def update(self, bar) -> float:
+        change = 0.0 if self._prev_close is None else bar.close - self._prev_close
+        self._undo_close, self._prev_close = self._prev_close, bar.close
+        self._gain.push(max(change, 0.0))
+        self._loss.push(max(-change, 0.0))
+        self._down_days.push(1.0 if change < 0 else 0.0)
+        if self._down_days.total == 0:
+            return 50.0
+        return 100 - (100 / (1 + self._gain.mean() / self._loss.mean()))
+
+    def undo(self) -> None:
+        self._prev_close = self._undo_close
+        for window in (self._gain, self._loss, self._down_days):
+            window.undo()
+
+
+class StreamingWilderRSI:
+    """Wilder RSI (첫 period개 변화량의 단순 평균으로 시작해 Wilder 방식으로 평활)
+
+    period개 변화량이 쌓이기 전에는 None을 반환합니다.
+    """
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._prev_close: Optional[float] = None
+        self._count = 0
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+        self._undo_state: Optional[Tuple] = None
+
+    def undo(self) -> None:
+        self._prev_close, self._count, self._avg_gain, self._avg_loss = self._undo_state
+
+    def update(self, bar) -> Optional[float]:
+        self._undo_state = (self._prev_close, self._count, self._avg_gain, self._avg_loss)
+        close = bar.close
+        prev, self._prev_close = self._prev_close, close
+        if prev is None:
+            return None
+
+        change = close - prev
+        gain, loss = max(change, 0.0), max(-change, 0.0)
+        self._count += 1
+        if self._count <= self.period:
+            self._avg_gain += gain / self.period
+            self._avg_loss += loss / self.period
+            if self._count < self.period:
+                return None
+        else:
+            self._avg_gain = (self._avg_gain * (self.period - 1) + gain) / self.period
+            self._avg_loss = (self._avg_loss * (self.period - 1) + loss) / self.period
+
+        if self._avg_loss == 0:
+            return 100.0 if self._avg_gain > 0 else 50.0
+        rs = self._avg_gain / self._avg_loss
+        return 100 - (100 / (1 + rs))
+
+
+class StreamingMACD:
+    """MACD (fast/slow EMA 차이, signal EMA, histogram)"""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self._fast = StreamingEMA(fast)
+        self._slow = StreamingEMA(slow)
+        self._signal = StreamingEMA(signal)
+
+    def update(self, bar) -> Dict[str, float]:
+        macd = self._fast.push(bar.close) - self._slow.push(bar.close)
+        signal = self._signal.push(macd)
+        return {"macd": macd, "signal": signal, "histogram": macd - signal}
+
+    def undo(self) -> None:
+        for ema in (self._fast, self._slow, self._signal):
+            ema.undo()
+
+
+class StreamingStochastic:
+    """Stochastic %K/%D (FeatureEngine "stoch_k"/"stoch_d"와 같이 초반 구간은 있는 만큼 사용)"""
+
+    def __init__(self, k_period: int = 14, d_period: int = 3):
+        self._high = _MonotonicWindow(k_period, is_max=True)
+        self._low = _MonotonicWindow(k_period, is_max=False)
+        self._k_values: Deque[Optional[float]] = deque(maxlen=d_period)
+        self._dropped_k: Any = _EMPTY
+
+    def undo(self) -> None:
+        self._high.undo()
+        self._low.undo()
+        _undo_bounded(self._k_values, self._dropped_k)
+
+    def update(self, bar) -> Dict[str, Optional[float]]:
+        high_max = self._high.push(bar.high)
+        low_min = self._low.push(bar.low)
+        spread = high_max - low_min
+        k = 100 * (bar.close - low_min) / spread if spread != 0 else None
+        self._dropped_k = _append_bounded(self._k_values, k)
+        valid = [v for v in self._k_values if v is not None]
+        d = sum(valid) / len(valid) if valid else None
+        return {"%K": k, "%D": d}
+
+
+class StreamingATR:
+    """ATR (True Range의 period일 단순 평균, FeatureEngine "atr"와 같음)"""
+
+    def __init__(self, period: int = 14):
+        self._window = _RollingWindow(period)
+        self._prev_close: Optional[float] = None
+        self._undo_close: Optional[float] = None
+
+    @staticmethod
+    def true_range(bar, prev_close: Optional[float]) -> float:
+        if prev_close is None:
+            return bar.high - bar.low
+        return max(bar.high - bar.low, abs(bar.high - prev_close), abs(bar.low - prev_close))
+
+    def update(self, bar) -> float:
+        self._window.push(self.true_range(bar, self._prev_close))
+        self._undo_close, self._prev_close = self._prev_close, bar.close
+        return self._window.mean()
+
+    def undo(self) -> None:
+        self._window.undo()
+        self._prev_close = self._undo_close
+
+
+class StreamingBollinger:
+    """볼린저밴드 (period일 SMA ± std_dev 표본 표준편차, period개가 쌓이기 전에는 None)"""
+
+    def __init__(self, period: int = 20, std_dev: float = 2):
+        self.std_dev = std_dev
+        self._window = _RollingWindow(period)
+
+    def update(self, bar) -> Optional[Dict[str, float]]:
+        self._window.push(bar.close)
+        if not self._window.full():
+            return None
+        middle = self._window.mean()
+        std = self._window.std() or 0.0
+        upper, lower = middle + std * self.std_dev, middle - std * self.std_dev
+        return {
+            "upper": upper,
+            "middle": middle,
+            "lower": lower,
+            "width": (upper - lower) / middle * 100 if middle != 0 else None,
+        }
+
+    def undo(self) -> None:
+        self._window.undo()
+
+
+class StreamingOBV:
+    """OBV (종가 상승일 거래량 +, 하락일 -, 첫 봉은 0)"""
+
+    def __init__(self):
+        self.value = 0.0
+        self._prev_close: Optional[float] = None
+        self._undo_state: Tuple[float, Optional[float]] = (0.0, None)
+
+    def undo(self) -> None:
+        self.value, self._prev_close = self._undo_state
+
+    def update(self, bar) -> float:
+        self._undo_state = (self.value, self._prev_close)
+        volume = 0.0 if _is_missing(bar.volume) else bar.volume
+        if self._prev_close is not None:
+            if bar.close > self._prev_close:
+                self.value += volume
+            elif bar.close < self._prev_close:
+                self.value -= volume
+        self._prev_close = bar.close
+        return self.value
+
+
+class StreamingADX:
+    """ADX와 DI+/DI- (FeatureEngine "adx"와 같이 TR/DM/DX 모두 period일 단순 평균)
+
+    평균에 필요한 값이 period개 쌓이기 전에는 None을 반환합니다.
+    """
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._tr = _RollingWindow(period)
+        self._dm_plus = _RollingWindow(period)
+        self._dm_minus = _RollingWindow(period)
+        self._dx: Deque[Optional[float]] = deque(maxlen=period)
+        self._prev: Optional[Tuple[float, float, float]] = None  # (high, low, close)
+        self._undo_state: Tuple[Optional[Tuple[float, float, float]], Any] = (None, _EMPTY)
+
+    def undo(self) -> None:
+        self._prev, dropped = self._undo_state
+        for window in (self._tr, self._dm_plus, self._dm_minus):
+            window.undo()
+        _undo_bounded(self._dx, dropped)
+
+    def update(self, bar) -> Optional[Dict[str, float]]:
+        prev_state = self._prev
+        if self._prev is None:
+            tr, dm_plus, dm_minus = bar.high - bar.low, 0.0, 0.0
+        else:
+            prev_high, prev_low, prev_close = self._prev
+            tr = StreamingATR.true_range(bar, prev_close)
+            up, down = bar.high - prev_high, prev_low - bar.low
+            dm_plus = max(up, 0.0) if up > down else 0.0
+            dm_minus = max(down, 0.0) if down > up else 0.0
+        self._prev = (bar.high, bar.low, bar.close)
+        self._tr.push(tr)
+        self._dm_plus.push(dm_plus)
+        self._dm_minus.push(dm_minus)
+
+        di_plus = di_minus = dx = None
+        if self._tr.full():
+            atr = self._tr.mean()
+            if atr != 0:
+                di_plus = 100 * self._dm_plus.mean() / atr
+                di_minus = 100 * self._dm_minus.mean() / atr
+                if di_plus + di_minus != 0:
+                    dx = 100 * abs(di_plus - di_minus) / (di_plus + di_minus)
+        self._undo_state = (prev_state, _append_bounded(self._dx, dx))
+        if len(self._dx) < self.period or any(v is None for v in self._dx):
+            return None
+        return {"adx": sum(self._dx) / self.period, "di_plus": di_plus, "di_minus": di_minus}
+
+
+class IndicatorStream:
+    """심볼 1개의 증분 지표 상태와 최근 결과 시리즈
+
+    봉을 날짜 순서대로 update()하면 각 계산기가 O(1)로 갱신되고 결과가 시리즈 끝에 추가됩니다.
+    마지막 봉과 같은 날짜의 봉이 다시 들어오면 (장중 갱신) 계산기마다 마지막 갱신을
+    undo()로 취소한 뒤 새 봉으로 교체합니다. 시리즈는 최근 max_bars개만 유지합니다.
+    """
+
+    def __init__(self, calculators: Dict[str, Any], max_bars: Optional[int] = None):
+        max_bars = max_bars or settings.streaming_max_bars
+        self._calculators = calculators
+        self.dates: Deque[Any] = deque(maxlen=max_bars)
+        self.closes: Deque[float] = deque(maxlen=max_bars)
+        self.values: Dict[str, Deque[Any]] = {name: deque(maxlen=max_bars) for name in calculators}
+        self._can_rollback = False  # 마지막 봉을 취소할 수 있는지 (계산기 undo는 1회만 가능)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @property
+    def last_date(self) -> Optional[Any]:
+        return self.dates[-1] if self.dates else None
+
+    def update(self, bar) -> Dict[str, Any]:
+        """봉 1개 반영 (같은 날짜면 마지막 봉 교체)
+
+        Returns:
+            지표 이름 → 이번 봉의 값
+        """
+        if self.dates and bar.date == self.dates[-1]:
+            self._rollback()
+        elif self.dates and bar.date < self.dates[-1]:
+            raise ValueError(f"이전 날짜의 봉은 반영할 수 없습니다: {bar.date} < {self.dates[-1]}")
+        return self._apply(bar)
+
+    def extend(self, bars: List[Any]) -> None:
+        """여러 봉을 순서대로 반영"""
+        for bar in bars:
+            self.update(bar)
+
+    def latest(self) -> Dict[str, Any]:
+        """마지막 봉의 지표 값"""
+        if not self.dates:
+            return {}
+        result = {"date": self.dates[-1], "close": self.closes[-1]}
+        result.update({name: series[-1] for name, series in self.values.items()})
+        return result
+
+    def _apply(self, bar) -> Dict[str, Any]:
+        self.dates.append(bar.date)
+        self.closes.append(bar.close)
+        result = {}
+        for name, calculator in self._calculators.items():
+            value = calculator.update(bar)
+            self.values[name].append(value)
+            result[name] = value
+        self._can_rollback = True
+        return result
+
+    def _rollback(self) -> None:
+        """마지막 봉 적용 전 상태로 되돌림"""
+        if not self._can_rollback:
+            raise ValueError("마지막 봉을 교체할 수 없습니다 (이미 취소됨)")
+        for calculator in self._calculators.values():
+            calculator.undo()
+        self._can_rollback = False
+        self.dates.pop()
+        self.closes.pop()
+        for series in self.values.values():
+            series.pop()
+
+
+def default_calculators() -> Dict[str, Any]:
+    """기본 증분 지표 세트"""
+    return {
+        "sma20": StreamingSMA(20),
+        "sma50": StreamingSMA(50),
+        "sma200": StreamingSMA(200),
+        "ema12": StreamingEMA(12),
+        "ema26": StreamingEMA(26),
+        "rsi14": StreamingRSI(14),
+        "rsi_wilder14": StreamingWilderRSI(14),
+        "macd": StreamingMACD(12, 26, 9),
+        "stochastic": StreamingStochastic(14, 3),
+        "atr14": StreamingATR(14),
+        "bollinger": StreamingBollinger(20, 2),
+        "obv": StreamingOBV(),
+        "adx14": StreamingADX(14),
+    }
+
+
+class StreamingIndicatorService:
+    """심볼별 증분 지표 스트림 관리 (프로세스 메모리에 유지)
+
+    처음 요청된 심볼만 히스토리 전체를 한 번 재생해 상태를 만들고,
+    이후에는 새 봉(또는 장중에 바뀐 마지막 봉)만 반영합니다.
+    스트림은 최근 사용 순으로 settings.streaming_max_symbols개까지 유지합니다.
+    """
+
+    _streams: "OrderedDict[str, IndicatorStream]" = OrderedDict()
+    _lock = threading.RLock()  # sync를 감싸 읽기와 함께 수행할 수 있도록 재진입 허용
+
+    @staticmethod
+    def _bars(df: pd.DataFrame) -> List[Bar]:
+        columns = [df["date"]] + [df[name] for name in ("open", "high", "low", "close", "volume")]
+        return [Bar(*row) for row in zip(*columns)]
+
+    @staticmethod
+    def _is_continuation(stream: IndicatorStream, df: pd.DataFrame) -> bool:
+        """df가 스트림의 확정된 봉을 그대로 포함하는지 (과거 봉이 수정됐으면 다시 만들어야 함)"""
+        if len(stream) < 2:
+            return False
+        committed_date, committed_close = stream.dates[-2], stream.closes[-2]
+        pos = int(df["date"].searchsorted(committed_date))
+        if pos >= len(df) or df["date"].iloc[pos] != committed_date:
+            return False
+        return df["close"].iloc[pos] == committed_close
+
+    @staticmethod
+    def sync(symbol: str, df: pd.DataFrame, create: bool = True) -> Optional[IndicatorStream]:
+        """히스토리 df의 새 봉을 심볼 스트림에 반영
+
+        Args:
+            symbol: 심볼
+            df: date 오름차순 히스토리
+            create: 스트림이 없으면 df 전체를 재생해 새로 만들지 여부
+        """
+        symbol = symbol.upper()
+        if df is None or df.empty:
+            return StreamingIndicatorService._streams.get(symbol)
+
+        streams = StreamingIndicatorService._streams
+        with StreamingIndicatorService._lock:
+            stream = streams.get(symbol)
+            if stream is not None and StreamingIndicatorService._is_continuation(stream, df):
+                # 확정된 마지막 봉 이후만 반영 (마지막 봉은 장중 값일 수 있어 다시 반영)
+                new_rows = df[df["date"] >= stream.dates[-1]]
+                stream.extend(StreamingIndicatorService._bars(new_rows))
+                streams.move_to_end(symbol)
+                return stream
+            if stream is None and not create:
+                return None
+
+            stream = IndicatorStream(default_calculators())
+            stream.extend(StreamingIndicatorService._bars(df))
+            streams[symbol] = stream
+            streams.move_to_end(symbol)
+            while len(streams) > settings.streaming_max_symbols:
+                streams.popitem(last=False)
+            print(f"[INFO] {symbol} 증분 지표 스트림 생성: {len(stream)}개 봉")
+            return stream
+
+    @staticmethod
+    def get_latest(symbol: str, years: int = 3) -> Dict[str, Any]:
+        """심볼의 최신 지표 값 (히스토리 캐시의 새 봉만 반영)"""
+        from services.yahoo_service import YahooService
+
+        symbol = symbol.upper()
+        df = YahooService.get_history(symbol, years)
+        with StreamingIndicatorService._lock:
+            stream = StreamingIndicatorService.sync(symbol, df)
+            return stream.latest() if stream is not None else {}
+
+    @staticmethod
+    def get_series(symbol: str, name: str) -> List[Any]:
+        """스트림에 누적된 지표 시리즈 (name이 "date"/"close"면 봉 날짜/종가, 없으면 빈 리스트)"""
+        with StreamingIndicatorService._lock:
+            stream = StreamingIndicatorService._streams.get(symbol.upper())
+            if stream is None:
+                return []
+            if name == "date":
+                return list(stream.dates)
+            if name == "close":
+                return list(stream.closes)
+            return list(stream.values.get(name, []))
+
+    @staticmethod
+    def get_latest_series(symbol: str, name: str, limit: int, years: int = 3) -> List[Tuple[Any, Any]]:
+        """최신 봉까지 반영한 지표의 최근 limit개 (date, value) 목록
+
+        동기화와 읽기를 lock 안에서 한 번에 수행하므로 동시에 봉이 추가/교체되거나
+        스트림이 밀려나도 날짜와 값이 어긋나지 않습니다 (지표가 없으면 빈 리스트).
+        """
+        from services.yahoo_service import YahooService
+
+        symbol = symbol.upper()
+        df = YahooService.get_history(symbol, years)
+        with StreamingIndicatorService._lock:
+            stream = StreamingIndicatorService.sync(symbol, df)
+            if stream is None or name not in stream.values:
+                return []
+            start = max(0, len(stream) - limit)
+            return list(zip(islice(stream.dates, start, None), islice(stream.values[name], start, None)))
+
+    @staticmethod
+    def drop(symbol: str) -> None:
+        with StreamingIndicatorService._lock:
+            StreamingIndicatorService._streams.pop(symbol.upper(), None)
@@ -2,13 +2,18 @@
 Yahoo Finance 데이터 서비스 (yfinance 기반, retry 및 fallback 로직 포함)
 """
 import yfinance as yf
+import numpy as np
 import pandas as pd
-import requests
-import time
 from typing import Optional, Dict, List
 from datetime import datetime, timedelta
 import traceback
-from core.cache import cache
+from core.cache import cache, is_symbol_missing, mark_symbol_missing, symbol_tag
+from core.config import settings
+from core.serializer import Serializer, Payload, RECORDS
+from core.retry import Deadline, CircuitOpenError, call_with_retry, get_breaker
+from core.http_client import yahoo_http_client
+from core.singleflight import singleflight
+from services.history_store import HistoryStore
 import warnings
 
 # SSL 경고 무시
@@ -20,10 +25,16 @@ class YahooService:
     
     CACHE_TTL = 15 * 60  # 15분 캐시
     MAX_RETRIES = 3  # 최대 재시도 횟수
-    TIMEOUT = 30  # 타임아웃 (초)
+    BREAKER_HOST = "finance.yahoo.com"  # 서킷 브레이커 키
+    BATCH_SIZE = 50  # 배치 다운로드 한 번에 요청할 최대 심볼 수
+    STALE_GRACE = 30 * 60  # 만료 후 이전 값을 제공하며 백그라운드 갱신하는 시간
+    ADJUSTMENT_OVERLAP_BARS = 5  # 증분 갱신 시 다시 받아 저장 값과 비교할 확정 봉 수 (배당/분할 감지)
+    ADJUSTMENT_TOLERANCE = 1e-6  # 다시 받은 종가와 저장 종가의 허용 상대 오차
     
     # Fallback 기간 목록 (긴 기간부터 짧은 기간 순서)
     FALLBACK_PERIODS = {
+        5: ["5y", "4y", "3y", "2y", "1y", "6mo", "3mo", "1mo"],
+        4: ["4y", "3y", "2y", "1y", "6mo", "3mo", "1mo"],
         3: ["3y", "2y", "1y", "6mo", "3mo", "1mo"],
         2: ["2y", "1y", "6mo", "3mo", "1mo"],
         1: ["1y", "6mo", "3mo", "1mo", "5d", "1d"]
@@ -40,118 +51,413 @@ class YahooService:
     
     @staticmethod
     def _create_ticker(symbol: str):
-        """Ticker 객체 생성 (DNS 문제 대비)"""
+        """Ticker 객체 생성 (공유 커넥션 풀 사용)"""
         symbol = symbol.upper()
         try:
-            # requests.Session을 사용하여 DNS 문제 대비
-            session = requests.Session()
-            session.verify = False  # SSL 검증 비활성화 (필요시)
-            
-            # yfinance에 session 전달
-            ticker = yf.Ticker(symbol, session=session)
+            # 호출마다 Session을 만들지 않고 keep-alive 풀을 공유 (SSL 검증 비활성화)
+            ticker = yf.Ticker(symbol, session=yahoo_http_client.session)
             return ticker
         except Exception as e:
             print(f"[WARNING] Session 생성 실패, 기본 Ticker 사용: {e}")
             return yf.Ticker(symbol)
     
     @staticmethod
-    def _fetch_history_with_retry(ticker, period: str, max_retries: int = MAX_RETRIES) -> Optional[pd.DataFrame]:
-        """히스토리 데이터 가져오기 (retry 로직 포함)"""
-        last_error = None
+    def _request_timeout(deadline: Optional[Deadline] = None) -> float:
+        """yfinance 요청 타임아웃 (초): 설정의 연결 + 응답 타임아웃, 남은 시간 예산을 넘지 않음
+
+        yfinance는 타임아웃을 숫자 1개로 받으므로 (connect, read) 설정값의 합을 사용합니다.
+        """
+        timeout = settings.http_connect_timeout + settings.http_read_timeout
+        if deadline is not None:
+            timeout = min(timeout, deadline.remaining())
+        return max(1.0, timeout)
+
+    @staticmethod
+    def _fetch_history_with_retry(ticker, period: Optional[str] = None, max_retries: int = MAX_RETRIES,
+                                  start: Optional[str] = None, end: Optional[str] = None,
+                                  deadline: Optional[Deadline] = None) -> Optional[pd.DataFrame]:
+        """히스토리 데이터 가져오기 (지터 지수 백오프, 시간 예산, 서킷 브레이커)
         
-        for attempt in range(max_retries):
-            try:
-                print(f"[INFO] yfinance 호출 시도 {attempt + 1}/{max_retries}: period={period}")
-                hist = ticker.history(period=period, timeout=YahooService.TIMEOUT)
-                
-                if hist is not None and not hist.empty:
-                    print(f"[INFO] yfinance 데이터 수집 성공: {len(hist)}개 레코드")
-                    return hist
-                else:
-                    print(f"[WARNING] yfinance 빈 DataFrame 반환: period={period}")
-                    if attempt < max_retries - 1:
-                        wait_time = (attempt + 1) * 2
-                        print(f"[INFO] {wait_time}초 후 재시도...")
-                        time.sleep(wait_time)
-                        continue
-                    else:
-                        return None
-                        
-            except Exception as e:
-                last_error = e
-                print(f"[ERROR] yfinance 호출 실패 (시도 {attempt + 1}/{max_retries}): {e}")
-                if attempt < max_retries - 1:
-                    wait_time = (attempt + 1) * 2
-                    print(f"[INFO] {wait_time}초 후 재시도...")
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    traceback.print_exc()
+        start 지정 시 해당 날짜 이후만 (end 지정 시 end 전날까지) 가져옵니다.
+        브레이커가 열려 있거나 예산이 소진되면 대기하지 않고 None을 반환합니다.
+        호출은 성공했지만 데이터가 없으면 빈 DataFrame을 반환합니다 (네거티브 캐시 판단용).
+        """
+        range_kwargs = {"start": start} if start else {"period": period}
+        if start and end:
+            range_kwargs["end"] = end
+        deadline = deadline or Deadline(settings.retry_time_budget)
         
-        if last_error:
-            print(f"[ERROR] yfinance 최종 실패: {last_error}")
-        return None
+        def fetch():
+            print(f"[INFO] yfinance 호출: {range_kwargs}")
+            return ticker.history(timeout=YahooService._request_timeout(deadline), **range_kwargs)
+        
+        try:
+            hist = call_with_retry(
+                fetch,
+                YahooService.BREAKER_HOST,
+                deadline=deadline,
+                max_attempts=max_retries,
+                # yfinance는 연결 오류를 삼키고 빈 DataFrame을 반환하므로 장애로 집계
+                is_failure=lambda h: h is None or h.empty,
+            )
+        except CircuitOpenError as e:
+            print(f"[WARNING] yfinance 호출 생략: {e}")
+            return None
+        except Exception as e:
+            print(f"[ERROR] yfinance 최종 실패: {e}")
+            return None
+        
+        if hist is None or hist.empty:
+            print(f"[WARNING] yfinance 빈 DataFrame 반환: {range_kwargs}")
+            return pd.DataFrame()
+        
+        print(f"[INFO] yfinance 데이터 수집 성공: {len(hist)}개 레코드")
+        return hist
+    
+    @staticmethod
+    def _build_history_frame(hist: pd.DataFrame) -> pd.DataFrame:
+        """yfinance 결과를 표준 히스토리 DataFrame으로 변환"""
+        df = pd.DataFrame({
+            "date": HistoryStore._normalize_dates(pd.Series(hist.index)).values,
+            "open": hist["Open"].values,
+            "high": hist["High"].values,
+            "low": hist["Low"].values,
+            "close": hist["Close"].values,
+            "volume": hist["Volume"].fillna(0).astype(int).values,
+            "adjusted_close": hist["Close"].values
+        })
+        return df.sort_values("date", ascending=True).reset_index(drop=True)
+    
+    @staticmethod
+    def _update_stored_history(symbol: str, stored: pd.DataFrame,
+                               deadline: Optional[Deadline] = None) -> pd.DataFrame:
+        """저장된 히스토리의 마지막 날짜 이후 봉만 가져와서 병합
+        
+        최근 확정 봉 몇 개를 함께 다시 받아 저장 값과 비교하고, 수정주가가 바뀌었으면
+        (배당락/분할) 저장 구간 전체를 다시 받습니다.
+        """
+        ticker = YahooService._create_ticker(symbol)
+        # 마지막 봉부터 다시 받아 장중에 저장된 미완성 봉도 교체
+        start = YahooService._overlap_start(stored)
+        hist = YahooService._fetch_history_with_retry(
+            ticker, max_retries=1, start=start.strftime("%Y-%m-%d"), deadline=deadline
+        )
+        if hist is None or hist.empty:
+            return stored
+        if YahooService._adjustment_changed(stored, hist):
+            return YahooService._rebuild_stored_history(symbol, stored, deadline)
+        return YahooService._merge_new_bars(symbol, stored, hist)
     
     @staticmethod
-    def get_history(symbol: str, years: int = 3) -> Optional[pd.DataFrame]:
-        """히스토리 데이터 가져오기 (fallback 기간 포함, 캐싱)
+    def _overlap_start(stored: pd.DataFrame) -> pd.Timestamp:
+        """증분 갱신 시작일 (마지막 봉 이전 ADJUSTMENT_OVERLAP_BARS개 확정 봉 포함)"""
+        return stored["date"].iloc[-min(len(stored), YahooService.ADJUSTMENT_OVERLAP_BARS + 1)]
+    
+    @staticmethod
+    def _adjustment_changed(stored: pd.DataFrame, hist: pd.DataFrame) -> bool:
+        """새로 받은 구간에 배당/분할이 있거나 겹치는 확정 봉의 종가가 저장 값과 다른지 확인
+        
+        yfinance 기본값(auto_adjust)은 배당/분할이 생기면 이전 봉 전체를 다시 수정하므로
+        저장된 과거 봉과 새 봉을 그대로 이으면 가격이 불연속이 됩니다.
+        """
+        last_date = stored["date"].iloc[-1]
+        dates = HistoryStore._normalize_dates(pd.Series(hist.index)).to_numpy()
+        for column in ("Dividends", "Stock Splits"):
+            if column in hist.columns:
+                actions = hist[column].fillna(0).to_numpy()
+                if (actions[dates > last_date] != 0).any():
+                    return True
+        
+        fetched = pd.Series(hist["Close"].to_numpy(dtype=float), index=dates)
+        committed = stored[stored["date"] < last_date]
+        overlap = fetched.reindex(committed["date"].to_numpy()).to_numpy()
+        saved = committed["close"].to_numpy(dtype=float)
+        mask = ~pd.isna(overlap)
+        return not np.allclose(overlap[mask], saved[mask], rtol=YahooService.ADJUSTMENT_TOLERANCE, atol=0)
+    
+    @staticmethod
+    def _rebuild_stored_history(symbol: str, stored: pd.DataFrame,
+                                deadline: Optional[Deadline] = None) -> pd.DataFrame:
+        """저장 구간 전체를 다시 받아 교체 (배당/분할로 수정주가가 바뀐 경우)
+        
+        다운로드에 실패하면 새 봉을 붙이지 않고 저장 데이터를 그대로 반환합니다 (다음 호출에서 재시도).
+        """
+        first_date = stored["date"].iloc[0]
+        print(f"[INFO] {symbol} 수정주가 변경 감지 (배당/분할), 저장 히스토리 다시 받기 (from {first_date.strftime('%Y-%m-%d')})")
+        ticker = YahooService._create_ticker(symbol)
+        hist = YahooService._fetch_history_with_retry(
+            ticker, max_retries=1, start=first_date.strftime("%Y-%m-%d"), deadline=deadline
+        )
+        if hist is None or hist.empty:
+            print(f"[WARNING] {symbol} 히스토리 다시 받기 실패, 기존 저장 데이터 유지")
+            return stored
+        
+        df = YahooService._build_history_frame(hist)
+        HistoryStore.save(symbol, df, replace=True)
+        df["updated_at"] = datetime.utcnow()
+        # 메모리의 이전 수정 기준 히스토리와 합쳐지지 않도록 제거
+        cache.delete(YahooService._get_cache_key("history", symbol))
+        return df
+    
+    @staticmethod
+    def _extend_stored_history(symbol: str, stored: pd.DataFrame, years: int,
+                               deadline: Optional[Deadline] = None) -> Optional[pd.DataFrame]:
+        """저장된 히스토리의 첫 날짜 이전 구간만 가져와서 앞에 병합
+        
+        Returns:
+            요청 기간 전체를 보유한 DataFrame (이전 데이터가 없으면 저장 데이터 그대로),
+            다운로드 실패 시 None
+        """
+        first_date = stored["date"].iloc[0]
+        ticker = YahooService._create_ticker(symbol)
+        hist = YahooService._fetch_history_with_retry(
+            ticker, max_retries=1,
+            start=HistoryStore.window_start(years).strftime("%Y-%m-%d"),
+            end=first_date.strftime("%Y-%m-%d"),
+            deadline=deadline
+        )
+        if hist is None:
+            return None
+        if hist.empty:
+            # 저장 구간 이전 데이터 없음 (상장 이후 전체를 이미 보유)
+            return stored
+        
+        old_bars = YahooService._build_history_frame(hist)
+        old_bars = old_bars[old_bars["date"] < first_date]
+        if old_bars.empty:
+            return stored
+        HistoryStore.save(symbol, old_bars)
+        old_bars["updated_at"] = datetime.utcnow()
+        print(f"[INFO] {symbol} 히스토리 이전 구간 추가: {len(old_bars)}개 봉 (to {first_date.strftime('%Y-%m-%d')})")
+        return pd.concat([old_bars, stored], ignore_index=True)
+    
+    @staticmethod
+    def _remember_history(symbol: str, df: pd.DataFrame, years: int) -> pd.DataFrame:
+        """심볼별로 가장 긴 히스토리 1개를 읽기 전용으로 메모리에 유지 (짧은 기간 요청은 슬라이스로 응답)
+        
+        years: df가 온전히 포함하는 기간 (년)
+        
+        최근 봉이 달라졌으면 이 히스토리로 계산한 지표 캐시(symbol_tag 태그)를 함께 무효화합니다.
+        
+        Returns:
+            캐시에 저장한 읽기 전용 DataFrame
+        """
+        cache_key = YahooService._get_cache_key("history", symbol)
+        df = df.drop(columns=["updated_at"], errors="ignore").reset_index(drop=True)
+        existing = cache.peek(cache_key)
+        if YahooService._history_changed(existing, df):
+            removed = cache.invalidate_tag(symbol_tag(symbol))
+            if removed:
+                print(f"[INFO] {symbol} 히스토리 변경: 파생 지표 캐시 {removed}개 무효화")
+        if existing is not None and existing["years"] > years:
+            # 더 긴 기존 구간을 유지하고 새로 받은 구간만 교체
+            old = existing["df"]
+            df = pd.concat([old[old["date"] < df["date"].iloc[0]], df], ignore_index=True)
+            years = existing["years"]
+        df = HistoryStore.freeze(df)
+        cache.set(cache_key, {"df": df, "years": years}, 30 * 60)
+        
+        # 이미 만들어진 증분 지표 스트림에는 새 봉만 반영
+        from services.streaming_indicators import StreamingIndicatorService
+        StreamingIndicatorService.sync(symbol, df, create=False)
+        return df
+    
+    @staticmethod
+    def _freeze_cached_history(entry: Dict) -> Dict:
+        """디스크 캐시에서 올린 히스토리 항목의 배열을 다시 읽기 전용으로 (unpickle된 배열은 쓰기 가능)"""
+        return {**entry, "df": HistoryStore.freeze(entry["df"])}
+    
+    @staticmethod
+    def _history_changed(existing: Optional[Dict], df: pd.DataFrame) -> bool:
+        """캐시된 히스토리와 비교해 최근 봉(날짜/종가)이 달라졌는지 확인"""
+        if existing is None:
+            return True
+        old = existing["df"]
+        if old.empty or df.empty:
+            return old.empty != df.empty
+        return (old["date"].iloc[-1] != df["date"].iloc[-1] or
+                old["close"].iloc[-1] != df["close"].iloc[-1])
+    
+    @staticmethod
+    def revalidate_history(symbol: str) -> None:
+        """캐시된 히스토리가 만료됐으면 백그라운드 갱신 예약 (갱신 결과가 다르면 파생 지표 캐시 무효화)"""
+        symbol = symbol.upper()
+        cache_key = YahooService._get_cache_key("history", symbol)
+        entry = cache.peek(cache_key)
+        if entry is None:
+            return
+        years = entry["years"]
+        # 지표 조회마다 호출되므로 히스토리 적중 지표/LRU 순서에 반영하지 않음
+        cache.revalidate(cache_key, lambda: YahooService.get_history(symbol, years))
+    
+    @staticmethod
+    def _slice_history(symbol: str, years: int, refresher=None) -> Optional[pd.DataFrame]:
+        """메모리에 보유한 가장 긴 히스토리에서 최근 years년 구간 슬라이스 (없거나 짧으면 None)"""
+        entry = cache.get(YahooService._get_cache_key("history", symbol), refresher=refresher)
+        if entry is None or entry["years"] < years:
+            return None
+        df = HistoryStore.slice_years(entry["df"], years)
+        return df if not df.empty else None
+    
+    @staticmethod
+    def _merge_new_bars(symbol: str, stored: pd.DataFrame, hist: pd.DataFrame) -> pd.DataFrame:
+        """새로 받은 봉을 저장소에 기록하고 기존 히스토리와 병합"""
+        new_bars = YahooService._build_history_frame(hist)
+        HistoryStore.save(symbol, new_bars)
+        new_bars["updated_at"] = datetime.utcnow()
+        
+        merged = pd.concat(
+            [stored[stored["date"] < new_bars["date"].iloc[0]], new_bars],
+            ignore_index=True
+        )
+        print(f"[INFO] {symbol} 히스토리 증분 업데이트: {len(new_bars)}개 봉 (from {new_bars['date'].iloc[0].strftime('%Y-%m-%d')})")
+        return merged
+    
+    @staticmethod
+    def get_history(symbol: str, years: int = 3, deadline: Optional[Deadline] = None) -> Optional[pd.DataFrame]:
+        """히스토리 데이터 가져오기 (로컬 저장소 우선, 부족한 구간만 yfinance 호출, 캐싱)
         
         Args:
             symbol: ETF 심볼 (대소문자 구분 없음)
             years: 원하는 데이터 기간 (년)
+            deadline: 전체 시간 예산 (없으면 settings.retry_time_budget)
         
         Returns:
-            DataFrame 또는 None
+            DataFrame 또는 None. 캐시된 읽기 전용 배열을 복사 없이 공유하는 얕은 복사본이므로
+            새 컬럼 추가는 가능하지만 기존 컬럼 값을 제자리에서 수정하면 안 됩니다.
         """
         symbol = symbol.upper()  # 항상 대문자로 변환
+        # 1y/2y/3y 요청은 심볼별로 보유한 가장 긴 히스토리를 잘라서 공유
+        # 만료 직후에는 이전 값을 반환하고 백그라운드에서 갱신
+        cached = YahooService._slice_history(
+            symbol, years, refresher=lambda: YahooService.get_history(symbol, years)
+        )
+        if cached is not None:
+            return cached.copy(deep=False)
+        
+        # 최근 데이터 없음으로 확인된 심볼은 외부 호출 생략
+        if is_symbol_missing(symbol):
+            return None
+        
+        # 동시에 들어온 같은 키 요청은 한 번만 다운로드
         cache_key = YahooService._get_cache_key("history", symbol, years)
-        cached = cache.get(cache_key)
+        df = singleflight.do(cache_key, lambda: YahooService._load_history(symbol, years, deadline))
+        # 대기하던 호출자들이 같은 객체를 받으므로 얕은 복사본 반환 (데이터 복사 없음)
+        return df.copy(deep=False) if df is not None else None
+    
+    @staticmethod
+    def _load_history(symbol: str, years: int,
+                      deadline: Optional[Deadline] = None) -> Optional[pd.DataFrame]:
+        """히스토리 로드 (get_history의 캐시 미스 처리, 결과를 캐시에 저장)"""
+        # 직전에 다른 요청이 채웠을 수 있음
+        cached = YahooService._slice_history(symbol, years)
         if cached is not None:
-            return cached.copy()
+            return cached
         
-        # Fallback 기간 목록 가져오기
-        fallback_periods = YahooService.FALLBACK_PERIODS.get(years, YahooService.FALLBACK_PERIODS[3])
+        deadline = deadline or Deadline(settings.retry_time_budget)
+        
+        # 1. 로컬 저장소 확인 (부족한 앞/뒤 구간만 가져옴)
+        stored = HistoryStore.load(symbol)
+        if stored is not None and not HistoryStore.covers(stored, years):
+            extended = YahooService._extend_stored_history(symbol, stored, years, deadline)
+            covered = extended is not None
+            if covered:
+                stored = extended
+        else:
+            covered = stored is not None
+        
+        if covered:
+            if HistoryStore.needs_update(stored):
+                stored = YahooService._update_stored_history(symbol, stored, deadline)
+            frozen = YahooService._remember_history(symbol, stored, max(years, HistoryStore.coverage_years(stored)))
+            df = HistoryStore.slice_years(frozen, years)
+            if not df.empty:
+                return df
+        
+        # 2. 전체 기간 다운로드 (Fallback 기간 목록)
+        fallback_periods = YahooService.FALLBACK_PERIODS.get(years) or [f"{years}y"] + YahooService.FALLBACK_PERIODS[3]
         
         ticker = YahooService._create_ticker(symbol)
+        # 심볼 존재 여부 확인은 처음 빈 응답을 받았을 때 한 번만
+        existence_checked = stored is not None
         
-        # 각 기간을 시도
+        # 각 기간을 시도 (시간 예산 소진 또는 브레이커가 열리면 중단)
         for period in fallback_periods:
+            if deadline.expired() or get_breaker(YahooService.BREAKER_HOST).is_open():
+                print(f"[WARNING] {symbol} 히스토리 다운로드 중단 (시간 예산 소진 또는 서킷 브레이커 열림)")
+                break
             try:
-                hist = YahooService._fetch_history_with_retry(ticker, period)
+                hist = YahooService._fetch_history_with_retry(ticker, period, deadline=deadline)
+                
+                # 빈 응답은 장애일 수도 있으므로 Yahoo가 심볼 없음을 확인해 준 경우에만 네거티브 캐시 저장
+                if hist is not None and hist.empty and not existence_checked:
+                    existence_checked = True
+                    if YahooService._confirm_missing(symbol, deadline):
+                        print(f"[WARNING] {symbol} 데이터 없음 (잘못된 심볼 또는 상장폐지), 네거티브 캐시 저장")
+                        mark_symbol_missing(symbol)
+                        return None
                 
                 if hist is not None and not hist.empty:
                     # DataFrame 정리
-                    df = pd.DataFrame({
-                        "date": hist.index,
-                        "open": hist["Open"],
-                        "high": hist["High"],
-                        "low": hist["Low"],
-                        "close": hist["Close"],
-                        "volume": hist["Volume"].fillna(0).astype(int),
-                        "adjusted_close": hist["Close"]
-                    })
-                    
-                    # date 컬럼이 datetime이 아니면 변환
-                    if not pd.api.types.is_datetime64_any_dtype(df["date"]):
-                        df["date"] = pd.to_datetime(df["date"])
-                    
-                    df = df.sort_values("date", ascending=True).reset_index(drop=True)
+                    df = YahooService._build_history_frame(hist)
                     
                     print(f"[INFO] {symbol} 히스토리 데이터 수집 성공: {len(df)}개 레코드 (period={period})")
                     
-                    # 캐시 저장 (30분)
-                    cache.set(cache_key, df, 30 * 60)
-                    return df
+                    # 로컬 저장소 및 캐시 저장 (30분)
+                    # 요청 기간을 그대로 받은 경우만 요청 기간을 보유한 것으로 기록 (상장 기간이 짧은 심볼 포함),
+                    # 짧은 fallback 기간으로 받은 경우 실제 포함 기간만 기록
+                    HistoryStore.save(symbol, df)
+                    covered_years = years if period == f"{years}y" else HistoryStore.coverage_years(df)
+                    frozen = YahooService._remember_history(symbol, df, covered_years)
+                    return HistoryStore.slice_years(frozen, years)
                     
             except Exception as e:
                 print(f"[ERROR] {symbol} period={period} 시도 실패: {e}")
                 continue
         
-        # 모든 시도 실패
+        # 다운로드 실패 시 기간이 부족하더라도 저장된 데이터 사용 (stale 데이터 제공)
+        if stored is not None and not stored.empty:
+            print(f"[WARNING] {symbol} 다운로드 실패, 로컬 저장 데이터 사용: {len(stored)}개 레코드")
+            return HistoryStore.slice_years(stored, years)
+        
+        # 모든 시도 실패 (일시 장애일 수 있으므로 네거티브 캐시에 기록하지 않음)
         print(f"[ERROR] {symbol} 히스토리 데이터 수집 실패: 모든 fallback 기간 시도 실패")
         traceback.print_exc()
         return None
     
+    @staticmethod
+    def _is_not_found_error(error: Exception) -> bool:
+        """Yahoo가 응답한 '심볼 없음' 오류인지 (404, 상장폐지 메시지)"""
+        response = getattr(error, "response", None)
+        if getattr(response, "status_code", None) == 404:
+            return True
+        message = str(error).lower()
+        return "404" in message or "not found" in message or "delisted" in message
+    
+    @staticmethod
+    def _confirm_missing(symbol: str, deadline: Optional[Deadline] = None) -> bool:
+        """Yahoo에 정상적으로 조회해 심볼이 없다는 응답을 받았는지 확인
+        
+        ticker.info가 비어 있거나 404/상장폐지 오류를 받은 경우에만 True이고,
+        연결 실패/타임아웃/브레이커 열림처럼 응답을 받지 못한 경우는 False입니다.
+        """
+        breaker = get_breaker(YahooService.BREAKER_HOST)
+        if (deadline is not None and deadline.expired()) or not breaker.allow():
+            return False
+        try:
+            info = YahooService._create_ticker(symbol).info
+        except Exception as e:
+            if YahooService._is_not_found_error(e):
+                # 404는 Yahoo가 정상 응답한 것이므로 호스트 장애로 세지 않음
+                breaker.record_success()
+                return True
+            breaker.record_failure()
+            print(f"[WARNING] {symbol} 심볼 확인 실패 (일시 장애로 판단): {e}")
+            return False
+        breaker.record_success()
+        # 잘못된 심볼은 빈 dict 또는 키 1개짜리 dict가 반환됨
+        return not info or len(info) <= 1
+    
     @staticmethod
     def get_ticker_info(symbol: str) -> Optional[Dict]:
         """티커 기본 정보 가져오기 (캐싱)"""
@@ -161,11 +467,16 @@ class YahooService:
         if cached is not None:
             return cached
         
+        if is_symbol_missing(symbol):
+            return None
+        
         try:
             ticker = YahooService._create_ticker(symbol)
             info = ticker.info
             
-            if not info or len(info) == 0:
+            # 잘못된 심볼은 빈 dict 또는 키 1개짜리 dict가 반환됨
+            if not info or len(info) <= 1:
+                mark_symbol_missing(symbol)
                 return None
             
             # 필요한 정보만 추출
@@ -190,11 +501,38 @@ class YahooService:
             traceback.print_exc()
             return None
     
+    @staticmethod
+    def _build_price_data(symbol: str, hist: pd.DataFrame) -> Dict:
+        """yfinance 결과의 최신 봉으로 가격 데이터 생성"""
+        latest = hist.iloc[-1]
+        return {
+            "symbol": symbol,
+            "date": latest.name.strftime("%Y-%m-%d") if hasattr(latest.name, 'strftime') else str(latest.name),
+            "open": float(latest["Open"]),
+            "high": float(latest["High"]),
+            "low": float(latest["Low"]),
+            "close": float(latest["Close"]),
+            "volume": int(latest["Volume"]) if pd.notna(latest["Volume"]) else 0,
+            "adjusted_close": float(latest["Close"])
+        }
+    
     @staticmethod
     def get_price_data(symbol: str, period: str = "1d") -> Optional[Dict]:
         """최신 가격 데이터 가져오기 (캐싱)"""
         symbol = symbol.upper()
         cache_key = YahooService._get_cache_key("price", symbol, period)
+        cached = cache.get(cache_key, refresher=lambda: YahooService.get_price_data(symbol, period))
+        if cached is not None:
+            return cached
+        
+        if is_symbol_missing(symbol):
+            return None
+        
+        return singleflight.do(cache_key, lambda: YahooService._fetch_price_data(symbol, period, cache_key))
+    
+    @staticmethod
+    def _fetch_price_data(symbol: str, period: str, cache_key: str) -> Optional[Dict]:
+        """최신 가격 데이터 다운로드 (get_price_data의 캐시 미스 처리)"""
         cached = cache.get(cache_key)
         if cached is not None:
             return cached
@@ -206,20 +544,7 @@ class YahooService:
             if hist is None or hist.empty:
                 return None
             
-            # 최신 데이터
-            latest = hist.iloc[-1]
-            
-            result = {
-                "symbol": symbol,
-                "date": latest.name.strftime("%Y-%m-%d") if hasattr(latest.name, 'strftime') else str(latest.name),
-                "open": float(latest["Open"]),
-                "high": float(latest["High"]),
-                "low": float(latest["Low"]),
-                "close": float(latest["Close"]),
-                "volume": int(latest["Volume"]) if pd.notna(latest["Volume"]) else 0,
-                "adjusted_close": float(latest["Close"])
-            }
-            
+            result = YahooService._build_price_data(symbol, hist)
             cache.set(cache_key, result, YahooService.CACHE_TTL)
             return result
             
@@ -229,31 +554,201 @@ class YahooService:
             return None
     
     @staticmethod
-    def get_history_list(symbol: str, years: int = 3) -> List[Dict]:
-        """히스토리 데이터를 리스트 형식으로 반환"""
+    def get_history_list(symbol: str, years: int = 3, fmt: str = RECORDS) -> Payload:
+        """히스토리 데이터를 리스트 형식으로 반환 (fmt="columnar"이면 컬럼별 리스트)"""
         symbol = symbol.upper()
         df = YahooService.get_history(symbol, years)
         if df is None or df.empty:
             return []
         
-        result = []
-        for _, row in df.iterrows():
-            result.append({
-                "symbol": symbol,
-                "date": row["date"].strftime("%Y-%m-%d") if hasattr(row["date"], 'strftime') else str(row["date"]),
-                "open": float(row["open"]),
-                "high": float(row["high"]),
-                "low": float(row["low"]),
-                "close": float(row["close"]),
-                "volume": int(row["volume"]) if pd.notna(row["volume"]) else 0
-            })
+        result = {
+            "symbol": [symbol] * len(df),
+            "date": Serializer.format_dates(df["date"]),
+            "open": Serializer.float_list(df["open"]),
+            "high": Serializer.float_list(df["high"]),
+            "low": Serializer.float_list(df["low"]),
+            "close": Serializer.float_list(df["close"]),
+            "volume": Serializer.int_list(df["volume"]),
+        }
+        return Serializer.render(result, fmt)
+    
+    @staticmethod
+    def _download_batch(symbols: List[str], period: Optional[str] = None,
+                        start: Optional[str] = None,
+                        deadline: Optional[Deadline] = None) -> Dict[str, pd.DataFrame]:
+        """여러 심볼을 yf.download 한 번으로 가져와 심볼별 DataFrame으로 분리
+        
+        Args:
+            deadline: 전체 시간 예산 (소진되면 남은 묶음은 요청하지 않음, 없으면 요청마다 기본 예산)
+        
+        Returns:
+            Dict[str, DataFrame]: 데이터가 있는 심볼만 포함 (컬럼: Open/High/Low/Close/Volume)
+        """
+        result = {}
+        range_kwargs = {"start": start} if start else {"period": period}
+        
+        for i in range(0, len(symbols), YahooService.BATCH_SIZE):
+            chunk = symbols[i:i + YahooService.BATCH_SIZE]
+            if deadline is not None and deadline.expired():
+                print(f"[WARNING] yfinance 배치 다운로드 중단 (시간 예산 소진): {len(symbols) - i}개 심볼 남음")
+                break
+            try:
+                print(f"[INFO] yfinance 배치 다운로드: {len(chunk)}개 심볼 {range_kwargs}")
+                data = call_with_retry(
+                    lambda: yf.download(
+                        chunk,
+                        group_by="ticker",
+                        auto_adjust=True,  # Ticker.history 기본값과 동일하게
+                        threads=True,
+                        progress=False,
+                        timeout=YahooService._request_timeout(deadline),
+                        session=yahoo_http_client.session,
+                        **range_kwargs
+                    ),
+                    YahooService.BREAKER_HOST,
+                    deadline=deadline,
+                    max_attempts=1,
+                    is_failure=lambda d: d is None or d.empty,
+                )
+            except CircuitOpenError as e:
+                print(f"[WARNING] yfinance 배치 다운로드 생략: {e}")
+                break
+            except Exception as e:
+                print(f"[ERROR] yfinance 배치 다운로드 실패 ({len(chunk)}개 심볼): {e}")
+                continue
+            
+            if data is None or data.empty:
+                continue
+            
+            for symbol in chunk:
+                if isinstance(data.columns, pd.MultiIndex):
+                    if symbol not in data.columns.get_level_values(0):
+                        continue
+                    hist = data[symbol]
+                else:
+                    hist = data
+                
+                hist = hist.dropna(subset=["Close"])
+                if not hist.empty:
+                    result[symbol] = hist
         
         return result
     
+    @staticmethod
+    def warm_up(symbols: List[str], years: int = 3, deadline: Optional[Deadline] = None) -> None:
+        """여러 심볼의 history/price 캐시를 배치 다운로드로 미리 채우기
+        
+        로컬 저장소가 최신인 심볼은 네트워크 없이 캐시에 올리고,
+        나머지는 증분(새 봉만) / 전체 기간 두 번의 배치 요청으로 처리합니다.
+        전체 기간 배치 결과에 없는 심볼은 Yahoo가 심볼 없음을 확인해 준 경우에만 네거티브 캐시에 기록합니다.
+        
+        Args:
+            deadline: 전체 시간 예산 (없으면 외부 요청마다 기본 예산)
+        """
+        symbols = list(dict.fromkeys(s.upper() for s in symbols))
+        stale = {}
+        missing = []
+        
+        for symbol in symbols:
+            if YahooService._slice_history(symbol, years) is not None:
+                continue
+            stored = HistoryStore.load(symbol)
+            if stored is not None and HistoryStore.covers(stored, years):
+                if HistoryStore.needs_update(stored):
+                    stale[symbol] = stored
+                else:
+                    YahooService._remember_history(symbol, stored, max(years, HistoryStore.coverage_years(stored)))
+            else:
+                missing.append(symbol)
+        
+        # 저장소에 있는 심볼: 가장 오래된 비교 시작일부터 한 번에 증분 다운로드
+        if stale:
+            start = min(YahooService._overlap_start(df) for df in stale.values())
+            batch = YahooService._download_batch(list(stale), start=start.strftime("%Y-%m-%d"), deadline=deadline)
+            for symbol, stored in stale.items():
+                if symbol in batch:
+                    if YahooService._adjustment_changed(stored, batch[symbol]):
+                        stored = YahooService._rebuild_stored_history(symbol, stored, deadline)
+                    else:
+                        stored = YahooService._merge_new_bars(symbol, stored, batch[symbol])
+                    cache.set(YahooService._get_cache_key("price", symbol, "1d"),
+                              YahooService._build_price_data(symbol, batch[symbol]), YahooService.CACHE_TTL)
+                YahooService._remember_history(symbol, stored, max(years, HistoryStore.coverage_years(stored)))
+        
+        # 저장소에 없는 심볼: 전체 기간 배치 다운로드
+        if missing:
+            batch = YahooService._download_batch(missing, period=f"{years}y", deadline=deadline)
+            for symbol, hist in batch.items():
+                df = YahooService._build_history_frame(hist)
+                HistoryStore.save(symbol, df)
+                YahooService._remember_history(symbol, df, years)
+                cache.set(YahooService._get_cache_key("price", symbol, "1d"),
+                          YahooService._build_price_data(symbol, hist), YahooService.CACHE_TTL)
+            # 배치에서 빠진 심볼은 장애일 수도 있으므로 심볼별로 확인 (브레이커가 열리거나 예산이 소진되면 건너뜀)
+            for symbol in missing:
+                if symbol not in batch and YahooService._confirm_missing(symbol, deadline):
+                    print(f"[WARNING] {symbol} 데이터 없음 (잘못된 심볼 또는 상장폐지), 네거티브 캐시 저장")
+                    mark_symbol_missing(symbol)
+        
+        print(f"[INFO] 캐시 워밍업 완료: {len(symbols)}개 심볼")
+    
+    @staticmethod
+    def get_histories(symbols: List[str], years: int = 3,
+                      deadline: Optional[Deadline] = None) -> Dict[str, pd.DataFrame]:
+        """여러 심볼의 히스토리 (캐시에 없는 심볼은 warm_up 배치 다운로드로 한 번에 채움)
+        
+        Args:
+            deadline: 전체 시간 예산 (없으면 settings.retry_time_budget)
+        
+        Returns:
+            Dict[str, DataFrame]: 데이터가 있는 심볼만 포함 (get_history와 같은 얕은 복사본)
+        """
+        symbols = list(dict.fromkeys(s.upper() for s in symbols))
+        result = {}
+        for symbol in symbols:
+            df = YahooService._slice_history(
+                symbol, years, refresher=lambda symbol=symbol: YahooService.get_history(symbol, years)
+            )
+            if df is not None:
+                result[symbol] = df.copy(deep=False)
+        
+        pending = [s for s in symbols if s not in result and not is_symbol_missing(s)]
+        if pending:
+            YahooService.warm_up(pending, years, deadline or Deadline(settings.retry_time_budget))
+            for symbol in pending:
+                df = YahooService._slice_history(symbol, years)
+                if df is not None:
+                    result[symbol] = df.copy(deep=False)
+        # 입력 순서 유지
+        return {symbol: result[symbol] for symbol in symbols if symbol in result}
+    
     @staticmethod
     def get_multiple_symbols(symbols: List[str], period: str = "1d") -> Dict[str, Optional[Dict]]:
-        """여러 심볼의 가격 데이터를 한 번에 가져오기"""
+        """여러 심볼의 가격 데이터를 한 번에 가져오기 (캐시에 없는 심볼은 배치 다운로드)"""
         result = {}
+        missing = []
         for symbol in symbols:
-            result[symbol.upper()] = YahooService.get_price_data(symbol, period)
+            symbol = symbol.upper()
+            cached = cache.get(YahooService._get_cache_key("price", symbol, period))
+            result[symbol] = cached
+            if cached is None:
+                missing.append(symbol)
+        
+        if missing:
+            batch = YahooService._download_batch(list(dict.fromkeys(missing)), period=period)
+            for symbol in missing:
+                hist = batch.get(symbol)
+                if hist is None:
+                    print(f"[WARNING] {symbol} 배치 다운로드 결과 없음")
+                    continue
+                price = YahooService._build_price_data(symbol, hist)
+                cache.set(YahooService._get_cache_key("price", symbol, period), price, YahooService.CACHE_TTL)
+                result[symbol] = price
+        
         return result
+
+
+# 히스토리/가격 캐시는 만료 후에도 grace 시간 동안 이전 값을 제공 (stale-while-revalidate)
+cache.set_stale_policy("history", YahooService.STALE_GRACE)
+cache.set_stale_policy("price", YahooService.STALE_GRACE)
+cache.set_disk_loader("history", YahooService._freeze_cached_history)
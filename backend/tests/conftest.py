@@ -0,0 +1,38 @@
+"""
+테스트 공통 설정 (임시 DB, 메모리 캐시, 대기 없는 재시도)
+"""
+import os
+import sys
+import tempfile
+
+# 앱 모듈을 import하기 전에 설정 (core.config가 환경변수를 읽음)
+_tmp_dir = tempfile.mkdtemp(prefix="etf_advisor_test_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'test.db')}"
+os.environ["CACHE_BACKEND"] = "memory"
+os.environ["CACHE_DISK_ENABLED"] = "false"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+from core import retry  # noqa: E402
+from core.cache import cache  # noqa: E402
+from core.config import settings  # noqa: E402
+from core.database import SessionLocal, ETFPrice  # noqa: E402
+from services.history_store import HistoryStore  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def clean_state(monkeypatch):
+    """테스트마다 캐시, 서킷 브레이커, 로컬 히스토리 저장소 초기화"""
+    monkeypatch.setattr(settings, "retry_base_delay", 0.0)
+    cache.clear()
+    with retry._breakers_lock:
+        retry._breakers.clear()
+    HistoryStore._ensure_table()
+    db = SessionLocal()
+    try:
+        db.query(ETFPrice).delete()
+        db.commit()
+    finally:
+        db.close()
+    yield
+    cache.clear()
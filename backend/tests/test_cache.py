@@ -0,0 +1,99 @@
+"""
+InMemoryCache 테스트 (shared 모드는 같은 SQLite 파일을 여는 캐시 2개로 워커 2개를 흉내냄)
+"""
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from core.cache import InMemoryCache
+from core.disk_cache import DiskCache
+
+
+@pytest.fixture
+def workers(tmp_path):
+    path = str(tmp_path / "shared_cache.db")
+    return InMemoryCache(disk=DiskCache(path), shared=True), InMemoryCache(disk=DiskCache(path), shared=True)
+
+
+def test_shared_cache_sees_refresh_from_other_worker(workers):
+    a, b = workers
+    a.set("history:VIG", {"version": 1}, 600)
+    assert b.get("history:VIG") == {"version": 1}
+
+    time.sleep(0.01)
+    a.set("history:VIG", {"version": 2}, 600)
+    assert b.get("history:VIG") == {"version": 2}
+
+
+def test_shared_cache_sees_tag_invalidation_from_other_worker(workers):
+    a, b = workers
+    a.set("rsi:VIG:14:3", [50.0], 3600, tags=("symbol:VIG",))
+    assert b.get("rsi:VIG:14:3") == [50.0]
+
+    a.invalidate_tag("symbol:VIG")
+    assert b.get("rsi:VIG:14:3") is None
+
+
+def test_refresh_size_keeps_ttl_and_disk_copy(workers):
+    a, _ = workers
+    value = {"columns": []}
+    a.set("features:VIG", value, 3600)
+    created_at = a._disk.get_created_at("features:VIG")
+
+    value["columns"].extend(range(1000))
+    a.refresh_size("features:VIG")
+
+    assert a._disk.get_created_at("features:VIG") == created_at
+    assert a.get_stats()["bytes_by_prefix"]["features"] > 1000
+    assert a.get("features:VIG") is value
+
+
+def test_history_promoted_from_disk_is_read_only(tmp_path):
+    from services.history_store import HistoryStore
+    from services.yahoo_service import YahooService
+
+    path = str(tmp_path / "cache.db")
+    df = HistoryStore.freeze(pd.DataFrame({"date": pd.bdate_range("2024-01-01", periods=5),
+                                           "close": np.arange(5, dtype=float)}))
+    InMemoryCache(disk=DiskCache(path), disk_prefixes={"history"}).set("history:VIG", {"df": df, "years": 1}, 600)
+
+    # 재시작 후 디스크에서 올린 값
+    restarted = InMemoryCache(disk=DiskCache(path), disk_prefixes={"history"})
+    restarted.set_disk_loader("history", YahooService._freeze_cached_history)
+    entry = restarted.get("history:VIG")
+
+    assert entry["years"] == 1
+    assert not entry["df"]["close"].to_numpy().flags.writeable
+    with pytest.raises(ValueError):
+        entry["df"]["close"].to_numpy()[0] = 1.0
+
+
+def test_revalidate_refreshes_expired_entry_without_touching_metrics():
+    c = InMemoryCache()
+    c.set_stale_policy("history", 600)
+    c.set("history:VIG", {"version": 1}, ttl=0)
+    time.sleep(0.01)
+    before = c.get_metrics()["prefixes"]["history"]
+
+    refreshed = []
+    assert c.revalidate("history:VIG", lambda: refreshed.append(c.set("history:VIG", {"version": 2}, 600)))
+    for _ in range(100):
+        if refreshed:
+            break
+        time.sleep(0.01)
+
+    after = c.get_metrics()["prefixes"]["history"]
+    assert refreshed
+    assert (after["hits"], after["misses"], after["stale_hits"]) == (before["hits"], before["misses"], before["stale_hits"])
+    assert c.peek("history:VIG") == {"version": 2}
+    assert not c.revalidate("history:VIG", lambda: None)
+
+
+def test_shared_revalidate_sees_other_worker_invalidation(workers):
+    a, b = workers
+    a.set("rsi:VIG:14:3", [50.0], 3600, tags=("symbol:VIG",))
+    assert b.get("rsi:VIG:14:3") == [50.0]
+
+    a.invalidate_tag("symbol:VIG")
+    b.revalidate("rsi:VIG:14:3", lambda: None)
+    assert b.peek("rsi:VIG:14:3") is None
@@ -0,0 +1,75 @@
+"""
+IndicatorService 캐시 테스트 (동시 캐시 미스가 피처 프레임/지표 계산 1번으로 합쳐지는지)
+"""
+import threading
+import time
+import numpy as np
+import pandas as pd
+from services import feature_engine
+from services.feature_engine import FeatureEngine
+from services.indicator_service import IndicatorService
+from services.yahoo_service import YahooService
+
+
+def make_history(days: int = 300) -> pd.DataFrame:
+    close = 100 + np.sin(np.arange(days) / 5.0) * 5
+    return pd.DataFrame({
+        "date": pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=days),
+        "open": close - 0.5,
+        "high": close + 1.0,
+        "low": close - 1.0,
+        "close": close,
+        "volume": np.full(days, 1000),
+    })
+
+
+def test_concurrent_dashboard_misses_build_one_frame_and_compute_rsi_once(monkeypatch):
+    df = make_history()
+    monkeypatch.setattr(YahooService, "get_history", staticmethod(lambda symbol, years=3, deadline=None: df))
+
+    frames = []
+    original_init = feature_engine.FeatureFrame.__init__
+
+    def counting_init(self, history):
+        frames.append(self)
+        time.sleep(0.05)  # 다른 호출이 같은 미스를 보도록 생성 구간을 늘림
+        original_init(self, history)
+
+    monkeypatch.setattr(feature_engine.FeatureFrame, "__init__", counting_init)
+
+    rsi_feature = FeatureEngine.REGISTRY["rsi"]
+    rsi_calls = []
+    original_rsi = rsi_feature.compute
+
+    def counting_rsi(frame, period):
+        rsi_calls.append(period)
+        time.sleep(0.05)
+        return original_rsi(frame, period)
+
+    monkeypatch.setattr(rsi_feature, "compute", counting_rsi)
+
+    calls = [lambda: IndicatorService.get_rsi("VIG")] * 4 + [
+        lambda: IndicatorService.get_macd("VIG"),
+        lambda: IndicatorService.get_moving_average("VIG"),
+        lambda: IndicatorService.get_stochastic("VIG"),
+    ]
+    barrier = threading.Barrier(len(calls))
+    results = [None] * len(calls)
+
+    def run(i):
+        barrier.wait()
+        results[i] = calls[i]()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(calls))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(frames) == 1
+    assert rsi_calls == [14]
+    assert all(results)
+    assert results[0] == results[1] == results[2] == results[3]
+    # 모든 지표 컬럼이 캐시된 프레임 하나에 남음
+    frame = FeatureEngine.get_frame("VIG", df)
+    assert frame.has(("rsi", 14)) and frame.has(("macd", 12, 26)) and frame.has(("sma", 200))
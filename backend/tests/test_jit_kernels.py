@@ -0,0 +1,163 @@
+"""
+경로 의존 지표 커널 테스트 (JIT/대체 구현 모두 교과서식 참조 구현과 같은 값인지)
+
+대체 구현(NumPy/pandas/파이썬 루프)은 항상 검사하고, JIT 구현은 Numba가 설치된 경우에만 검사합니다.
+"""
+import math
+import numpy as np
+import pytest
+from services import jit_kernels
+
+
+@pytest.fixture(params=["fallback", "jit"])
+def use_jit(request):
+    if request.param == "jit":
+        pytest.importorskip("numba")
+        return True
+    return False
+
+
+@pytest.fixture
+def ohlc():
+    rng = np.random.default_rng(11)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, 400)))
+    high = close * (1 + rng.uniform(0, 0.02, 400))
+    low = close * (1 - rng.uniform(0, 0.02, 400))
+    return high, low, close
+
+
+# --- 참조 구현 (정의를 그대로 옮긴 느린 루프) ---
+
+def ref_wilder_smooth(values, period, start=0):
+    out = [math.nan] * len(values)
+    first = start + period - 1
+    if first >= len(values):
+        return out
+    avg = sum(values[start:first + 1]) / period
+    out[first] = avg
+    for i in range(first + 1, len(values)):
+        avg = avg + (values[i] - avg) / period
+        out[i] = avg
+    return out
+
+
+def ref_true_range(high, low, close):
+    tr = [high[0] - low[0]]
+    for i in range(1, len(close)):
+        tr.append(max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1])))
+    return tr
+
+
+def ref_parabolic_sar(high, low, step, max_step):
+    n = len(high)
+    sar, trend = [math.nan] * n, [0.0] * n
+    rising = (high[1] + low[1]) / 2 >= (high[0] + low[0]) / 2
+    extreme = max(high[0], high[1]) if rising else min(low[0], low[1])
+    sar[1] = min(low[0], low[1]) if rising else max(high[0], high[1])
+    trend[1] = 1.0 if rising else -1.0
+    factor = step
+    for i in range(2, n):
+        value = sar[i - 1] + factor * (extreme - sar[i - 1])
+        if rising:
+            value = min(value, low[i - 1], low[i - 2])
+            if low[i] < value:
+                rising, value, extreme, factor = False, extreme, low[i], step
+            elif high[i] > extreme:
+                extreme, factor = high[i], min(factor + step, max_step)
+        else:
+            value = max(value, high[i - 1], high[i - 2])
+            if high[i] > value:
+                rising, value, extreme, factor = True, extreme, high[i], step
+            elif low[i] < extreme:
+                extreme, factor = low[i], min(factor + step, max_step)
+        sar[i], trend[i] = value, 1.0 if rising else -1.0
+    return sar, trend
+
+
+def ref_supertrend(high, low, close, period, multiplier):
+    atr = ref_wilder_smooth(ref_true_range(high, low, close), period, start=1)
+    n = len(close)
+    line, direction = [math.nan] * n, [0.0] * n
+    final_upper = final_lower = None
+    rising = True
+    for i in range(n):
+        if math.isnan(atr[i]):
+            continue
+        hl2 = (high[i] + low[i]) / 2
+        basic_upper, basic_lower = hl2 + multiplier * atr[i], hl2 - multiplier * atr[i]
+        if final_upper is None:
+            final_upper, final_lower = basic_upper, basic_lower
+            rising = close[i] >= final_lower
+        else:
+            if basic_upper < final_upper or close[i - 1] > final_upper:
+                final_upper = basic_upper
+            if basic_lower > final_lower or close[i - 1] < final_lower:
+                final_lower = basic_lower
+            if rising and close[i] < final_lower:
+                rising = False
+            elif not rising and close[i] > final_upper:
+                rising = True
+        line[i] = final_lower if rising else final_upper
+        direction[i] = 1.0 if rising else -1.0
+    return line, direction
+
+
+def ref_percentile_rank(values, window, min_periods):
+    out = []
+    for i, value in enumerate(values):
+        lo = 0 if window is None else max(0, i - window + 1)
+        seen = [v for v in values[lo:i + 1] if not math.isnan(v)]
+        if math.isnan(value) or len(seen) < min_periods:
+            out.append(math.nan)
+        else:
+            out.append(sum(v < value for v in seen) / len(seen) * 100)
+    return out
+
+
+# --- 테스트 ---
+
+@pytest.mark.parametrize("period,start", [(14, 0), (14, 1), (5, 30), (500, 0)])
+def test_wilder_smooth_matches_reference(use_jit, ohlc, period, start):
+    _, _, close = ohlc
+    result = jit_kernels.wilder_smooth(close, period, start=start, use_jit=use_jit)
+    np.testing.assert_allclose(result, ref_wilder_smooth(close.tolist(), period, start), rtol=1e-9)
+
+
+def test_parabolic_sar_matches_reference(use_jit, ohlc):
+    high, low, _ = ohlc
+    sar, trend = jit_kernels.parabolic_sar(high, low, 0.02, 0.2, use_jit=use_jit)
+    ref_sar, ref_trend = ref_parabolic_sar(high.tolist(), low.tolist(), 0.02, 0.2)
+    np.testing.assert_allclose(sar, ref_sar, rtol=1e-9)
+    np.testing.assert_array_equal(trend, ref_trend)
+    assert {1.0, -1.0} <= set(trend[1:])  # 추세 반전 경로까지 검사했는지
+
+
+def test_supertrend_matches_reference(use_jit, ohlc):
+    high, low, close = ohlc
+    line, direction = jit_kernels.supertrend(high, low, close, 10, 3.0, use_jit=use_jit)
+    ref_line, ref_direction = ref_supertrend(high.tolist(), low.tolist(), close.tolist(), 10, 3.0)
+    np.testing.assert_allclose(line, ref_line, rtol=1e-9)
+    np.testing.assert_array_equal(direction, ref_direction)
+    assert {1.0, -1.0} <= set(direction[10:])
+
+
+@pytest.mark.parametrize("window,min_periods", [(None, 1), (20, 1), (20, 10), (1, 1)])
+def test_rolling_percentile_rank_matches_brute_force(use_jit, window, min_periods):
+    rng = np.random.default_rng(3)
+    values = np.round(rng.normal(0, 1, 200), 1)  # 반올림으로 동일 값 포함
+    values[[5, 50, 51, 120]] = np.nan
+    result = jit_kernels.rolling_percentile_rank(values, window, min_periods, use_jit=use_jit)
+    np.testing.assert_allclose(result, ref_percentile_rank(values.tolist(), window, min_periods), rtol=1e-12)
+
+
+def test_jit_and_fallback_agree(ohlc):
+    pytest.importorskip("numba")
+    high, low, close = ohlc
+    for kernel, args in (
+        (jit_kernels.wilder_rsi, (close, 14)),
+        (jit_kernels.parabolic_sar, (high, low)),
+        (jit_kernels.supertrend, (high, low, close)),
+        (jit_kernels.rolling_percentile_rank, (close, 50)),
+    ):
+        jit, fallback = kernel(*args, use_jit=True), kernel(*args, use_jit=False)
+        np.testing.assert_allclose(jit, fallback, rtol=1e-9, err_msg=kernel.__name__)
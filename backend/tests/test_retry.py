@@ -0,0 +1,60 @@
+"""
+재시도 엔진 / 서킷 브레이커 / 외부 요청 타임아웃 테스트
+"""
+import pandas as pd
+import pytest
+from core.retry import CircuitOpenError, Deadline, call_with_retry, get_breaker, get_breaker_states
+
+
+def test_empty_result_counts_as_breaker_failure():
+    host = "empty.example.com"
+    threshold = get_breaker(host).failure_threshold
+    for _ in range(threshold):
+        result = call_with_retry(pd.DataFrame, host, max_attempts=1, is_failure=lambda df: df.empty)
+        assert result.empty
+
+    assert get_breaker_states()[host]["state"] == "open"
+    with pytest.raises(CircuitOpenError):
+        call_with_retry(pd.DataFrame, host, max_attempts=1, is_failure=lambda df: df.empty)
+
+
+def test_non_empty_result_closes_breaker():
+    host = "ok.example.com"
+    breaker = get_breaker(host)
+    breaker.record_failure()
+    frame = pd.DataFrame({"Close": [1.0]})
+
+    assert call_with_retry(lambda: frame, host, is_failure=lambda df: df.empty) is frame
+    assert get_breaker_states()[host] == {"state": "closed", "failures": 0}
+
+
+def test_http_client_uses_configured_timeouts(monkeypatch):
+    from core.config import settings
+    from core.http_client import HttpClient
+
+    monkeypatch.setattr(settings, "http_connect_timeout", 2.0)
+    monkeypatch.setattr(settings, "http_read_timeout", 7.0)
+    client = HttpClient()
+    seen = {}
+
+    class Response:
+        status_code = 200
+
+    def fake_get(url, timeout=None, **kwargs):
+        seen["timeout"] = timeout
+        return Response()
+
+    monkeypatch.setattr(client.session, "get", fake_get)
+    client.get("https://example.com/api")
+    assert seen["timeout"] == (2.0, 7.0)
+
+
+def test_yahoo_timeout_comes_from_settings_and_deadline(monkeypatch):
+    from core.config import settings
+    from services.yahoo_service import YahooService
+
+    monkeypatch.setattr(settings, "http_connect_timeout", 2.0)
+    monkeypatch.setattr(settings, "http_read_timeout", 7.0)
+    assert YahooService._request_timeout() == 9.0
+    assert YahooService._request_timeout(Deadline(3.0)) <= 3.0
+    assert YahooService._request_timeout(Deadline(0.0)) == 1.0
@@ -0,0 +1,30 @@
+"""
+ScreenerService 종가 행렬 테스트
+"""
+import numpy as np
+import pandas as pd
+from services.screener_service import ScreenerService
+
+
+def history(dates, start: float = 100.0) -> pd.DataFrame:
+    dates = pd.DatetimeIndex(dates)
+    return pd.DataFrame({"date": dates, "close": start + np.arange(len(dates), dtype=float)})
+
+
+def test_build_matrix_fills_only_short_gaps():
+    dates = pd.bdate_range("2024-01-01", periods=20)
+    holiday = dates.delete(5)  # 하루 휴장한 심볼
+    halted = dates[:10]  # 10일 뒤로 갱신이 멈춘 심볼
+
+    closes = ScreenerService.build_matrix({
+        "AAA": history(dates),
+        "BBB": history(holiday),
+        "CCC": history(halted),
+    })
+
+    assert closes.index.equals(dates)
+    assert closes.loc[dates[5], "BBB"] == closes.loc[dates[4], "BBB"]
+    # 채우는 기간은 FILL_LIMIT일까지, 이후는 NaN (최신 값이 오래된 가격이 되지 않음)
+    assert closes["CCC"].iloc[10:10 + ScreenerService.FILL_LIMIT].notna().all()
+    assert closes["CCC"].iloc[10 + ScreenerService.FILL_LIMIT:].isna().all()
+    assert np.isnan(ScreenerService.latest_metrics(closes, ma_days=5).loc["CCC", "price"])
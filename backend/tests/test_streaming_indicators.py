@@ -0,0 +1,123 @@
+"""
+증분 지표 스트림 테스트 (FeatureEngine 전체 재계산과 같은 값인지, 마지막 봉 교체와 보관 한도)
+"""
+import threading
+import numpy as np
+import pandas as pd
+import pytest
+from core.config import settings
+from services.feature_engine import FeatureEngine
+from services.streaming_indicators import IndicatorStream, StreamingIndicatorService, default_calculators
+
+
+def make_history(days: int, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, days)))
+    # 보합 봉을 섞어 하락이 없는 구간(RSI 50)도 나오게 함
+    close[20:40] = close[19]
+    return pd.DataFrame({
+        "date": pd.bdate_range("2022-01-03", periods=days),
+        "open": close * 0.999,
+        "high": close * 1.01,
+        "low": close * 0.99,
+        "close": close,
+        "volume": rng.integers(1_000, 5_000, days),
+    })
+
+
+@pytest.fixture(autouse=True)
+def clean_streams():
+    StreamingIndicatorService._streams.clear()
+    yield
+    StreamingIndicatorService._streams.clear()
+
+
+def test_stream_matches_feature_engine():
+    df = make_history(300)
+    stream = IndicatorStream(default_calculators())
+    stream.extend(StreamingIndicatorService._bars(df))
+
+    rsi, sma, macd, signal = FeatureEngine.features(
+        "TEST", df, ("rsi", 14), ("sma", 200), ("macd", 12, 26), ("macd_signal", 12, 26, 9)
+    )
+    np.testing.assert_allclose(list(stream.values["rsi14"]), rsi.to_numpy(), rtol=1e-9, atol=1e-9)
+    np.testing.assert_allclose(list(stream.values["sma200"]), sma.to_numpy(), rtol=1e-9)
+    np.testing.assert_allclose([v["macd"] for v in stream.values["macd"]], macd.to_numpy(), atol=1e-9)
+    np.testing.assert_allclose([v["signal"] for v in stream.values["macd"]], signal.to_numpy(), atol=1e-9)
+
+
+def test_replacing_last_bar_matches_fresh_stream():
+    df = make_history(120)
+    bars = StreamingIndicatorService._bars(df)
+    stream = IndicatorStream(default_calculators())
+    stream.extend(bars)
+
+    # 장중 값이 두 번 바뀐 마지막 봉
+    last = bars[-1]
+    for close in (last.close * 1.03, last.close * 0.95):
+        stream.update(last._replace(close=close, high=max(last.high, close), low=min(last.low, close)))
+
+    fresh = IndicatorStream(default_calculators())
+    fresh.extend(bars[:-1] + [last._replace(close=last.close * 0.95, low=min(last.low, last.close * 0.95))])
+
+    assert len(stream) == len(fresh)
+    for name in stream.values:
+        assert list(stream.values[name]) == pytest.approx(list(fresh.values[name]), nan_ok=True), name
+
+
+def test_stream_keeps_only_max_bars():
+    df = make_history(80)
+    stream = IndicatorStream(default_calculators(), max_bars=30)
+    stream.extend(StreamingIndicatorService._bars(df))
+
+    assert len(stream) == 30
+    assert stream.dates[0] == df["date"].iloc[50]
+    assert all(len(series) == 30 for series in stream.values.values())
+
+    # 한도가 찬 상태에서도 마지막 봉 교체는 가장 오래된 값을 잃지 않음
+    last = StreamingIndicatorService._bars(df)[-1]
+    stream.update(last._replace(close=last.close * 1.01))
+    assert len(stream) == 30
+    assert stream.dates[0] == df["date"].iloc[50]
+
+
+def test_service_evicts_least_recently_used_stream(monkeypatch):
+    monkeypatch.setattr(settings, "streaming_max_symbols", 2)
+    df = make_history(30)
+    for symbol in ("AAA", "BBB"):
+        StreamingIndicatorService.sync(symbol, df)
+    StreamingIndicatorService.sync("AAA", df)  # AAA를 최근 사용으로
+    StreamingIndicatorService.sync("CCC", df)
+
+    assert list(StreamingIndicatorService._streams) == ["AAA", "CCC"]
+    assert StreamingIndicatorService.get_series("BBB", "sma20") == []
+
+
+def test_latest_series_snapshot_stays_aligned_with_bar_updates(monkeypatch):
+    from services.yahoo_service import YahooService
+
+    df = make_history(260)
+    monkeypatch.setattr(YahooService, "get_history", staticmethod(lambda symbol, years=3, deadline=None: df))
+    stream = StreamingIndicatorService.sync("TEST", df)
+    last = StreamingIndicatorService._bars(df)[-1]
+
+    stop = threading.Event()
+
+    def replace_last_bar():
+        # 장중 갱신처럼 마지막 봉을 계속 교체
+        while not stop.is_set():
+            with StreamingIndicatorService._lock:
+                stream.update(last._replace(close=last.close * 1.01))
+                stream.update(last)
+
+    writer = threading.Thread(target=replace_last_bar)
+    writer.start()
+    try:
+        for _ in range(200):
+            series = StreamingIndicatorService.get_latest_series("TEST", "sma20", 5)
+            assert [date for date, _ in series] == list(df["date"].iloc[-5:])
+    finally:
+        stop.set()
+        writer.join()
+
+    assert StreamingIndicatorService.get_latest_series("TEST", "nope", 5) == []
@@ -0,0 +1,176 @@
+"""
+YahooService 히스토리 로드/갱신 테스트 (yfinance Ticker를 가짜 객체로 대체)
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from core.cache import cache, is_symbol_missing
+from services.history_store import HistoryStore
+from services.yahoo_service import YahooService
+
+
+def make_history(days: int, split_date=None, ratio: float = 2.0) -> pd.DataFrame:
+    """yfinance Ticker.history 형식의 일봉 (오늘까지 영업일, split_date 이전 봉은 분할 수정)"""
+    index = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=days)
+    close = 100 + np.arange(days, dtype=float) * 0.1
+    hist = pd.DataFrame({
+        "Open": close - 0.5,
+        "High": close + 1.0,
+        "Low": close - 1.0,
+        "Close": close,
+        "Volume": np.full(days, 1000),
+        "Dividends": np.zeros(days),
+        "Stock Splits": np.zeros(days),
+    }, index=index)
+    if split_date is not None:
+        before = hist.index < split_date
+        hist.loc[before, ["Open", "High", "Low", "Close"]] /= ratio
+        hist.loc[split_date, "Stock Splits"] = ratio
+    return hist
+
+
+class FakeTicker:
+    """start/end/period 인자에 맞춰 고정 히스토리를 잘라 반환"""
+
+    def __init__(self, hist: pd.DataFrame, info=None):
+        self.hist = hist
+        self.calls = []
+        self._info = info
+
+    def history(self, period=None, start=None, end=None, timeout=None):
+        self.calls.append({"period": period, "start": start, "end": end})
+        hist = self.hist
+        if hist.empty:
+            return hist.copy()
+        if start is not None:
+            hist = hist[hist.index >= pd.Timestamp(start)]
+        if end is not None:
+            hist = hist[hist.index < pd.Timestamp(end)]
+        if period is not None:
+            hist = hist[hist.index >= pd.Timestamp.now().normalize() - pd.Timedelta(days=365 * int(period[:-1]))]
+        return hist.copy()
+
+    @property
+    def info(self):
+        if isinstance(self._info, Exception):
+            raise self._info
+        return self._info
+
+
+def use_ticker(monkeypatch, ticker: FakeTicker) -> FakeTicker:
+    monkeypatch.setattr(YahooService, "_create_ticker", staticmethod(lambda symbol: ticker))
+    return ticker
+
+
+def test_split_after_last_stored_bar_rebuilds_stored_history(monkeypatch):
+    raw = make_history(300)
+    split_date = raw.index[-2]
+    # 분할 전에 받아 둔 히스토리 (마지막 봉은 분할 3영업일 전)
+    stored = YahooService._build_history_frame(raw.iloc[:-4])
+    HistoryStore.save("SPLT", stored)
+
+    adjusted = make_history(300, split_date=split_date)
+    ticker = use_ticker(monkeypatch, FakeTicker(adjusted))
+
+    df = YahooService.get_history("SPLT", 1)
+
+    expected = adjusted[adjusted.index >= HistoryStore.window_start(1)]["Close"].to_numpy()
+    np.testing.assert_allclose(df["close"].to_numpy(), expected)
+    # 증분 요청 후 저장 구간 전체를 다시 받음
+    assert ticker.calls[-1]["start"] == stored["date"].iloc[0].strftime("%Y-%m-%d")
+    saved = HistoryStore.load("SPLT")
+    np.testing.assert_allclose(saved["close"].to_numpy(), adjusted["Close"].to_numpy())
+
+
+def test_incremental_update_without_corporate_action_only_appends(monkeypatch):
+    raw = make_history(300)
+    HistoryStore.save("PLAIN", YahooService._build_history_frame(raw.iloc[:-4]))
+    ticker = use_ticker(monkeypatch, FakeTicker(raw))
+
+    df = YahooService.get_history("PLAIN", 1)
+
+    assert len(ticker.calls) == 1
+    assert df["date"].iloc[-1] == raw.index[-1]
+    expected = raw[raw.index >= HistoryStore.window_start(1)]["Close"].to_numpy()
+    np.testing.assert_allclose(df["close"].to_numpy(), expected)
+
+
+def test_empty_fetch_during_outage_does_not_mark_symbol_missing(monkeypatch):
+    # yfinance는 연결 오류를 삼키고 빈 DataFrame을 반환하며, info 조회는 연결 오류로 실패
+    use_ticker(monkeypatch, FakeTicker(pd.DataFrame(), info=ConnectionError("Failed to resolve host")))
+
+    assert YahooService.get_history("VIG", 3) is None
+    assert not is_symbol_missing("VIG")
+
+
+def test_empty_fetch_with_confirmed_unknown_symbol_marks_missing(monkeypatch):
+    ticker = use_ticker(monkeypatch, FakeTicker(pd.DataFrame(), info={"trailingPegRatio": None}))
+
+    assert YahooService.get_history("NOSUCH", 3) is None
+    assert is_symbol_missing("NOSUCH")
+    # 네거티브 캐시 이후에는 외부 호출 없음
+    calls = len(ticker.calls)
+    assert YahooService.get_history("NOSUCH", 3) is None
+    assert len(ticker.calls) == calls
+
+
+def test_not_found_error_marks_missing():
+    error = Exception("HTTP Error 404: Quote not found for symbol: NOSUCH")
+    assert YahooService._is_not_found_error(error)
+    assert not YahooService._is_not_found_error(ConnectionError("Connection reset by peer"))
+
+
+@pytest.mark.parametrize("years", [4, 5])
+def test_long_period_request_fetches_full_period(monkeypatch, years):
+    ticker = use_ticker(monkeypatch, FakeTicker(make_history(260 * 6)))
+
+    df = YahooService.get_history("LONG", years)
+
+    assert ticker.calls[0]["period"] == f"{years}y"
+    assert df["date"].iloc[0] <= HistoryStore.window_start(years) + pd.Timedelta(days=7)
+    entry = cache.peek(YahooService._get_cache_key("history", "LONG"))
+    assert entry["years"] == HistoryStore.coverage_years(entry["df"]) == years
+
+
+def test_short_fallback_period_records_actual_coverage(monkeypatch):
+    # 4년 요청에 3년치만 돌려주는 경우 (앞의 기간 요청은 빈 응답)
+    hist = make_history(260 * 3)
+
+    class ShortTicker(FakeTicker):
+        def history(self, period=None, **kwargs):
+            if period == "4y":
+                self.calls.append({"period": period})
+                return pd.DataFrame()
+            return super().history(period=period, **kwargs)
+
+    use_ticker(monkeypatch, ShortTicker(hist, info={"symbol": "SHRT", "longName": "Short"}))
+
+    YahooService.get_history("SHRT", 4)
+
+    entry = cache.peek(YahooService._get_cache_key("history", "SHRT"))
+    assert entry["years"] < 4
+    assert YahooService._slice_history("SHRT", 4) is None
+
+
+def test_batch_miss_marks_only_confirmed_unknown_symbols(monkeypatch):
+    calls = []
+
+    def download_batch(symbols, period=None, start=None, deadline=None):
+        calls.append({"symbols": list(symbols), "deadline": deadline})
+        return {"GOOD": make_history(300)} if "GOOD" in symbols else {}
+
+    monkeypatch.setattr(YahooService, "_download_batch", staticmethod(download_batch))
+    tickers = {"NOPE": FakeTicker(make_history(0), info={}),
+               "DOWN": FakeTicker(make_history(0), info=ConnectionError("connection reset"))}
+    monkeypatch.setattr(YahooService, "_create_ticker", staticmethod(lambda symbol: tickers[symbol]))
+
+    result = YahooService.get_histories(["GOOD", "NOPE", "DOWN"], 1)
+
+    assert list(result) == ["GOOD"]
+    assert calls[0]["deadline"] is not None
+    assert is_symbol_missing("NOPE")
+    assert not is_symbol_missing("DOWN")
+
+    # 다시 조회하면 장애였던 심볼만 배치 요청
+    YahooService.get_histories(["GOOD", "NOPE", "DOWN"], 1)
+    assert calls[-1]["symbols"] == ["DOWN"]